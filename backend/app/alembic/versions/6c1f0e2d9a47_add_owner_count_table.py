@@ -0,0 +1,89 @@
+"""Add owner count table
+
+Revision ID: 6c1f0e2d9a47
+Revises: 3fb3aa595a1d
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1f0e2d9a47'
+down_revision = '3fb3aa595a1d'
+branch_labels = None
+depends_on = None
+
+# tenant-scoped tables whose rows are counted per owner
+COUNTED_TABLES = [
+    'customer',
+    'customer_type',
+    'item',
+    'item_category',
+    'item_unit',
+    'store',
+    'supplier',
+]
+
+
+def upgrade():
+    op.create_table('owner_count',
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(length=63), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], name=op.f('fk_owner_count_owner_id_user'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('owner_id', 'table_name', name=op.f('pk_owner_count'))
+    )
+
+    # statement level triggers with transition tables, so a bulk insert or a
+    # cascading delete touches each counter row once instead of once per row
+    op.execute("""
+    CREATE FUNCTION owner_count_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO owner_count (owner_id, table_name, count)
+        SELECT owner_id, TG_TABLE_NAME, count(*) FROM new_rows GROUP BY owner_id
+        ON CONFLICT (owner_id, table_name)
+        DO UPDATE SET count = owner_count.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE FUNCTION owner_count_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE owner_count SET count = owner_count.count - deleted.count
+        FROM (
+            SELECT owner_id, count(*) AS count FROM old_rows GROUP BY owner_id
+        ) AS deleted
+        WHERE owner_count.owner_id = deleted.owner_id
+        AND owner_count.table_name = TG_TABLE_NAME;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    for table in COUNTED_TABLES:
+        op.execute(f"""
+        CREATE TRIGGER {table}_owner_count_insert AFTER INSERT ON "{table}"
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION owner_count_insert()
+        """)
+        op.execute(f"""
+        CREATE TRIGGER {table}_owner_count_delete AFTER DELETE ON "{table}"
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION owner_count_delete()
+        """)
+        op.execute(f"""
+        INSERT INTO owner_count (owner_id, table_name, count)
+        SELECT owner_id, '{table}', count(*) FROM "{table}" GROUP BY owner_id
+        """)
+
+
+def downgrade():
+    for table in COUNTED_TABLES:
+        op.execute(f'DROP TRIGGER {table}_owner_count_delete ON "{table}"')
+        op.execute(f'DROP TRIGGER {table}_owner_count_insert ON "{table}"')
+    op.execute("DROP FUNCTION owner_count_delete()")
+    op.execute("DROP FUNCTION owner_count_insert()")
+    op.drop_table('owner_count')
@@ -0,0 +1,102 @@
+"""Add deletion table
+
+Revision ID: 6fa0862cccfa
+Revises: 67993b0ec227
+Create Date: 2026-10-18 02:49:33.374380
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '6fa0862cccfa'
+down_revision = '67993b0ec227'
+branch_labels = None
+depends_on = None
+
+# tables served by `/changes`, whose deleted rows are logged as tombstones
+SYNCED_TABLES = [
+    'customer',
+    'item',
+    'item_category',
+    'item_unit',
+    'store',
+]
+
+
+def upgrade():
+    # the id of the transaction that last wrote a row, or logged a tombstone.
+    # `/changes` reads up to the oldest transaction still running, so unlike
+    # a date_updated stamped long before its transaction commits, nothing a
+    # cursor moved past can become visible afterwards. Rows written before
+    # this migration are stamped 0
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_table('deletion',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(length=63), nullable=False),
+    sa.Column('row_id', sa.Uuid(), nullable=False),
+    sa.Column('date_deleted', sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+    sa.Column('change_xid', sa.BigInteger(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], name=op.f('fk_deletion_owner_id_user'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_deletion'))
+    )
+    op.create_index('ix_deletion_owner_id_table_name_change_xid_id', 'deletion', ['owner_id', 'table_name', 'change_xid', 'id'], unique=False)
+
+    op.execute("""
+    CREATE FUNCTION stamp_change_xid() RETURNS trigger AS $$
+    BEGIN
+        NEW.change_xid := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    for table in SYNCED_TABLES:
+        op.execute(f"""
+        CREATE TRIGGER {table}_stamp_change_xid BEFORE INSERT OR UPDATE ON "{table}"
+        FOR EACH ROW EXECUTE FUNCTION stamp_change_xid()
+        """)
+
+    # statement level, like the owner count triggers. The rows of an owner
+    # being deleted (by cascade) aren't logged: nobody is left to sync them
+    op.execute("""
+    CREATE FUNCTION log_deletion() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO deletion (id, owner_id, table_name, row_id, date_deleted, change_xid)
+        SELECT gen_random_uuid(), old_rows.owner_id, TG_TABLE_NAME, old_rows.id,
+            clock_timestamp(), pg_current_xact_id()::text::bigint
+        FROM old_rows JOIN "user" ON "user".id = old_rows.owner_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    for table in SYNCED_TABLES:
+        op.execute(f"""
+        CREATE TRIGGER {table}_log_deletion AFTER DELETE ON "{table}"
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION log_deletion()
+        """)
+
+    # built concurrently, so the tables stay writable while indexes are built
+    with op.get_context().autocommit_block():
+        for table in SYNCED_TABLES:
+            op.create_index(f'ix_{table}_owner_id_change_xid_id', table, ['owner_id', 'change_xid', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in SYNCED_TABLES:
+            op.drop_index(f'ix_{table}_owner_id_change_xid_id', table_name=table, postgresql_concurrently=True)
+    for table in SYNCED_TABLES:
+        op.execute(f'DROP TRIGGER {table}_log_deletion ON "{table}"')
+    op.execute("DROP FUNCTION log_deletion()")
+    for table in SYNCED_TABLES:
+        op.execute(f'DROP TRIGGER {table}_stamp_change_xid ON "{table}"')
+    op.execute("DROP FUNCTION stamp_change_xid()")
+    op.drop_index('ix_deletion_owner_id_table_name_change_xid_id', table_name='deletion')
+    op.drop_table('deletion')
+    for table in SYNCED_TABLES:
+        op.drop_column(table, 'change_xid')
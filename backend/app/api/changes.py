@@ -0,0 +1,113 @@
+import base64
+import json
+import uuid
+from typing import Any
+
+from fastapi import HTTPException, Response
+from pydantic_core import to_json
+from sqlalchemy import BigInteger, literal_column
+from sqlmodel import Session, col, select, tuple_
+
+from app.api.streaming import export_columns
+from app.models import Deletion
+
+# Where a `/changes` cursor stands: past the rows last written up to a
+# (change_xid, id), and the tombstones logged up to a (change_xid, id)
+Position = tuple[int, uuid.UUID]
+
+# The oldest transaction still running: every transaction before it has
+# committed or rolled back, and every one that has yet to is from it on
+SETTLED_XID = literal_column(
+    "pg_snapshot_xmin(pg_current_snapshot())::text::bigint", BigInteger
+)
+
+
+def encode_changes_cursor(rows: Position | None, deletions: Position) -> str:
+    raw = json.dumps(
+        [
+            [rows[0], str(rows[1])] if rows else None,
+            [deletions[0], str(deletions[1])],
+        ]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_changes_cursor(cursor: str) -> tuple[Position | None, Position]:
+    try:
+        rows, deletions = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (
+            (int(rows[0]), uuid.UUID(rows[1])) if rows else None,
+            (int(deletions[0]), uuid.UUID(deletions[1])),
+        )
+    except (ValueError, TypeError, IndexError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def read_changes(
+    session: Session,
+    /,
+    model: Any,
+    public: Any,
+    *,
+    owner_id: uuid.UUID | None,
+    since: str | None = None,
+    limit: int = 100,
+) -> Response:
+    """
+    A `*ChangesPublic` envelope of what changed in `model` after the cursor
+    `since`: its rows created or updated (as `public`, encoded to JSON as is,
+    like `page_response`), and the ids of those deleted, logged by the
+    `deletion` table's triggers. Both are read in the order of the transactions
+    that wrote them (`change_xid`, stamped by triggers), seeking into the
+    (owner_id, change_xid, id) and deletion indexes.
+
+    Only what transactions before `SETTLED_XID` wrote is returned: one still
+    running has a later id, so it can't commit behind a cursor, however long
+    it takes. Without `since`, every row is returned, and tombstones from
+    then on. `next_cursor` is where the next call picks up; `has_more` tells
+    whether it can right away, or whether the client is up to date. Read from
+    the primary: a lagging replica can be behind the cursor.
+    """
+    until = session.exec(select(SETTLED_XID)).one()
+    if since is None:
+        # tombstones of the rows about to be returned are logged from `until` on
+        rows_position, deletions_position = None, (until, uuid.UUID(int=0))
+    else:
+        rows_position, deletions_position = decode_changes_cursor(since)
+
+    columns = [*export_columns(model, public), col(model.change_xid)]
+    statement = select(*columns).where(col(model.change_xid) < until)
+    if owner_id is not None:
+        statement = statement.where(model.owner_id == owner_id)
+    if rows_position is not None:
+        statement = statement.where(
+            tuple_(col(model.change_xid), col(model.id)) > rows_position
+        )
+    rows = session.exec(
+        statement.order_by(col(model.change_xid), col(model.id)).limit(limit)
+    ).all()
+
+    deletions = select(Deletion.row_id, Deletion.change_xid, Deletion.id).where(
+        Deletion.table_name == model.__tablename__,
+        col(Deletion.change_xid) < until,
+        tuple_(col(Deletion.change_xid), col(Deletion.id)) > deletions_position,
+    )
+    if owner_id is not None:
+        deletions = deletions.where(Deletion.owner_id == owner_id)
+    deleted = session.exec(
+        deletions.order_by(col(Deletion.change_xid), col(Deletion.id)).limit(limit)
+    ).all()
+
+    if rows:
+        rows_position = (rows[-1].change_xid, rows[-1].id)
+    if deleted:
+        _, change_xid, id = deleted[-1]
+        deletions_position = (change_xid, id)
+    content = {
+        # without the change_xid, selected last
+        "data": [dict(zip(row._fields[:-1], row[:-1], strict=True)) for row in rows],
+        "deleted": [row_id for row_id, _, _ in deleted],
+        "next_cursor": encode_changes_cursor(rows_position, deletions_position),
+        "has_more": limit > 0 and limit in (len(rows), len(deleted)),
+    }
+    return Response(to_json(content), media_type="application/json")
@@ -0,0 +1,94 @@
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+from sqlmodel import Session, col, func, select
+
+from app.api.changes import SETTLED_XID
+from app.models import Deletion
+
+
+class Validators:
+    """
+    The weak ETag and Last-Modified of a representation, from the
+    date_updated of what it shows, and whatever else tells its versions apart
+    (`state`: the query string, the user...).
+
+    `not_modified` answers a conditional GET from them alone, so a client
+    whose copy is current gets a 304 without the rows being read or encoded.
+    """
+
+    def __init__(self, last_modified: datetime | None, *state: Any) -> None:
+        if last_modified is not None and last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        self.last_modified = last_modified
+        digest = hashlib.blake2b(
+            repr((last_modified, *state)).encode(), digest_size=16
+        ).hexdigest()
+        self.etag = f'W/"{digest}"'
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.astimezone(timezone.utc), usegmt=True
+            )
+        return headers
+
+    def not_modified(self, request: Request) -> Response | None:
+        """
+        A 304 when the client's copy is current, by If-None-Match (compared
+        weakly), or without it, If-Modified-Since (to the second).
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            fresh = "*" in tags or self.etag.removeprefix("W/") in tags
+        else:
+            fresh = self._modified_since(request.headers.get("if-modified-since"))
+        return Response(status_code=304, headers=self.headers) if fresh else None
+
+    def apply(self, content: Any, response: Response) -> Any:
+        """Set the headers on `content` if it is a response, or on `response`."""
+        target = content if isinstance(content, Response) else response
+        target.headers.update(self.headers)
+        return content
+
+    def _modified_since(self, value: str | None) -> bool:
+        if value is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(value)
+            return self.last_modified.replace(microsecond=0) <= since
+        except (TypeError, ValueError):
+            # unparsable, or without a timezone
+            return False
+
+
+def list_validators(
+    session: Session, /, model: Any, owner_id: uuid.UUID, *state: Any
+) -> Validators | None:
+    """
+    Validators of `owner_id`'s listing of `model`: from the newest transaction
+    that wrote one of its rows, and the newest that deleted one (logged by the
+    `deletion` triggers), each read off the top of an index. Any later change
+    to the listing is made by a newer transaction.
+
+    None while a transaction older than either is still running: it could
+    commit a change without moving them. Without a date, only If-None-Match
+    is honored.
+    """
+    written = select(func.max(col(model.change_xid))).where(model.owner_id == owner_id)
+    deleted = select(func.max(col(Deletion.change_xid))).where(
+        Deletion.owner_id == owner_id, Deletion.table_name == model.__tablename__
+    )
+    settled, last_written, last_deleted = session.exec(
+        select(SETTLED_XID, written.scalar_subquery(), deleted.scalar_subquery())
+    ).one()
+    if any(xid is not None and xid >= settled for xid in (last_written, last_deleted)):
+        return None
+    return Validators(None, owner_id, last_written, last_deleted, *state)
@@ -1,16 +1,22 @@
-from collections.abc import Generator
-from typing import Annotated
+import time
+import uuid
+from collections.abc import AsyncGenerator, Generator
+from typing import Annotated, Literal
 
-import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select
 
-from app.core import security
+from app.core.cache import permission_cache, permission_version, principal_cache
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import AsyncSession, async_engine, engine, replicas
+from app.core.keys import token_keys
+from app.core.replicas import STICKY_COOKIE
+from app.core.revocation import revoked_tokens
+from app.core.uow import UnitOfWorkSession, async_unit_of_work, unit_of_work
 from app.models import (
     Permission,
     RolePermission,
@@ -24,27 +30,151 @@ reusable_oauth2 = OAuth2PasswordBearer(
 )
 
 
-def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+# Not expired on commit: what a route wrote is still loaded to respond with,
+# without reading it back
+def get_db() -> Generator[UnitOfWorkSession, None, None]:
+    with UnitOfWorkSession(engine, expire_on_commit=False) as session:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_db)]
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(
+        async_engine, sync_session_class=UnitOfWorkSession, expire_on_commit=False
+    ) as session:
+        yield session
+
+
+def get_unit_of_work(
+    session: Annotated[UnitOfWorkSession, Depends(get_db)],
+) -> Generator[Session, None, None]:
+    with unit_of_work(session):
+        yield session
+
+
+async def get_async_unit_of_work(
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    async with async_unit_of_work(session):
+        yield session
+
+
+# A request writes in one transaction (see `unit_of_work`), committed when its
+# route returns, before responding; the session itself lasts until the
+# response is sent, to load what it needs
+SessionDep = Annotated[Session, Depends(get_unit_of_work, scope="function")]
+AsyncSessionDep = Annotated[
+    AsyncSession, Depends(get_async_unit_of_work, scope="function")
+]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def _cached_principal(user_id: str) -> User | None:
+    entry = principal_cache.get(user_id)
+    if entry is None:
+        return None
+    cached_at, snapshot = entry
+    # workers only invalidate their own caches, but every one of them learns
+    # of a revocation of the user's claims (see `RevocationList.sync`)
+    if revoked_tokens.changed_since(uuid.UUID(user_id), cached_at):
+        return None
+    cached = User(**snapshot)
+    # attach the snapshot as an already persisted row, without a SELECT
+    make_transient_to_detached(cached)
+    return cached
+
+
+def get_principal(session: Session, user_id: str | None) -> User | None:
+    """
+    Load the user behind a token subject, serving it from the principal cache
+    when possible so the request doesn't need to SELECT the user row.
+    """
+    if user_id is None:
+        return None
+    cached = _cached_principal(user_id)
+    if cached is not None:
+        return session.merge(cached, load=False)
+    cached_at = time.time()
+    user = session.get(User, user_id)
+    if user:
+        principal_cache.set(user_id, (cached_at, user.model_dump()))
+    return user
+
+
+async def get_principal_async(
+    session: AsyncSession, user_id: str | None
+) -> User | None:
+    """`get_principal` for an async session."""
+    if user_id is None:
+        return None
+    cached = _cached_principal(user_id)
+    if cached is not None:
+        return await session.merge(cached, load=False)
+    cached_at = time.time()
+    user = await session.get(User, user_id)
+    if user:
+        principal_cache.set(user_id, (cached_at, user.model_dump()))
+    return user
+
+
+def decode_token(
+    token: str, type: Literal["access", "refresh"] = "access"
+) -> TokenPayload:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
+        token_data = TokenPayload(**token_keys.verify(token))
     except (InvalidTokenError, ValidationError):
+        token_data = None
+    if (
+        token_data is None
+        or token_data.type != type
+        or revoked_tokens.is_revoked(token_data)
+    ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+    return token_data
+
+
+def get_token_data(token: TokenDep) -> TokenPayload:
+    return decode_token(token)
+
+
+TokenDataDep = Annotated[TokenPayload, Depends(get_token_data)]
+
+# Columns of the user not carried by access tokens, loaded from the row when a
+# route reads one. Only sync sessions can, `async def` routes must not read them
+UNCLAIMED_COLUMNS = [
+    "email",
+    "full_name",
+    "hashed_password",
+    "date_created",
+    "date_updated",
+]
+
+
+def claimed_user(token_data: TokenPayload) -> User | None:
+    """
+    The user as claimed by an access token, detached, or None when the token
+    carries no claims or they may be stale (see `RevocationList.is_stale`).
+    """
+    if (
+        token_data.active is None
+        or token_data.superuser is None
+        or revoked_tokens.is_stale(token_data)
+    ):
+        return None
+    user = User(
+        id=uuid.UUID(token_data.sub),
+        is_active=token_data.active,
+        is_superuser=token_data.superuser,
+        email="",
+        hashed_password="",
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+def check_user(user: User | None) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -52,7 +182,63 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     return user
 
 
+def get_current_user(session: SessionDep, token_data: TokenDataDep) -> User:
+    user = claimed_user(token_data)
+    if user is not None:
+        user = session.merge(user, load=False)
+        session.expire(user, UNCLAIMED_COLUMNS)
+    else:
+        user = get_principal(session, token_data.sub)
+    user = check_user(user)
+    # what the user commits makes their reads stick to the primary for a while
+    session.info["user_id"] = user.id
+    return user
+
+
+async def get_current_user_async(
+    session: AsyncSessionDep, token_data: TokenDataDep
+) -> User:
+    user = claimed_user(token_data)
+    if user is not None:
+        user = await session.merge(user, load=False)
+        session.expire(user, UNCLAIMED_COLUMNS)
+    else:
+        user = await get_principal_async(session, token_data.sub)
+    user = check_user(user)
+    session.info["user_id"] = user.id
+    return user
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
+# for `async def` routes, so authenticating doesn't take a threadpool thread
+AsyncCurrentUser = Annotated[User, Depends(get_current_user_async)]
+
+
+def read_primary_until(request: Request) -> float | None:
+    try:
+        return float(request.cookies[STICKY_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+# Sessions of GET routes only reading, from a replica when one is fit (see
+# `ReplicaRouter`), otherwise from the primary
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    replica = replicas.choose(read_primary_until(request))
+    with Session(replica.engine if replica else engine) as session:
+        yield session
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    replica = replicas.choose(read_primary_until(request))
+    async with AsyncSession(
+        replica.async_engine if replica else async_engine
+    ) as session:
+        yield session
+
+
+ReadSessionDep = Annotated[Session, Depends(get_read_db)]
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_db)]
 
 
 def get_current_active_superuser(current_user: CurrentUser) -> User:
@@ -63,16 +249,32 @@ def get_current_active_superuser(current_user: CurrentUser) -> User:
     return current_user
 
 
+def get_permissions(session: Session, user: User) -> frozenset[str]:
+    """
+    Effective permission names of a user, granted through any of their roles.
+
+    The set is materialized once and cached until roles, permissions or their
+    assignments change (see `permission_version`).
+    """
+    key = str(user.id)
+    version = permission_version.value
+    entry = permission_cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    permissions = frozenset(
+        session.exec(
+            select(Permission.name)
+            .join(RolePermission)
+            .join(UserRole, RolePermission.role_id == UserRole.role_id)
+            .where(UserRole.user_id == user.id)
+        ).all()
+    )
+    permission_cache.set(key, (version, permissions))
+    return permissions
+
+
 def has_permission(session: SessionDep, user: User, permission_name: str) -> bool:
-    role_permissions = session.exec(
-        select(Permission.name)
-        .join(RolePermission)
-        .join(UserRole, RolePermission.role_id == UserRole.role_id)
-        .where(UserRole.user_id == user.id)
-    ).all()
-    if permission_name in role_permissions:
-        return True
-    return False
+    return permission_name in get_permissions(session, user)
 
 
 def permission_required(permission_name: str):
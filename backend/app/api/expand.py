@@ -0,0 +1,72 @@
+from typing import Annotated, Any, Generic, TypeVar
+
+from fastapi import HTTPException, Query
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlmodel import SQLModel
+
+E = TypeVar("E", bound=SQLModel)
+
+
+class Expansion(Generic[E]):
+    """
+    Related rows a read route may embed in its response: the relationships of
+    `model` that `expanded` (a `public` with them as optional fields) has,
+    named by the `expand` query parameter, comma separated.
+
+    Used as a dependency, it parses `expand`. Whatever the number of rows,
+    `options` loads them in a fixed number of queries: many-to-one
+    relationships joined to the rows' own, collections by one more query each
+    (WHERE ... IN the rows' ids).
+    """
+
+    def __init__(self, model: Any, public: type[SQLModel], expanded: type[E]) -> None:
+        self.model = model
+        self.public = public
+        self.expanded = expanded
+        relationships = sa_inspect(model).relationships
+        self.names = [
+            name
+            for name in expanded.model_fields
+            if name not in public.model_fields and name in relationships
+        ]
+
+    def __call__(
+        self,
+        expand: Annotated[
+            str | None, Query(description="Related rows to embed, comma separated")
+        ] = None,
+    ) -> list[str]:
+        names = [name.strip() for name in (expand or "").split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.names]
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Cannot expand {', '.join(unknown)},"
+                f" only {', '.join(self.names)}",
+            )
+        return list(dict.fromkeys(names))
+
+    def options(self, names: list[str]) -> list[LoaderOption]:
+        relationships = sa_inspect(self.model).relationships
+        return [
+            (selectinload if relationships[name].uselist else joinedload)(
+                getattr(self.model, name)
+            )
+            for name in names
+        ]
+
+    def to_public(self, obj: Any, names: list[str]) -> SQLModel:
+        """
+        `obj` as `public`, or as `expanded` with `names` embedded, loaded by
+        `options`: the others are left empty, rather than lazy loaded.
+        """
+        if not names:
+            return self.public.model_validate(obj)
+        return self.to_expanded(obj, names)
+
+    def to_expanded(self, obj: Any, names: list[str]) -> E:
+        """`obj` as `expanded`, with only `names` embedded."""
+        skipped = {name: None for name in self.names if name not in names}
+        return self.expanded.model_validate(obj, update=skipped)
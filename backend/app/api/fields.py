@@ -0,0 +1,68 @@
+from typing import Annotated, Any
+
+from fastapi import HTTPException, Query, Response
+from pydantic_core import to_json
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlmodel import SQLModel, col
+
+
+class FieldSet:
+    """
+    The fields of `public` a read route returns, named by the `fields` query
+    parameter, comma separated, or all of them without it.
+
+    Used as a dependency, it parses `fields`, into None when it isn't given.
+    Only the columns of the fields asked for are read: selected as rows by
+    list routes (`columns`, see `page_response`), loaded into the object by
+    detail routes (`options`, see `response`).
+    """
+
+    def __init__(self, model: Any, public: type[SQLModel]) -> None:
+        self.model = model
+        self.public = public
+        self.names = list(public.model_fields)
+
+    def __call__(
+        self,
+        fields: Annotated[
+            str | None,
+            Query(description="Fields to return, comma separated, all by default"),
+        ] = None,
+    ) -> list[str] | None:
+        if fields is None:
+            return None
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(names.difference(self.names))
+        if unknown or not names:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Cannot return {', '.join(unknown) or 'no fields'},"
+                f" only {', '.join(self.names)}",
+            )
+        return [name for name in self.names if name in names]
+
+    def columns(self, fields: list[str] | None, *extra: str) -> list[Any]:
+        """
+        The columns of `fields`, followed by those of `extra` the route needs
+        without returning them (the cursor's), which `page_response` drops.
+        """
+        names = fields or self.names
+        names = [*names, *(name for name in extra if name not in names)]
+        return [col(getattr(self.model, name)) for name in names]
+
+    def options(self, fields: list[str] | None, *extra: str) -> list[LoaderOption]:
+        """Load `fields` and `extra` (for permission checks) only."""
+        if fields is None:
+            return []
+        return [load_only(*(getattr(self.model, name) for name in [*fields, *extra]))]
+
+    def response(self, obj: Any, fields: list[str] | None) -> Any:
+        """
+        `obj` for the route's response_model to validate, or only its `fields`,
+        encoded as is, without touching the attributes left unloaded.
+        """
+        if obj is None or fields is None:
+            return obj
+        content = {name: getattr(obj, name) for name in fields}
+        return Response(to_json(content), media_type="application/json")
@@ -9,6 +9,8 @@ from app.api.routes import (
     login,
     permissions,
     private,
+    purchases,
+    sales,
     stores,
     suppliers,
     users,
@@ -24,6 +26,8 @@ api_router.include_router(item_units.router)
 api_router.include_router(items.router)
 api_router.include_router(login.router)
 api_router.include_router(permissions.router)
+api_router.include_router(purchases.router)
+api_router.include_router(sales.router)
 api_router.include_router(stores.router)
 api_router.include_router(suppliers.router)
 api_router.include_router(users.router)
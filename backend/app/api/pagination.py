@@ -0,0 +1,172 @@
+import base64
+import json
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Response
+from pydantic_core import to_json
+from sqlmodel import Session, col, func, select, text, tuple_
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.models import CountMode, OwnerCount
+
+T = TypeVar("T")
+
+# Every paginated model is ordered by (date_created, id), so a page can be
+# located either by offset or by seeking past the last row of the previous page
+CURSOR_FIELDS = ("date_created", "id")
+
+
+def encode_cursor(obj: Any) -> str:
+    raw = json.dumps([obj.date_created.isoformat(), str(obj.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        date_created, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(date_created), uuid.UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def split_page(rows: Sequence[T], limit: int) -> tuple[Sequence[T], str | None]:
+    """
+    `rows`, read with one more than `limit`, as the page of `limit` rows and
+    the cursor of the next, or None when there is no extra row: `rows` is the
+    last page, even if exactly full.
+    """
+    if limit <= 0:
+        return rows[:0], None
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1])
+
+
+def seek(
+    statement: SelectOfScalar[T],
+    model: Any,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+) -> SelectOfScalar[T]:
+    """
+    Order `statement` by (date_created, id) and restrict it to one page.
+
+    With `after`, the page starts right after the row the cursor points to, so
+    the database seeks into the index instead of scanning and discarding
+    `skip` rows; `skip` is ignored in that case.
+    """
+    statement = statement.order_by(col(model.date_created), col(model.id))
+    if after is not None:
+        date_created, id = decode_cursor(after)
+        statement = statement.where(
+            tuple_(col(model.date_created), col(model.id)) > (date_created, id)
+        )
+    else:
+        statement = statement.offset(skip)
+    return statement.limit(limit)
+
+
+def paginate(
+    session: Session,
+    /,
+    statement: SelectOfScalar[T],
+    model: Any,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+) -> tuple[Sequence[T], str | None]:
+    rows = session.exec(
+        seek(statement, model, skip=skip, limit=limit + 1, after=after)
+    ).all()
+    return split_page(rows, limit)
+
+
+def estimate_rows(
+    session: Session, /, statement: SelectOfScalar[Any], model: Any
+) -> int:
+    """Planner's estimate of the rows `statement` matches, without scanning them."""
+    if statement.whereclause is None:
+        reltuples = session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": f'"{model.__tablename__}"'},
+        ).scalar()
+        # -1 until the table was first vacuumed or analyzed
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+    connection = session.connection()
+    compiled = statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(
+    session: Session,
+    /,
+    statement: SelectOfScalar[Any],
+    model: Any,
+    *,
+    mode: CountMode = "exact",
+    owner_id: uuid.UUID | None = None,
+) -> int | None:
+    """
+    Number of rows `statement` matches, as requested by `mode`.
+
+    An exact count of everything one owner has (pass `owner_id`) is read from
+    the trigger maintained `owner_count` table when it has a row for it, other
+    exact counts run COUNT(*). "estimate" reads planner statistics and "none"
+    skips counting altogether.
+    """
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        return estimate_rows(session, statement, model)
+    if owner_id is not None:
+        count = session.exec(
+            select(OwnerCount.count).where(
+                OwnerCount.owner_id == owner_id,
+                OwnerCount.table_name == model.__tablename__,
+            )
+        ).first()
+        if count is not None:
+            return count
+    return session.exec(select(func.count()).select_from(statement.subquery())).one()
+
+
+def page_response(
+    # Row objects, though a listing's statement is typed after its model
+    rows: Sequence[Any],
+    *,
+    count: int | None,
+    count_mode: CountMode,
+    next_cursor: str | None,
+    fields: Sequence[str] | None = None,
+) -> Response:
+    """
+    A `*Public` list envelope of `rows`, selected with `export_columns` so each
+    holds the fields of the public model, in order, encoded to JSON as is.
+    With `fields`, rows hold those first (see `FieldSet.columns`), and only
+    those are returned.
+
+    The route's response_model still documents it, but no model validates the
+    page, let alone twice (into `*Public`, then as the response): the columns
+    already have the public types, and UUIDs and datetimes encode natively.
+    """
+    keys = fields or (rows[0]._fields if rows else ())
+    content = {
+        # zip is several times faster than Row._asdict, and stops at the last
+        # of `fields`
+        "data": [dict(zip(keys, row, strict=False)) for row in rows],
+        "count": count,
+        "count_mode": count_mode,
+        "next_cursor": next_cursor,
+    }
+    return Response(to_json(content), media_type="application/json")
@@ -1,48 +1,60 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import select
 
 from app.api.deps import CurrentUser, SessionDep
-from app.models import CustomerType, CustomerTypeCreate, CustomerTypePublic, CustomerTypesPublic, CustomerTypeUpdate, Message, BaseModelUpdate
+from app.api.pagination import count_rows, page_response, paginate
+from app.api.streaming import export_columns
+from app.models import (
+    BaseModelUpdate,
+    CountMode,
+    CustomerType,
+    CustomerTypeCreate,
+    CustomerTypePublic,
+    CustomerTypesPublic,
+    CustomerTypeUpdate,
+    Message,
+)
 
 router = APIRouter(prefix="/customer_types", tags=["customer_types"])
 
 
 @router.get("/", response_model=CustomerTypesPublic)
 def read_customer_types(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
 ) -> Any:
     """
     Retrieve customer types.
     """
 
+    statement = select(*export_columns(CustomerType, CustomerTypePublic))
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(CustomerType)
-        count = session.exec(count_statement).one()
-        statement = select(CustomerType).offset(skip).limit(limit)
-        customer_types = session.exec(statement).all()
+        count = count_rows(session, statement, CustomerType, mode=count_mode)
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(CustomerType)
-            .where(CustomerType.owner_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(CustomerType)
-            .where(CustomerType.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
+        statement = statement.where(CustomerType.owner_id == current_user.id)
+        count = count_rows(
+            session, statement, CustomerType, mode=count_mode, owner_id=current_user.id
         )
-        customer_types = session.exec(statement).all()
+    customer_types, next_cursor = paginate(
+        session, statement, CustomerType, skip=skip, limit=limit, after=after
+    )
 
-    return CustomerTypesPublic(data=customer_types, count=count)
+    return page_response(
+        customer_types, count=count, count_mode=count_mode, next_cursor=next_cursor
+    )
 
 
 @router.get("/{id}", response_model=CustomerTypePublic)
-def read_customer_type(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_customer_type(
+    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+) -> Any:
     """
     Get customer type by ID.
     """
@@ -56,15 +68,18 @@ def read_customer_type(session: SessionDep, current_user: CurrentUser, id: uuid.
 
 @router.post("/", response_model=CustomerTypePublic)
 def create_customer_type(
-    *, session: SessionDep, current_user: CurrentUser, customer_type_in: CustomerTypeCreate
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    customer_type_in: CustomerTypeCreate,
 ) -> Any:
     """
     Create new customer type.
     """
-    customer_type = CustomerType.model_validate(customer_type_in, update={"owner_id": current_user.id})
+    customer_type = CustomerType.model_validate(
+        customer_type_in, update={"owner_id": current_user.id}
+    )
     session.add(customer_type)
-    session.commit()
-    session.refresh(customer_type)
     return customer_type
 
 
@@ -88,8 +103,6 @@ def update_customer_type(
     update_dict.update(BaseModelUpdate().model_dump())
     customer_type.sqlmodel_update(update_dict)
     session.add(customer_type)
-    session.commit()
-    session.refresh(customer_type)
     return customer_type
 
 
@@ -106,7 +119,7 @@ def delete_customer_type(
     if not current_user.is_superuser and (customer_type.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(customer_type)
-    session.commit()
     return Message(message="CustomerType deleted successfully")
 
+
 # TODO: consider to add a feature for getting low stock customer_types
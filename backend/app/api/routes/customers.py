@@ -1,57 +1,192 @@
 import uuid
-from typing import Any
-
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
-
-from app.api.deps import CurrentUser, SessionDep
-from app.models import Customer, CustomerCreate, CustomerPublic, CustomersPublic, CustomerUpdate, CustomerType, Message, BaseModelUpdate
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel import col, select
+
+from app.api.changes import read_changes
+from app.api.conditional import Validators, list_validators
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    CurrentUser,
+    ReadSessionDep,
+    SessionDep,
+)
+from app.api.expand import Expansion
+from app.api.fields import FieldSet
+from app.api.pagination import CURSOR_FIELDS, count_rows, page_response, paginate
+from app.api.streaming import export_columns, stream_export
+from app.models import (
+    BaseModelUpdate,
+    CountMode,
+    Customer,
+    CustomerChangesPublic,
+    CustomerCreate,
+    CustomerPublic,
+    CustomerPublicExpanded,
+    CustomersPublic,
+    CustomersPublicExpanded,
+    CustomerType,
+    CustomerUpdate,
+    ExportFormat,
+    Message,
+)
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
-
-@router.get("/", response_model=CustomersPublic)
-def read_customers(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+customer_expansion = Expansion(Customer, CustomerPublic, CustomerPublicExpanded)
+customer_fields = FieldSet(Customer, CustomerPublic)
+
+
+@router.get("/", response_model=CustomersPublic | CustomersPublicExpanded)
+async def read_customers(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    expand: Annotated[list[str], Depends(customer_expansion)],
+    fields: Annotated[list[str] | None, Depends(customer_fields)],
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
 ) -> Any:
     """
     Retrieve customer types.
     """
 
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Customer)
-        count = session.exec(count_statement).one()
-        statement = select(Customer).offset(skip).limit(limit)
-        customers = session.exec(statement).all()
+    if expand and fields is not None:
+        raise HTTPException(
+            status_code=422, detail="Cannot both expand and pick fields"
+        )
+    if expand:
+        statement = select(Customer)
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(Customer)
-            .where(Customer.owner_id == current_user.id)
+        statement = select(*customer_fields.columns(fields, *CURSOR_FIELDS))
+    owner_id = None
+    if not current_user.is_superuser:
+        statement = statement.where(Customer.owner_id == current_user.id)
+        owner_id = current_user.id
+    validators = None
+    # the related rows of an expanded page aren't accounted for, and the
+    # newest writes of all owners aren't indexed
+    if not expand and owner_id is not None:
+        validators = await session.run_sync(
+            list_validators, Customer, owner_id, request.url.query
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Customer)
-            .where(Customer.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
+        if validators is not None and (
+            not_modified := validators.not_modified(request)
+        ):
+            return not_modified
+    count = await session.run_sync(
+        count_rows, statement, Customer, mode=count_mode, owner_id=owner_id
+    )
+    customers, next_cursor = await session.run_sync(
+        paginate,
+        statement.options(*customer_expansion.options(expand)),
+        Customer,
+        skip=skip,
+        limit=limit,
+        after=after,
+    )
+
+    if not expand:
+        page = page_response(
+            customers,
+            count=count,
+            count_mode=count_mode,
+            next_cursor=next_cursor,
+            fields=fields,
         )
-        customers = session.exec(statement).all()
-
-    return CustomersPublic(data=customers, count=count)
-
-
-@router.get("/{id}", response_model=CustomerPublic)
-def read_customer(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+        if validators is not None:
+            page.headers.update(validators.headers)
+        return page
+    return CustomersPublicExpanded(
+        data=[customer_expansion.to_expanded(c, expand) for c in customers],
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}, "application/x-ndjson": {}}}},
+)
+def export_customers(
+    session: ReadSessionDep, current_user: CurrentUser, format: ExportFormat = "csv"
+) -> Any:
+    """
+    Export all customers as CSV or newline delimited JSON, streamed as it is read.
+    """
+    statement = select(*export_columns(Customer, CustomerPublic))
+    if not current_user.is_superuser:
+        statement = statement.where(Customer.owner_id == current_user.id)
+    statement = statement.order_by(col(Customer.date_created), col(Customer.id))
+    return stream_export(session, statement, format=format, filename="customers")
+
+
+@router.get("/changes", response_model=CustomerChangesPublic)
+async def read_customer_changes(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    since: str | None = None,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve the customers created, updated or deleted since a cursor.
+    """
+    owner_id = None if current_user.is_superuser else current_user.id
+    return await session.run_sync(
+        read_changes,
+        Customer,
+        CustomerPublic,
+        owner_id=owner_id,
+        since=since,
+        limit=limit,
+    )
+
+
+@router.get("/{id}", response_model=CustomerPublic | CustomerPublicExpanded)
+async def read_customer(
+    request: Request,
+    response: Response,
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    id: uuid.UUID,
+    expand: Annotated[list[str], Depends(customer_expansion)],
+    fields: Annotated[list[str] | None, Depends(customer_fields)],
+) -> Any:
     """
     Get customer type by ID.
     """
-    customer = session.get(Customer, id)
+    if expand and fields is not None:
+        raise HTTPException(
+            status_code=422, detail="Cannot both expand and pick fields"
+        )
+    customer = await session.get(
+        Customer,
+        id,
+        options=[
+            *customer_expansion.options(expand),
+            *customer_fields.options(fields, "owner_id", "date_updated"),
+        ],
+    )
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     if not current_user.is_superuser and (customer.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return customer
+    if expand:
+        return customer_expansion.to_public(customer, expand)
+    validators = Validators(customer.date_updated, request.url.query)
+    if not_modified := validators.not_modified(request):
+        return not_modified
+    if fields is not None:
+        return validators.apply(customer_fields.response(customer, fields), response)
+    return validators.apply(customer_expansion.to_public(customer, expand), response)
 
 
 @router.post("/", response_model=CustomerPublic)
@@ -64,10 +199,10 @@ def create_customer(
     customer_type = session.get(CustomerType, customer_in.customer_type_id)
     if not customer_type:
         raise HTTPException(status_code=404, detail="Customer type not found")
-    customer = Customer.model_validate(customer_in, update={"owner_id": current_user.id})
+    customer = Customer.model_validate(
+        customer_in, update={"owner_id": current_user.id}
+    )
     session.add(customer)
-    session.commit()
-    session.refresh(customer)
     return customer
 
 
@@ -95,8 +230,6 @@ def update_customer(
     update_dict.update(BaseModelUpdate().model_dump())
     customer.sqlmodel_update(update_dict)
     session.add(customer)
-    session.commit()
-    session.refresh(customer)
     return customer
 
 
@@ -113,7 +246,7 @@ def delete_customer(
     if not current_user.is_superuser and (customer.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(customer)
-    session.commit()
     return Message(message="Customer deleted successfully")
 
+
 # TODO: consider to add a feature for getting low stock customers
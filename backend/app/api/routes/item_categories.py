@@ -1,48 +1,83 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select, and_
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import and_, select
 
+from app.api.changes import read_changes
 from app.api.deps import CurrentUser, SessionDep
-from app.models import ItemCategory, ItemCategoryCreate, ItemCategoryPublic, ItemCategoriesPublic, ItemCategoryUpdate, Message, BaseModelUpdate
+from app.api.pagination import count_rows, page_response, paginate
+from app.api.streaming import export_columns
+from app.models import (
+    BaseModelUpdate,
+    CountMode,
+    ItemCategoriesPublic,
+    ItemCategory,
+    ItemCategoryChangesPublic,
+    ItemCategoryCreate,
+    ItemCategoryPublic,
+    ItemCategoryUpdate,
+    Message,
+)
 
 router = APIRouter(prefix="/item_categories", tags=["item_categories"])
 
 
 @router.get("/", response_model=ItemCategoriesPublic)
 def read_item_categories(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
 ) -> Any:
     """
     Retrieve item categories.
     """
 
+    statement = select(*export_columns(ItemCategory, ItemCategoryPublic))
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(ItemCategory)
-        count = session.exec(count_statement).one()
-        statement = select(ItemCategory).offset(skip).limit(limit)
-        item_categories = session.exec(statement).all()
+        count = count_rows(session, statement, ItemCategory, mode=count_mode)
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(ItemCategory)
-            .where(ItemCategory.owner_id == current_user.id)
+        statement = statement.where(ItemCategory.owner_id == current_user.id)
+        count = count_rows(
+            session, statement, ItemCategory, mode=count_mode, owner_id=current_user.id
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(ItemCategory)
-            .where(ItemCategory.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        item_categories = session.exec(statement).all()
+    item_categories, next_cursor = paginate(
+        session, statement, ItemCategory, skip=skip, limit=limit, after=after
+    )
+
+    return page_response(
+        item_categories, count=count, count_mode=count_mode, next_cursor=next_cursor
+    )
 
-    return ItemCategoriesPublic(data=item_categories, count=count)
+
+@router.get("/changes", response_model=ItemCategoryChangesPublic)
+def read_item_category_changes(
+    session: SessionDep,
+    current_user: CurrentUser,
+    since: str | None = None,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve the item categories created, updated or deleted since a cursor.
+    """
+    owner_id = None if current_user.is_superuser else current_user.id
+    return read_changes(
+        session,
+        ItemCategory,
+        ItemCategoryPublic,
+        owner_id=owner_id,
+        since=since,
+        limit=limit,
+    )
 
 
 @router.get("/{id}", response_model=ItemCategoryPublic)
-def read_item_category(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_item_category(
+    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+) -> Any:
     """
     Get item category by ID.
     """
@@ -56,15 +91,18 @@ def read_item_category(session: SessionDep, current_user: CurrentUser, id: uuid.
 
 @router.post("/", response_model=ItemCategoryPublic)
 def create_item_category(
-    *, session: SessionDep, current_user: CurrentUser, item_category_in: ItemCategoryCreate
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    item_category_in: ItemCategoryCreate,
 ) -> Any:
     """
     Create new item category.
     """
-    item_category = ItemCategory.model_validate(item_category_in, update={"owner_id": current_user.id})
+    item_category = ItemCategory.model_validate(
+        item_category_in, update={"owner_id": current_user.id}
+    )
     session.add(item_category)
-    session.commit()
-    session.refresh(item_category)
     return item_category
 
 
@@ -88,8 +126,6 @@ def update_item_category(
     update_dict.update(BaseModelUpdate().model_dump())
     item_category.sqlmodel_update(update_dict)
     session.add(item_category)
-    session.commit()
-    session.refresh(item_category)
     return item_category
 
 
@@ -106,7 +142,7 @@ def delete_item_category(
     if not current_user.is_superuser and (item_category.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(item_category)
-    session.commit()
     return Message(message="Item category deleted successfully")
 
+
 # TODO: consider to add a feature for getting low stock item categories
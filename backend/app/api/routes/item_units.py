@@ -1,48 +1,83 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select, and_
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import and_, select
 
+from app.api.changes import read_changes
 from app.api.deps import CurrentUser, SessionDep
-from app.models import ItemUnit, ItemUnitCreate, ItemUnitPublic, ItemUnitsPublic, ItemUnitUpdate, Message, BaseModelUpdate
+from app.api.pagination import count_rows, page_response, paginate
+from app.api.streaming import export_columns
+from app.models import (
+    BaseModelUpdate,
+    CountMode,
+    ItemUnit,
+    ItemUnitChangesPublic,
+    ItemUnitCreate,
+    ItemUnitPublic,
+    ItemUnitsPublic,
+    ItemUnitUpdate,
+    Message,
+)
 
 router = APIRouter(prefix="/item_units", tags=["item_units"])
 
 
 @router.get("/", response_model=ItemUnitsPublic)
 def read_item_units(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
 ) -> Any:
     """
     Retrieve item units.
     """
 
+    statement = select(*export_columns(ItemUnit, ItemUnitPublic))
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(ItemUnit)
-        count = session.exec(count_statement).one()
-        statement = select(ItemUnit).offset(skip).limit(limit)
-        item_units = session.exec(statement).all()
+        count = count_rows(session, statement, ItemUnit, mode=count_mode)
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(ItemUnit)
-            .where(ItemUnit.owner_id == current_user.id)
+        statement = statement.where(ItemUnit.owner_id == current_user.id)
+        count = count_rows(
+            session, statement, ItemUnit, mode=count_mode, owner_id=current_user.id
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(ItemUnit)
-            .where(ItemUnit.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        item_units = session.exec(statement).all()
+    item_units, next_cursor = paginate(
+        session, statement, ItemUnit, skip=skip, limit=limit, after=after
+    )
 
-    return ItemUnitsPublic(data=item_units, count=count)
+    return page_response(
+        item_units, count=count, count_mode=count_mode, next_cursor=next_cursor
+    )
+
+
+@router.get("/changes", response_model=ItemUnitChangesPublic)
+def read_item_unit_changes(
+    session: SessionDep,
+    current_user: CurrentUser,
+    since: str | None = None,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve the item units created, updated or deleted since a cursor.
+    """
+    owner_id = None if current_user.is_superuser else current_user.id
+    return read_changes(
+        session,
+        ItemUnit,
+        ItemUnitPublic,
+        owner_id=owner_id,
+        since=since,
+        limit=limit,
+    )
 
 
 @router.get("/{id}", response_model=ItemUnitPublic)
-def read_item_unit(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_item_unit(
+    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+) -> Any:
     """
     Get item unit by ID.
     """
@@ -61,10 +96,10 @@ def create_item_unit(
     """
     Create new item unit.
     """
-    item_unit = ItemUnit.model_validate(item_unit_in, update={"owner_id": current_user.id})
+    item_unit = ItemUnit.model_validate(
+        item_unit_in, update={"owner_id": current_user.id}
+    )
     session.add(item_unit)
-    session.commit()
-    session.refresh(item_unit)
     return item_unit
 
 
@@ -88,8 +123,6 @@ def update_item_unit(
     update_dict.update(BaseModelUpdate().model_dump())
     item_unit.sqlmodel_update(update_dict)
     session.add(item_unit)
-    session.commit()
-    session.refresh(item_unit)
     return item_unit
 
 
@@ -106,7 +139,7 @@ def delete_item_unit(
     if not current_user.is_superuser and (item_unit.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(item_unit)
-    session.commit()
     return Message(message="Item unit deleted successfully")
 
+
 # TODO: consider to add a feature for getting low stock item units
@@ -1,57 +1,203 @@
+import csv
 import uuid
-from typing import Any
+from collections import defaultdict
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel import col, select
 
-from app.api.deps import CurrentUser, SessionDep
-from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, BaseModelUpdate, Message, ItemCategory, ItemUnit
+from app import crud
+from app.api.changes import read_changes
+from app.api.conditional import Validators, list_validators
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    CurrentUser,
+    ReadSessionDep,
+    SessionDep,
+)
+from app.api.expand import Expansion
+from app.api.fields import FieldSet
+from app.api.pagination import CURSOR_FIELDS, count_rows, page_response, paginate
+from app.api.streaming import (
+    export_columns,
+    iter_body,
+    iter_csv_rows,
+    iter_ndjson_rows,
+    stream_export,
+)
+from app.models import (
+    BaseModelUpdate,
+    CountMode,
+    ExportFormat,
+    Item,
+    ItemCategory,
+    ItemChangesPublic,
+    ItemCreate,
+    ItemPublic,
+    ItemPublicExpanded,
+    ItemsImportPublic,
+    ItemsPublic,
+    ItemsPublicExpanded,
+    ItemsStockPublic,
+    ItemsStockUpdate,
+    ItemStockPublic,
+    ItemUnit,
+    ItemUpdate,
+    Message,
+)
+from app.repositories import RItem
+from app.services import SItem
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+item_expansion = Expansion(Item, ItemPublic, ItemPublicExpanded)
+item_fields = FieldSet(Item, ItemPublic)
 
-@router.get("/", response_model=ItemsPublic)
-def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+
+@router.get("/", response_model=ItemsPublic | ItemsPublicExpanded)
+async def read_items(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    expand: Annotated[list[str], Depends(item_expansion)],
+    fields: Annotated[list[str] | None, Depends(item_fields)],
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
 ) -> Any:
     """
-    Retrieve items.
+    Retrieve items, with their item_category and item_unit if expanded.
     """
 
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Item)
-        count = session.exec(count_statement).one()
-        statement = select(Item).offset(skip).limit(limit)
-        items = session.exec(statement).all()
+    if expand and fields is not None:
+        raise HTTPException(
+            status_code=422, detail="Cannot both expand and pick fields"
+        )
+    if expand:
+        statement = select(Item)
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == current_user.id)
+        statement = select(*item_fields.columns(fields, *CURSOR_FIELDS))
+    owner_id = None
+    if not current_user.is_superuser:
+        statement = statement.where(Item.owner_id == current_user.id)
+        owner_id = current_user.id
+    validators = None
+    # the related rows of an expanded page aren't accounted for, and the
+    # newest writes of all owners aren't indexed
+    if not expand and owner_id is not None:
+        validators = await session.run_sync(
+            list_validators, Item, owner_id, request.url.query
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(Item.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
+        if validators is not None and (
+            not_modified := validators.not_modified(request)
+        ):
+            return not_modified
+    count = await session.run_sync(
+        count_rows, statement, Item, mode=count_mode, owner_id=owner_id
+    )
+    items, next_cursor = await session.run_sync(
+        paginate,
+        statement.options(*item_expansion.options(expand)),
+        Item,
+        skip=skip,
+        limit=limit,
+        after=after,
+    )
+
+    if not expand:
+        page = page_response(
+            items,
+            count=count,
+            count_mode=count_mode,
+            next_cursor=next_cursor,
+            fields=fields,
         )
-        items = session.exec(statement).all()
+        if validators is not None:
+            page.headers.update(validators.headers)
+        return page
+    return ItemsPublicExpanded(
+        data=[item_expansion.to_expanded(item, expand) for item in items],
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+    )
 
-    return ItemsPublic(data=items, count=count)
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}, "application/x-ndjson": {}}}},
+)
+def export_items(
+    session: ReadSessionDep, current_user: CurrentUser, format: ExportFormat = "csv"
+) -> Any:
+    """
+    Export all items as CSV or newline delimited JSON, streamed as it is read.
+    """
+    statement = select(*export_columns(Item, ItemPublic))
+    if not current_user.is_superuser:
+        statement = statement.where(Item.owner_id == current_user.id)
+    statement = statement.order_by(col(Item.date_created), col(Item.id))
+    return stream_export(session, statement, format=format, filename="items")
 
-@router.get("/{id}", response_model=ItemPublic)
-def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+
+@router.get("/changes", response_model=ItemChangesPublic)
+async def read_item_changes(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    since: str | None = None,
+    limit: int = 100,
+) -> Any:
     """
-    Get item by ID.
+    Retrieve the items created, updated or deleted since a cursor.
     """
-    item = session.get(Item, id)
+    owner_id = None if current_user.is_superuser else current_user.id
+    return await session.run_sync(
+        read_changes, Item, ItemPublic, owner_id=owner_id, since=since, limit=limit
+    )
+
+
+@router.get("/{id}", response_model=ItemPublic | ItemPublicExpanded)
+async def read_item(
+    request: Request,
+    response: Response,
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    id: uuid.UUID,
+    expand: Annotated[list[str], Depends(item_expansion)],
+    fields: Annotated[list[str] | None, Depends(item_fields)],
+) -> Any:
+    """
+    Get item by ID, with its item_category and item_unit if expanded.
+    """
+    if expand and fields is not None:
+        raise HTTPException(
+            status_code=422, detail="Cannot both expand and pick fields"
+        )
+    item = await session.get(
+        Item,
+        id,
+        options=[
+            *item_expansion.options(expand),
+            *item_fields.options(fields, "owner_id", "date_updated"),
+        ],
+    )
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     if not current_user.is_superuser and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return item
+    if expand:
+        return item_expansion.to_public(item, expand)
+    validators = Validators(item.date_updated, request.url.query)
+    if not_modified := validators.not_modified(request):
+        return not_modified
+    if fields is not None:
+        return validators.apply(item_fields.response(item, fields), response)
+    return validators.apply(item_expansion.to_public(item, expand), response)
 
 
 @router.post("/", response_model=ItemPublic)
@@ -69,11 +215,47 @@ def create_item(
         raise HTTPException(status_code=404, detail="Item unit not found")
     item = Item.model_validate(item_in, update={"owner_id": current_user.id})
     session.add(item)
-    session.commit()
-    session.refresh(item)
     return item
 
 
+@router.post(
+    "/import",
+    response_model=ItemsImportPublic,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {}, "application/x-ndjson": {}},
+        }
+    },
+)
+def import_items(
+    *, session: SessionDep, current_user: CurrentUser, request: Request
+) -> Any:
+    """
+    Import items from a CSV (with a header line) or newline delimited JSON body.
+
+    Rows have the fields of an item to create, with the category and unit
+    either by id or by name (`item_category`, `item_unit`). Invalid rows are
+    skipped and reported, the valid ones imported.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    chunks = iter_body(request)
+    if content_type == "text/csv":
+        rows = iter_csv_rows(chunks)
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        rows = iter_ndjson_rows(chunks)
+    else:
+        raise HTTPException(status_code=415, detail="Unsupported content type")
+    repo = RItem(session)
+    service = SItem(repo)
+    try:
+        return service.import_items(rows, current_user)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body is not valid UTF-8")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
+
+
 @router.put("/{id}", response_model=ItemPublic)
 def update_item(
     *,
@@ -100,10 +282,8 @@ def update_item(
             raise HTTPException(status_code=404, detail="Item unit not found")
     update_dict = item_in.model_dump(exclude_unset=True)
     update_dict.update(BaseModelUpdate().model_dump())
-    item.sqlmodel_update(update_dict)    
+    item.sqlmodel_update(update_dict)
     session.add(item)
-    session.commit()
-    session.refresh(item)
     return item
 
 
@@ -120,7 +300,6 @@ def delete_item(
     if not current_user.is_superuser and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(item)
-    session.commit()
     return Message(message="Item deleted successfully")
 
 
@@ -135,63 +314,89 @@ def update_stock_item(
     """
     Update an item stock.
     """
+    owner_id = None if current_user.is_superuser else current_user.id
+    item = crud.update_item_stock(
+        session=session, item_id=id, quantity=quantity, owner_id=owner_id
+    )
+    if item:
+        return item
+    # nothing was updated, look up why
     item = session.get(Item, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     if not current_user.is_superuser and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    item.stock += quantity
-    item.sqlmodel_update(BaseModelUpdate().model_dump())
-    session.add(item)
-    session.commit()
-    session.refresh(item)
-    return item
+    raise HTTPException(status_code=400, detail="Not enough stock")
+
+
+@router.post("/stock/batch", response_model=ItemsStockPublic)
+def update_stock_items(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    stock_in: ItemsStockUpdate,
+) -> Any:
+    """
+    Update the stock of many items at once, all lines or none are applied.
+    """
+    owner_id = None if current_user.is_superuser else current_user.id
+    items = crud.update_items_stock(
+        session=session, lines=stock_in.data, owner_id=owner_id
+    )
+    if items is not None:
+        items_by_id = {item.id: item for item in items}
+        return ItemsStockPublic(
+            data=[
+                ItemStockPublic(
+                    item_id=line.item_id,
+                    quantity=line.quantity,
+                    stock=items_by_id[line.item_id].stock,
+                    stock_minimum=items_by_id[line.item_id].stock_minimum,
+                )
+                for line in stock_in.data
+            ]
+        )
+    # nothing was updated, look up why for every item of the batch
+    quantities: dict[uuid.UUID, int] = defaultdict(int)
+    for line in stock_in.data:
+        quantities[line.item_id] += line.quantity
+    errors = crud.stock_errors(
+        session=session, quantities=quantities, owner_id=owner_id
+    )
+    raise HTTPException(status_code=400, detail=errors)
 
 
 @router.get("/low_stock/", response_model=ItemsPublic)
-def read_low_stock_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_low_stock_items(
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+    fields: Annotated[list[str] | None, Depends(item_fields)] = None,
 ) -> Any:
     """
     Retrieve low stock items.
     """
 
-    if current_user.is_superuser:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.stock <= Item.stock_minimum)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(Item.stock <= Item.stock_minimum)
-            .offset(skip)
-            .limit(limit)
-        )
-        items = session.exec(statement).all()
-    else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(and_(
-                Item.owner_id == current_user.id,
-                Item.stock <= Item.stock_minimum,
-            ))
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(and_(
-                Item.owner_id == current_user.id,
-                Item.stock <= Item.stock_minimum,
-            ))
-            .offset(skip)
-            .limit(limit)
-        )
-        items = session.exec(statement).all()
+    statement = select(*item_fields.columns(fields, *CURSOR_FIELDS)).where(
+        Item.stock <= Item.stock_minimum
+    )
+    if not current_user.is_superuser:
+        statement = statement.where(Item.owner_id == current_user.id)
+    count = await session.run_sync(count_rows, statement, Item, mode=count_mode)
+    items, next_cursor = await session.run_sync(
+        paginate, statement, Item, skip=skip, limit=limit, after=after
+    )
 
-    return ItemsPublic(data=items, count=count)
+    return page_response(
+        items,
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+        fields=fields,
+    )
 
 
 @router.put("/{id}/activate", response_model=ItemPublic)
@@ -212,8 +417,6 @@ def activate_item(
     item.is_active = True
     item.sqlmodel_update(BaseModelUpdate().model_dump())
     session.add(item)
-    session.commit()
-    session.refresh(item)
     return item
 
 
@@ -235,6 +438,4 @@ def deactivate_item(
     item.is_active = False
     item.sqlmodel_update(BaseModelUpdate().model_dump())
     session.add(item)
-    session.commit()
-    session.refresh(item)
     return item
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from functools import partial
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -6,11 +7,22 @@ from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.deps import (
+    AsyncSessionDep,
+    CurrentUser,
+    SessionDep,
+    TokenDataDep,
+    check_user,
+    decode_token,
+    get_current_active_superuser,
+)
 from app.core import security
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.core.security import get_password_hash
-from app.models import Message, NewPassword, Token, UserPublic
+from app.core.keys import token_keys
+from app.core.security import password_hasher
+from app.core.uow import after_commit
+from app.models import Message, NewPassword, RefreshToken, Token, User, UserPublic
 from app.utils import (
     generate_password_reset_token,
     generate_reset_password_email,
@@ -21,26 +33,76 @@ from app.utils import (
 router = APIRouter(tags=["login"])
 
 
+def create_tokens(user: User) -> Token:
+    # what the user is, trusted by the API until the token expires unless they
+    # are revoked (see `claimed_user`). Permissions aren't claimed, no version
+    # shared by the workers would tell when they went stale: they are resolved
+    # per request (see `get_permissions`)
+    claims = {"active": user.is_active, "superuser": user.is_superuser}
+    return Token(
+        access_token=security.create_access_token(
+            user.id,
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            claims=claims,
+        ),
+        refresh_token=security.create_refresh_token(
+            user.id,
+            expires_delta=timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+        ),
+    )
+
+
 @router.post("/login/access-token")
-def login_access_token(
-    session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+async def login_access_token(
+    session: AsyncSessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = crud.authenticate(
+    user = await crud.authenticate_async(
         session=session, email=form_data.username, password=form_data.password
     )
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return Token(
-        access_token=security.create_access_token(
-            user.id, expires_delta=access_token_expires
-        )
-    )
+    return create_tokens(user)
+
+
+@router.post("/login/refresh-token")
+def refresh_access_token(session: SessionDep, body: RefreshToken) -> Token:
+    """
+    Get a new access token, and the refresh token to use next, for a refresh
+    token. The user row is checked again, and the refresh token revoked
+    """
+    token_data = decode_token(body.refresh_token, type="refresh")
+    user = check_user(session.get(User, token_data.sub))
+    tokens = create_tokens(user)
+    crud.revoke_token(session=session, token_data=token_data)
+    return tokens
+
+
+@router.post("/logout")
+def logout(
+    session: SessionDep, token_data: TokenDataDep, body: RefreshToken | None = None
+) -> Message:
+    """
+    Revoke the access token, and the refresh token if given
+    """
+    crud.revoke_token(session=session, token_data=token_data)
+    if body is not None:
+        refresh_token_data = decode_token(body.refresh_token, type="refresh")
+        if refresh_token_data.sub == token_data.sub:
+            crud.revoke_token(session=session, token_data=refresh_token_data)
+    return Message(message="Logged out successfully")
+
+
+@router.get("/.well-known/jwks.json")
+def read_jwks() -> dict[str, Any]:
+    """
+    Public keys verifying access and refresh tokens, by key id (none with HS256)
+    """
+    return token_keys.jwks()
 
 
 @router.post("/login/test-token", response_model=UserPublic)
@@ -91,10 +153,11 @@ def reset_password(session: SessionDep, body: NewPassword) -> Message:
         )
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    hashed_password = get_password_hash(password=body.new_password)
+    hashed_password = password_hasher.hash(body.new_password).result()
     user.hashed_password = hashed_password
+    user_id = user.id
     session.add(user)
-    session.commit()
+    after_commit(session, partial(principal_cache.invalidate, str(user_id)))
     return Message(message="Password updated successfully")
 
 
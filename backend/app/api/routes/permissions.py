@@ -41,13 +41,15 @@ def read_permission(session: SessionDep, id: uuid.UUID) -> Any:
     dependencies=[Depends(get_current_active_superuser)],
     response_model=PermissionsPublic,
 )
-def read_permissions(session: SessionDep, skip: int = 0, limit: int = 10) -> Any:
+def read_permissions(
+    session: SessionDep, skip: int = 0, limit: int = 10, after: str | None = None
+) -> Any:
     """
     Retrieve permissions.
     """
     repo = RPermission(session)
     service = SPermission(repo)
-    return service.read_permissions(skip, limit)
+    return service.read_permissions(skip, limit, after)
 
 
 @router.post(
@@ -4,7 +4,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 
 from app.api.deps import SessionDep
-from app.core.security import get_password_hash
+from app.core.security import password_hasher
 from app.models import (
     User,
     UserPublic,
@@ -29,10 +29,9 @@ def create_user(user_in: PrivateUserCreate, session: SessionDep) -> Any:
     user = User(
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=password_hasher.hash(user_in.password).result(),
     )
 
     session.add(user)
-    session.commit()
 
     return user
@@ -0,0 +1,59 @@
+import uuid
+from datetime import datetime
+from typing import Annotated, Any
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.api.deps import CurrentUser, SessionDep
+from app.api.streaming import iter_ndjson
+from app.models import PurchaseReceive, PurchaseReceiveLine, PurchaseReceivePublic
+from app.repositories import RPurchase
+from app.services import PurchaseReceiveError, SPurchase
+from app.utils import utcnow
+
+router = APIRouter(prefix="/purchases", tags=["purchases"])
+
+
+@router.post(
+    "/receive",
+    response_model=PurchaseReceivePublic,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "schema": PurchaseReceiveLine.model_json_schema()
+                }
+            },
+        }
+    },
+)
+def receive_purchase(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    request: Request,
+    supplier_id: uuid.UUID,
+    store_id: uuid.UUID,
+    date_purchase: datetime | None = None,
+    date_payable: datetime | None = None,
+    description: Annotated[str | None, Query(max_length=255)] = None,
+) -> Any:
+    """
+    Receive a supplier delivery, its lines are streamed in the body as
+    newline delimited JSON, one PurchaseReceiveLine per line.
+    """
+    receive_in = PurchaseReceive(
+        date_purchase=date_purchase or utcnow(),
+        description=description,
+        supplier_id=supplier_id,
+        store_id=store_id,
+        date_payable=date_payable,
+    )
+    lines = iter_ndjson(request, PurchaseReceiveLine)
+    repo = RPurchase(session)
+    service = SPurchase(repo)
+    try:
+        return service.receive(receive_in, lines, current_user)
+    except PurchaseReceiveError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
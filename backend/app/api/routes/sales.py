@@ -0,0 +1,157 @@
+import uuid
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import col, select
+
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncReadSessionDep,
+    CurrentUser,
+    ReadSessionDep,
+    SessionDep,
+)
+from app.api.expand import Expansion
+from app.api.fields import FieldSet
+from app.api.pagination import CURSOR_FIELDS, count_rows, page_response, paginate
+from app.api.streaming import export_columns, stream_export
+from app.models import (
+    CountMode,
+    ExportFormat,
+    Sale,
+    SaleCheckout,
+    SaleCheckoutPublic,
+    SalePublic,
+    SalePublicExpanded,
+    SalesPublic,
+    SalesPublicExpanded,
+)
+from app.repositories import RSale
+from app.services import SaleCheckoutError, SSale
+
+router = APIRouter(prefix="/sales", tags=["sales"])
+
+sale_expansion = Expansion(Sale, SalePublic, SalePublicExpanded)
+sale_fields = FieldSet(Sale, SalePublic)
+
+
+@router.get("/", response_model=SalesPublic | SalesPublicExpanded)
+async def read_sales(
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    expand: Annotated[list[str], Depends(sale_expansion)],
+    fields: Annotated[list[str] | None, Depends(sale_fields)],
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+) -> Any:
+    """
+    Retrieve sales, with their customer, store, lines, receivables and returns
+    if expanded.
+    """
+    if expand and fields is not None:
+        raise HTTPException(
+            status_code=422, detail="Cannot both expand and pick fields"
+        )
+    if expand:
+        statement = select(Sale)
+    else:
+        statement = select(*sale_fields.columns(fields, *CURSOR_FIELDS))
+    owner_id = None
+    if not current_user.is_superuser:
+        statement = statement.where(Sale.owner_id == current_user.id)
+        owner_id = current_user.id
+    count = await session.run_sync(
+        count_rows, statement, Sale, mode=count_mode, owner_id=owner_id
+    )
+    sales, next_cursor = await session.run_sync(
+        paginate,
+        statement.options(*sale_expansion.options(expand)),
+        Sale,
+        skip=skip,
+        limit=limit,
+        after=after,
+    )
+
+    if not expand:
+        return page_response(
+            sales,
+            count=count,
+            count_mode=count_mode,
+            next_cursor=next_cursor,
+            fields=fields,
+        )
+    return SalesPublicExpanded(
+        data=[sale_expansion.to_expanded(sale, expand) for sale in sales],
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}, "application/x-ndjson": {}}}},
+)
+def export_sales(
+    session: ReadSessionDep, current_user: CurrentUser, format: ExportFormat = "csv"
+) -> Any:
+    """
+    Export all sales as CSV or newline delimited JSON, streamed as it is read.
+    """
+    statement = select(*export_columns(Sale, SalePublic))
+    if not current_user.is_superuser:
+        statement = statement.where(Sale.owner_id == current_user.id)
+    statement = statement.order_by(col(Sale.date_created), col(Sale.id))
+    return stream_export(session, statement, format=format, filename="sales")
+
+
+@router.get("/{id}", response_model=SalePublic | SalePublicExpanded)
+async def read_sale(
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    id: uuid.UUID,
+    expand: Annotated[list[str], Depends(sale_expansion)],
+    fields: Annotated[list[str] | None, Depends(sale_fields)],
+) -> Any:
+    """
+    Get sale by ID, with its customer, store, lines, receivables and returns if
+    expanded.
+    """
+    if expand and fields is not None:
+        raise HTTPException(
+            status_code=422, detail="Cannot both expand and pick fields"
+        )
+    sale = await session.get(
+        Sale,
+        id,
+        options=[
+            *sale_expansion.options(expand),
+            *sale_fields.options(fields, "owner_id"),
+        ],
+    )
+    if not sale:
+        raise HTTPException(status_code=404, detail="Sale not found")
+    if not current_user.is_superuser and (sale.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    if fields is not None:
+        return sale_fields.response(sale, fields)
+    return sale_expansion.to_public(sale, expand)
+
+
+@router.post("/checkout", response_model=SaleCheckoutPublic)
+def checkout_sale(
+    *, session: SessionDep, current_user: CurrentUser, checkout_in: SaleCheckout
+) -> Any:
+    """
+    Check out a sale: record it with its lines and payment, take its stock out.
+    """
+    repo = RSale(session)
+    service = SSale(repo)
+    try:
+        return service.checkout(checkout_in, current_user)
+    except SaleCheckoutError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
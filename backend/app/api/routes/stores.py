@@ -1,57 +1,97 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import select
 
+from app.api.changes import read_changes
 from app.api.deps import CurrentUser, SessionDep
-from app.models import Store, StoreCreate, StorePublic, StoresPublic, StoreUpdate, Message, BaseModelUpdate
+from app.api.fields import FieldSet
+from app.api.pagination import CURSOR_FIELDS, count_rows, page_response, paginate
+from app.models import (
+    BaseModelUpdate,
+    CountMode,
+    Message,
+    Store,
+    StoreChangesPublic,
+    StoreCreate,
+    StorePublic,
+    StoresPublic,
+    StoreUpdate,
+)
 
 router = APIRouter(prefix="/stores", tags=["stores"])
 
+store_fields = FieldSet(Store, StorePublic)
+
 
 @router.get("/", response_model=StoresPublic)
 def read_stores(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+    fields: Annotated[list[str] | None, Depends(store_fields)] = None,
 ) -> Any:
     """
     Retrieve stores.
     """
 
+    statement = select(*store_fields.columns(fields, *CURSOR_FIELDS))
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Store)
-        count = session.exec(count_statement).one()
-        statement = select(Store).offset(skip).limit(limit)
-        stores = session.exec(statement).all()
+        count = count_rows(session, statement, Store, mode=count_mode)
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(Store)
-            .where(Store.owner_id == current_user.id)
+        statement = statement.where(Store.owner_id == current_user.id)
+        count = count_rows(
+            session, statement, Store, mode=count_mode, owner_id=current_user.id
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Store)
-            .where(Store.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        stores = session.exec(statement).all()
+    stores, next_cursor = paginate(
+        session, statement, Store, skip=skip, limit=limit, after=after
+    )
+
+    return page_response(
+        stores,
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+        fields=fields,
+    )
 
-    return StoresPublic(data=stores, count=count)
+
+@router.get("/changes", response_model=StoreChangesPublic)
+def read_store_changes(
+    session: SessionDep,
+    current_user: CurrentUser,
+    since: str | None = None,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve the stores created, updated or deleted since a cursor.
+    """
+    owner_id = None if current_user.is_superuser else current_user.id
+    return read_changes(
+        session, Store, StorePublic, owner_id=owner_id, since=since, limit=limit
+    )
 
 
 @router.get("/{id}", response_model=StorePublic)
-def read_store(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_store(
+    session: SessionDep,
+    current_user: CurrentUser,
+    id: uuid.UUID,
+    fields: Annotated[list[str] | None, Depends(store_fields)] = None,
+) -> Any:
     """
     Get store by ID.
     """
-    store = session.get(Store, id)
+    store = session.get(Store, id, options=store_fields.options(fields, "owner_id"))
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
     if not current_user.is_superuser and (store.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return store
+    return store_fields.response(store, fields)
 
 
 @router.post("/", response_model=StorePublic)
@@ -63,8 +103,6 @@ def create_store(
     """
     store = Store.model_validate(store_in, update={"owner_id": current_user.id})
     session.add(store)
-    session.commit()
-    session.refresh(store)
     return store
 
 
@@ -88,8 +126,6 @@ def update_store(
     update_dict.update(BaseModelUpdate().model_dump())
     store.sqlmodel_update(update_dict)
     session.add(store)
-    session.commit()
-    session.refresh(store)
     return store
 
 
@@ -106,7 +142,7 @@ def delete_store(
     if not current_user.is_superuser and (store.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(store)
-    session.commit()
     return Message(message="Store deleted successfully")
 
+
 # TODO: consider to add a feature for getting low stock stores
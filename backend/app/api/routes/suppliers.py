@@ -1,57 +1,81 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import select
 
 from app.api.deps import CurrentUser, SessionDep
-from app.models import Supplier, SupplierCreate, SupplierPublic, SuppliersPublic, SupplierUpdate, Message, BaseModelUpdate
+from app.api.fields import FieldSet
+from app.api.pagination import CURSOR_FIELDS, count_rows, page_response, paginate
+from app.models import (
+    BaseModelUpdate,
+    CountMode,
+    Message,
+    Supplier,
+    SupplierCreate,
+    SupplierPublic,
+    SuppliersPublic,
+    SupplierUpdate,
+)
 
 router = APIRouter(prefix="/suppliers", tags=["suppliers"])
 
+supplier_fields = FieldSet(Supplier, SupplierPublic)
+
 
 @router.get("/", response_model=SuppliersPublic)
 def read_suppliers(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+    fields: Annotated[list[str] | None, Depends(supplier_fields)] = None,
 ) -> Any:
     """
     Retrieve suppliers.
     """
 
+    statement = select(*supplier_fields.columns(fields, *CURSOR_FIELDS))
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Supplier)
-        count = session.exec(count_statement).one()
-        statement = select(Supplier).offset(skip).limit(limit)
-        suppliers = session.exec(statement).all()
+        count = count_rows(session, statement, Supplier, mode=count_mode)
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(Supplier)
-            .where(Supplier.owner_id == current_user.id)
+        statement = statement.where(Supplier.owner_id == current_user.id)
+        count = count_rows(
+            session, statement, Supplier, mode=count_mode, owner_id=current_user.id
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Supplier)
-            .where(Supplier.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        suppliers = session.exec(statement).all()
+    suppliers, next_cursor = paginate(
+        session, statement, Supplier, skip=skip, limit=limit, after=after
+    )
 
-    return SuppliersPublic(data=suppliers, count=count)
+    return page_response(
+        suppliers,
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+        fields=fields,
+    )
 
 
 @router.get("/{id}", response_model=SupplierPublic)
-def read_supplier(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_supplier(
+    session: SessionDep,
+    current_user: CurrentUser,
+    id: uuid.UUID,
+    fields: Annotated[list[str] | None, Depends(supplier_fields)] = None,
+) -> Any:
     """
     Get supplier by ID.
     """
-    supplier = session.get(Supplier, id)
+    supplier = session.get(
+        Supplier, id, options=supplier_fields.options(fields, "owner_id")
+    )
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     if not current_user.is_superuser and (supplier.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return supplier
+    return supplier_fields.response(supplier, fields)
 
 
 @router.post("/", response_model=SupplierPublic)
@@ -61,10 +85,10 @@ def create_supplier(
     """
     Create new supplier.
     """
-    supplier = Supplier.model_validate(supplier_in, update={"owner_id": current_user.id})
+    supplier = Supplier.model_validate(
+        supplier_in, update={"owner_id": current_user.id}
+    )
     session.add(supplier)
-    session.commit()
-    session.refresh(supplier)
     return supplier
 
 
@@ -88,8 +112,6 @@ def update_supplier(
     update_dict.update(BaseModelUpdate().model_dump())
     supplier.sqlmodel_update(update_dict)
     session.add(supplier)
-    session.commit()
-    session.refresh(supplier)
     return supplier
 
 
@@ -106,7 +128,7 @@ def delete_supplier(
     if not current_user.is_superuser and (supplier.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(supplier)
-    session.commit()
     return Message(message="Supplier deleted successfully")
 
+
 # TODO: consider to add a feature for getting low stock suppliers
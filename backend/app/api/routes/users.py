@@ -1,8 +1,9 @@
 import uuid
-from typing import Any
+from functools import partial
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import col, delete, select
 
 from app import crud
 from app.api.deps import (
@@ -11,10 +12,15 @@ from app.api.deps import (
     get_current_active_superuser,
     permission_required,
 )
+from app.api.fields import FieldSet
+from app.api.pagination import CURSOR_FIELDS, count_rows, page_response, paginate
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.security import password_hasher
+from app.core.uow import after_commit
 from app.models import (
     BaseModelUpdate,
+    CountMode,
     Item,
     Message,
     UpdatePassword,
@@ -30,24 +36,39 @@ from app.utils import generate_new_account_email, send_email
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+user_fields = FieldSet(User, UserPublic)
+
 
 @router.get(
     "/",
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: SessionDep,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+    fields: Annotated[list[str] | None, Depends(user_fields)] = None,
+) -> Any:
     """
     Retrieve users.
     """
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    statement = select(*user_fields.columns(fields, *CURSOR_FIELDS))
+    count = count_rows(session, statement, User, mode=count_mode)
+    users, next_cursor = paginate(
+        session, statement, User, skip=skip, limit=limit, after=after
+    )
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-
-    return UsersPublic(data=users, count=count)
+    return page_response(
+        users,
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+        fields=fields,
+    )
 
 
 @router.get(
@@ -55,18 +76,31 @@ def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
     dependencies=[Depends(permission_required("special:read"))],
     response_model=UsersPublic,
 )
-def read_special(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_special(
+    session: SessionDep,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+    fields: Annotated[list[str] | None, Depends(user_fields)] = None,
+) -> Any:
     """
     Retrieve special.
     """
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    statement = select(*user_fields.columns(fields, *CURSOR_FIELDS))
+    count = count_rows(session, statement, User, mode=count_mode)
+    users, next_cursor = paginate(
+        session, statement, User, skip=skip, limit=limit, after=after
+    )
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-
-    return UsersPublic(data=users, count=count)
+    return page_response(
+        users,
+        count=count,
+        count_mode=count_mode,
+        next_cursor=next_cursor,
+        fields=fields,
+    )
 
 
 @router.post(
@@ -114,8 +148,7 @@ def update_user_me(
     user_data.update(BaseModelUpdate().model_dump())
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    after_commit(session, partial(principal_cache.invalidate, str(current_user.id)))
     return current_user
 
 
@@ -126,17 +159,21 @@ def update_password_me(
     """
     Update own password.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    verified, _ = password_hasher.verify_and_update(
+        body.current_password, current_user.hashed_password
+    ).result()
+    if not verified:
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = password_hasher.hash(body.new_password).result()
     current_user.hashed_password = hashed_password
     current_user.sqlmodel_update(BaseModelUpdate().model_dump())
+    user_id = current_user.id
     session.add(current_user)
-    session.commit()
+    after_commit(session, partial(principal_cache.invalidate, str(user_id)))
     return Message(message="Password updated successfully")
 
 
@@ -157,8 +194,10 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
+    user_id = current_user.id
     session.delete(current_user)
-    session.commit()
+    after_commit(session, partial(principal_cache.invalidate, str(user_id)))
+    crud.revoke_user_claims(session=session, user_id=user_id)
     return Message(message="User deleted successfully")
 
 
@@ -180,20 +219,23 @@ def register_user(session: SessionDep, user_in: UserRegister) -> Any:
 
 @router.get("/{user_id}", response_model=UserPublic)
 def read_user_by_id(
-    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+    user_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    fields: Annotated[list[str] | None, Depends(user_fields)] = None,
 ) -> Any:
     """
     Get a specific user by id.
     """
-    user = session.get(User, user_id)
+    user = session.get(User, user_id, options=user_fields.options(fields))
     if user == current_user:
-        return user
+        return user_fields.response(user, fields)
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have enough privileges",
         )
-    return user
+    return user_fields.response(user, fields)
 
 
 @router.patch(
@@ -245,5 +287,6 @@ def delete_user(
     statement = delete(Item).where(col(Item.owner_id) == user_id)
     session.exec(statement)
     session.delete(user)
-    session.commit()
+    after_commit(session, partial(principal_cache.invalidate, str(user_id)))
+    crud.revoke_user_claims(session=session, user_id=user_id)
     return Message(message="User deleted successfully")
@@ -2,7 +2,10 @@ from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
-from app.models import Message
+from app.core.cache import permission_cache, principal_cache
+from app.core.db import async_engine, engine, replicas
+from app.core.security import password_hasher
+from app.models import CacheStats, Message, PasswordHasherStats, PoolStats
 from app.utils import generate_test_email, send_email
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -26,6 +29,52 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/cache-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def cache_stats() -> dict[str, CacheStats]:
+    """
+    Hit/miss counters of the in-process caches of this worker.
+    """
+    return {
+        "principal": CacheStats(**principal_cache.stats()),
+        "permission": CacheStats(**permission_cache.stats()),
+    }
+
+
+@router.get(
+    "/pool-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def pool_stats() -> dict[str, PoolStats]:
+    """
+    Connections of the database pools of this worker (the primary's, then the
+    replicas'), and how long requests waited to get one.
+    """
+    stats = {
+        "sync": PoolStats(**engine.pool.stats()),  # type: ignore[attr-defined]
+        "async": PoolStats(**async_engine.pool.stats()),  # type: ignore[attr-defined]
+    }
+    for i, replica in enumerate(replicas.replicas):
+        stats[f"replica_{i}"] = PoolStats(**replica.engine.pool.stats())  # type: ignore[attr-defined]
+        stats[f"replica_{i}_async"] = PoolStats(
+            **replica.async_engine.pool.stats()  # type: ignore[attr-defined]
+        )
+    return stats
+
+
+@router.get(
+    "/password-hasher-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def password_hasher_stats() -> PasswordHasherStats:
+    """
+    Queue depth of the password hashing processes of this worker.
+    """
+    return PasswordHasherStats(**password_hasher.stats())
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
@@ -0,0 +1,157 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import Any, TypeVar
+
+import anyio.from_thread
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Select, Text, cast, func, literal_column
+from sqlmodel import Session, col, select
+
+from app.core.db import driver_connection
+from app.models import ExportFormat
+
+M = TypeVar("M", bound=BaseModel)
+T = TypeVar("T")
+
+# rows fetched from the server side cursor, and bytes sent, at a time
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+# Sync endpoints run in a worker thread, these read the request body from
+# there chunk by chunk as it arrives, instead of buffering all of it first
+def iter_body(request: Request) -> Iterator[bytes]:
+    stream = request.stream()
+
+    async def receive() -> bytes | None:
+        return await anext(stream, None)
+
+    while (chunk := anyio.from_thread.run(receive)) is not None:
+        if chunk:
+            yield chunk
+
+
+def iter_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Split a stream of chunks into lines, without their line break."""
+    rest = b""
+    for chunk in chunks:
+        *lines, rest = (rest + chunk).split(b"\n")
+        yield from lines
+    if rest:
+        yield rest
+
+
+def iter_ndjson(request: Request, model: type[M]) -> Iterator[M]:
+    """
+    Validate a newline delimited JSON body one line at a time.
+
+    An invalid line raises a 422 like FastAPI's own body validation, its
+    errors located by line number.
+    """
+    for number, line in enumerate(iter_lines(iter_body(request)), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield model.model_validate_json(line)
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            for error in errors:
+                error["loc"] = ("body", number, *error["loc"])
+            raise HTTPException(status_code=422, detail=jsonable_encoder(errors))
+
+
+def iter_csv_rows(chunks: Iterator[bytes]) -> Iterator[tuple[int, dict[str, str]]]:
+    """Rows of a UTF-8 CSV with a header line, with the line each one ends on."""
+    text = (line.decode("utf-8-sig") + "\n" for line in iter_lines(chunks))
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(chunks: Iterator[bytes]) -> Iterator[tuple[int, Any]]:
+    """
+    Decoded values of newline delimited JSON, with their line number.
+
+    Unlike `iter_ndjson` nothing is validated, a line that isn't JSON at all
+    is yielded as None.
+    """
+    for number, line in enumerate(iter_lines(chunks), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Lists of `size` consecutive items, the last one possibly shorter."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def export_columns(model: Any, public: type[BaseModel]) -> list[Any]:
+    """The columns of table `model` that make up its `public` model, in order."""
+    return [col(getattr(model, name)) for name in public.model_fields]
+
+
+def _csv_chunks(session: Session, statement: Select[Any]) -> Iterator[bytes]:
+    # COPY has the server write the CSV, values in their PostgreSQL text form
+    compiled = statement.compile(dialect=session.get_bind().dialect)
+    connection = driver_connection(session)
+    buffer = bytearray()
+    with (
+        connection.cursor() as cursor,
+        cursor.copy(
+            f"COPY ({compiled}) TO STDOUT WITH (FORMAT csv, HEADER)", compiled.params
+        ) as copy,
+    ):
+        # a row at a time comes in, send bigger chunks
+        for data in copy:
+            buffer += data
+            if len(buffer) >= EXPORT_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+    yield bytes(buffer)
+
+
+def _ndjson_chunks(session: Session, statement: Select[Any]) -> Iterator[bytes]:
+    # the server encodes every row as a JSON object, as the API would
+    export = statement.subquery("export")
+    lines = select(cast(func.row_to_json(literal_column("export")), Text))
+    result = session.execute(
+        lines.select_from(export).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    with result:
+        for rows in result.partitions():
+            yield "".join([f"{line}\n" for (line,) in rows]).encode()
+
+
+def stream_export(
+    session: Session, statement: Select[Any], *, format: ExportFormat, filename: str
+) -> StreamingResponse:
+    """
+    Stream the rows of `statement` as a CSV (with a header line) or newline
+    delimited JSON download.
+
+    PostgreSQL encodes the rows and they're read a batch at a time, from COPY
+    or a server side cursor, without building an object, let alone a model,
+    per row or value. Memory use doesn't grow with the size of the table.
+    """
+    encode = _csv_chunks if format == "csv" else _ndjson_chunks
+    return StreamingResponse(
+        encode(session, statement),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
@@ -0,0 +1,142 @@
+"""
+Throughput and latency of the same item page served by a sync and by an async
+route, under 50 and 500 concurrent clients.
+
+    python -m app.benchmarks.async_routes
+
+The pools are sized by the POSTGRES_POOL_* settings.
+
+Sync routes run on the threadpool (40 threads by default), so at most that
+many requests are in flight at once however many clients wait; async routes
+are only bounded by the connection pool.
+"""
+
+import logging
+import statistics
+import time
+import uuid
+from typing import Any
+
+import anyio
+import anyio.to_thread
+import httpx
+from fastapi import FastAPI
+from sqlmodel import Session, select
+
+from app.api.deps import AsyncSessionDep
+from app.api.pagination import paginate
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner
+from app.core.db import async_engine, engine
+from app.models import Item, ItemsPublic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class InFlight:
+    def __init__(self) -> None:
+        self.now = 0
+        self.max = 0
+
+    def __enter__(self) -> None:
+        self.now += 1
+        self.max = max(self.max, self.now)
+
+    def __exit__(self, *args: Any) -> None:
+        self.now -= 1
+
+
+def create_app(in_flight: dict[str, InFlight]) -> FastAPI:
+    app = FastAPI()
+
+    # With SessionDep, once all threads wait on a connection of the (smaller)
+    # pool, the connections are never released: closing a session after its
+    # response also needs a thread. Requests stall for the pool timeout, so the
+    # session is closed within the route here.
+    @app.get("/sync/{owner_id}")
+    def sync_page(owner_id: uuid.UUID) -> Any:
+        with in_flight["sync"], Session(engine) as session:
+            statement = select(Item).where(Item.owner_id == owner_id)
+            items, _ = paginate(session, statement, Item, limit=20)
+            return ItemsPublic(data=items, count=None)  # type: ignore[arg-type]
+
+    @app.get("/async/{owner_id}")
+    async def async_page(session: AsyncSessionDep, owner_id: uuid.UUID) -> Any:
+        with in_flight["async"]:
+            statement = select(Item).where(Item.owner_id == owner_id)
+            items, _ = await session.run_sync(paginate, statement, Item, limit=20)
+            return ItemsPublic(data=items, count=None)  # type: ignore[arg-type]
+
+    return app
+
+
+async def load(
+    app: FastAPI, path: str, *, clients: int, requests: int
+) -> tuple[float, list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    # a failed request (e.g. timing out on the connection pool) is a 500
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+
+        async def client() -> None:
+            nonlocal errors
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await c.get(path)
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+
+        start = time.perf_counter()
+        async with anyio.create_task_group() as tg:
+            for _ in range(clients):
+                tg.start_soon(client)
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, errors
+
+
+async def compare(owner_id: uuid.UUID, clients: int, requests: int) -> None:
+    in_flight = {"sync": InFlight(), "async": InFlight()}
+    app = create_app(in_flight)
+    threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+    logger.info("%d clients, threadpool of %d threads", clients, threads)
+    pools = {"sync": engine.pool, "async": async_engine.pool}
+    for name in ("sync", "async"):
+        await load(app, f"/{name}/{owner_id}", clients=20, requests=5)  # warm up
+        waited = pools[name].stats()["wait_seconds"]  # type: ignore[attr-defined]
+        elapsed, latencies, errors = await load(
+            app, f"/{name}/{owner_id}", clients=clients, requests=requests
+        )
+        waited = pools[name].stats()["wait_seconds"] - waited  # type: ignore[attr-defined]
+        quantiles = statistics.quantiles(latencies, n=100)
+        logger.info(
+            "%5s: %6.0f req/s, p50 %7.1f ms, p99 %7.1f ms, %3d in flight at most,"
+            " %d errors, %.1f ms waiting on the pool per request",
+            name,
+            len(latencies) / elapsed,
+            quantiles[49] * 1000,
+            quantiles[98] * 1000,
+            in_flight[name].max,
+            errors,
+            waited / len(latencies) * 1000,
+        )
+    await async_engine.dispose()
+
+
+def run(clients: tuple[int, ...] = (50, 500), requests: int = 10) -> None:
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, 1_000)
+            for n in clients:
+                anyio.run(compare, owner.id, n, requests)
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Rows per second written through `RBase`, one object at a time (commit and
+refresh each) vs one set-based statement for the whole batch.
+
+    python -m app.benchmarks.batch_repository
+"""
+
+import logging
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from sqlmodel import Session, col
+
+from app.benchmarks.utils import drop_owner, seed_owner
+from app.core.db import engine
+from app.models import ItemCategory, User
+from app.repositories import RBase
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rows_per_second(fn: Callable[[], Any], rows: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return rows / (time.perf_counter() - start)
+
+
+def categories(owner: User, n: int) -> list[ItemCategory]:
+    return [ItemCategory(name=f"category {i}", owner_id=owner.id) for i in range(n)]
+
+
+def run(n: int = 2_000) -> None:
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            repo: RBase[ItemCategory, uuid.UUID] = RBase(session, ItemCategory)
+            owned = col(ItemCategory.owner_id) == owner.id
+            objs = categories(owner, n)
+            results = {
+                "create": rows_per_second(
+                    lambda: [repo.create(obj) for obj in objs], n
+                ),
+                "update": rows_per_second(
+                    lambda: [repo.update(obj, {"description": "x"}) for obj in objs],
+                    n,
+                ),
+                "delete": rows_per_second(lambda: deque(map(repo.delete, objs)), n),
+                "create_many": rows_per_second(
+                    lambda: repo.create_many(categories(owner, n)), n
+                ),
+                "create_many (returning)": rows_per_second(
+                    lambda: repo.create_many(categories(owner, n), returning=True),
+                    n,
+                ),
+                "update_many": rows_per_second(
+                    lambda: repo.update_many(owned, {"description": "x"}), 2 * n
+                ),
+                "upsert_many (returning)": rows_per_second(
+                    lambda: repo.upsert_many(categories(owner, n), returning=True),
+                    n,
+                ),
+                "delete_many": rows_per_second(lambda: repo.delete_many(owned), 3 * n),
+            }
+        finally:
+            drop_owner(session, owner)
+    logger.info("%d item categories:", n)
+    for name, rate in results.items():
+        logger.info("  %-24s %9.0f rows/s", name, rate)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
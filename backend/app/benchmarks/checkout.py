@@ -0,0 +1,100 @@
+"""
+Sale checkouts/sec for baskets of different sizes.
+
+    python -m app.benchmarks.checkout
+"""
+
+import logging
+from functools import partial
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, select, update
+
+from app import crud
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner, throughput
+from app.core.config import settings
+from app.core.db import engine, init_db
+from app.main import app
+from app.models import (
+    AccountCreate,
+    CustomerCreate,
+    CustomerTypeCreate,
+    Item,
+    StoreCreate,
+)
+from app.tests.utils.utils import get_superuser_token_headers
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run(sizes: tuple[int, ...] = (10, 50, 100), n: int = 200) -> None:
+    with Session(engine) as session:
+        init_db(session)
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, max(sizes))
+            session.exec(
+                update(Item)
+                .where(col(Item.owner_id) == owner.id)
+                .values(stock=1_000_000)
+            )
+            session.commit()
+            item_ids = session.exec(
+                select(Item.id).where(Item.owner_id == owner.id)
+            ).all()
+            customer_type = crud.create_customer_type(
+                session=session,
+                customer_type_in=CustomerTypeCreate(name="benchmark"),
+                owner_id=owner.id,
+            )
+            customer = crud.create_customer(
+                session=session,
+                customer_in=CustomerCreate(
+                    name="benchmark", customer_type_id=customer_type.id
+                ),
+                owner_id=owner.id,
+            )
+            store = crud.create_store(
+                session=session,
+                store_in=StoreCreate(name="benchmark"),
+                owner_id=owner.id,
+            )
+            account = crud.create_account(
+                session=session,
+                account_in=AccountCreate(name="benchmark"),
+                owner_id=owner.id,
+            )
+            with TestClient(app) as client:
+                headers = get_superuser_token_headers(client)
+                for size in sizes:
+                    data = {
+                        "customer_id": str(customer.id),
+                        "store_id": str(store.id),
+                        "lines": [
+                            {"item_id": str(item_id), "quantity": 1, "price": 1500}
+                            for item_id in item_ids[:size]
+                        ],
+                        "amount_paid": 1500 * size // 2,
+                        "account_id": str(account.id),
+                    }
+                    rate = throughput(
+                        partial(
+                            client.post,
+                            f"{settings.API_V1_STR}/sales/checkout",
+                            headers=headers,
+                            json=data,
+                        ),
+                        n=n,
+                    )
+                    logger.info("%3d lines: %6.1f checkouts/s", size, rate)
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
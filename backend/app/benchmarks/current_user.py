@@ -0,0 +1,49 @@
+"""
+Authenticated requests/sec with and without the principal cache.
+
+    python -m app.benchmarks.current_user
+"""
+
+import logging
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.benchmarks.utils import throughput
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.db import engine, init_db
+from app.main import app
+from app.tests.utils.utils import get_superuser_token_headers
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run(n: int = 2000) -> None:
+    with Session(engine) as session:
+        init_db(session)
+    url = f"{settings.API_V1_STR}/users/me"
+    with TestClient(app) as client:
+        headers = get_superuser_token_headers(client)
+
+        ttl_seconds = principal_cache.ttl_seconds
+        principal_cache.ttl_seconds = 0
+        principal_cache.clear()
+        uncached = throughput(lambda: client.get(url, headers=headers), n=n)
+
+        principal_cache.ttl_seconds = ttl_seconds
+        principal_cache.clear()
+        cached = throughput(lambda: client.get(url, headers=headers), n=n)
+
+    logger.info("GET %s without principal cache: %.0f req/s", url, uncached)
+    logger.info("GET %s with principal cache: %.0f req/s", url, cached)
+    logger.info("Principal cache: %s", principal_cache.stats())
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Time and peak Python memory of importing item catalogs of growing size.
+
+    python -m app.benchmarks.item_import
+"""
+
+import logging
+import time
+import tracemalloc
+from collections.abc import Iterator
+
+from sqlmodel import Session
+
+from app.api.streaming import iter_csv_rows
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner
+from app.core.db import engine
+from app.repositories import RItem
+from app.services import SItem
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def catalog(n: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    # generated lazily and cut at arbitrary points, like a streamed upload
+    buffer = bytearray(
+        b"title,price_purchase,price_sell,stock,item_category,item_unit\n"
+    )
+    for i in range(n):
+        buffer += f"item {i},1000,1500,{i % 50},Benchmark,benchmark\n".encode()
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    yield bytes(buffer)
+
+
+def run(sizes: tuple[int, ...] = (1_000, 10_000, 100_000)) -> None:
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, 0)
+            service = SItem(RItem(session))
+            for size in sizes:
+                start = time.perf_counter()
+                report = service.import_items(iter_csv_rows(catalog(size)), owner)
+                elapsed = time.perf_counter() - start
+                assert report.imported == size
+                # traced separately, tracing slows every allocation down
+                tracemalloc.start()
+                service.import_items(iter_csv_rows(catalog(size)), owner)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                logger.info(
+                    "%6d rows: %7.1f ms, %8.0f rows/s, peak %6.2f MiB",
+                    size,
+                    elapsed * 1000,
+                    size / elapsed,
+                    peak / 2**20,
+                )
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Per-row cost of serving an item page of 100, 1000 and 10000 rows: ORM
+objects validated into ItemsPublic and again as the route's response_model,
+vs the public columns as rows, encoded straight to JSON by `page_response`.
+
+    python -m app.benchmarks.list_serialization
+
+Both routes run through FastAPI in process, fetching the page included, the
+count left out (the same for both).
+"""
+
+import logging
+import uuid
+from functools import partial
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.api.pagination import page_response, paginate
+from app.api.streaming import export_columns
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner, timed
+from app.core.db import engine
+from app.models import Item, ItemPublic, ItemsPublic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PAGE_SIZES = (100, 1000, 10_000)
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/models/{owner_id}", response_model=ItemsPublic)
+    def models_page(owner_id: uuid.UUID, limit: int) -> Any:
+        with Session(engine) as session:
+            statement = select(Item).where(Item.owner_id == owner_id)
+            items, next_cursor = paginate(session, statement, Item, limit=limit)
+            return ItemsPublic(data=items, count=None, next_cursor=next_cursor)  # type: ignore[arg-type]
+
+    @app.get("/rows/{owner_id}", response_model=ItemsPublic)
+    def rows_page(owner_id: uuid.UUID, limit: int) -> Any:
+        with Session(engine) as session:
+            statement = select(*export_columns(Item, ItemPublic)).where(
+                Item.owner_id == owner_id
+            )
+            items, next_cursor = paginate(session, statement, Item, limit=limit)
+            return page_response(
+                items, count=None, count_mode="exact", next_cursor=next_cursor
+            )
+
+    return app
+
+
+def run() -> None:
+    client = TestClient(create_app())
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, max(PAGE_SIZES))
+            for limit in PAGE_SIZES:
+                results = {}
+                for path in ("models", "rows"):
+                    url = f"/{path}/{owner.id}?limit={limit}"
+                    assert len(client.get(url).json()["data"]) == limit
+                    results[path] = timed(
+                        partial(client.get, url), repeat=max(5, 20_000 // limit)
+                    )
+                logger.info(
+                    "%5d rows: models %7.1f ms (%5.1f us/row),"
+                    " rows %7.1f ms (%5.1f us/row), x%.1f",
+                    limit,
+                    results["models"],
+                    results["models"] * 1000 / limit,
+                    results["rows"],
+                    results["rows"] * 1000 / limit,
+                    results["models"] / results["rows"],
+                )
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Deep page latency of offset vs cursor (keyset) pagination on items.
+
+    python -m app.benchmarks.pagination
+"""
+
+import logging
+from functools import partial
+
+from sqlmodel import Session, select
+
+from app.api.pagination import encode_cursor, paginate
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner, timed
+from app.core.db import engine
+from app.models import Item
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run(n: int = 200_000, limit: int = 100) -> None:
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, n)
+            statement = select(Item).where(Item.owner_id == owner.id)
+            for depth in (0, n // 10, n // 2, n - limit):
+                cursor = None
+                if depth:
+                    rows, _ = paginate(
+                        session, statement, Item, skip=depth - 1, limit=1
+                    )
+                    cursor = encode_cursor(rows[0])
+                offset_ms = timed(
+                    partial(paginate, session, statement, Item, skip=depth, limit=limit)
+                )
+                cursor_ms = timed(
+                    partial(
+                        paginate, session, statement, Item, limit=limit, after=cursor
+                    )
+                )
+                session.expunge_all()
+                logger.info(
+                    "row %7d: offset %8.2f ms, cursor %8.2f ms",
+                    depth,
+                    offset_ms,
+                    cursor_ms,
+                )
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
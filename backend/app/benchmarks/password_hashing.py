@@ -0,0 +1,130 @@
+"""
+A burst of logins (everyone starting their shift at once), with bcrypt run in
+the request threads as before vs on the password hashing processes, and how
+long a cheap sync route sharing the threadpool takes meanwhile.
+
+    python -m app.benchmarks.password_hashing
+
+Python's bcrypt releases the GIL, so inline hashing is mostly bounded by the
+threadpool: every login holds a thread for ~250 ms, and other sync routes
+queue behind them.
+"""
+
+import logging
+import statistics
+import time
+import uuid
+from typing import Annotated, Any
+
+import anyio
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel import Session
+
+from app import crud
+from app.api.deps import AsyncSessionDep
+from app.benchmarks.utils import drop_owner, seed_owner
+from app.core.db import async_engine, engine
+from app.core.security import (
+    get_password_hash,
+    password_hasher,
+    verify_password,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PASSWORD = uuid.uuid4().hex
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    Form = Annotated[OAuth2PasswordRequestForm, Depends()]
+
+    @app.post("/inline")
+    def inline_login(form_data: Form) -> Any:
+        with Session(engine) as session:
+            user = crud.get_user_by_email(session=session, email=form_data.username)
+            assert user and verify_password(form_data.password, user.hashed_password)
+
+    @app.post("/pooled")
+    async def pooled_login(session: AsyncSessionDep, form_data: Form) -> Any:
+        assert await crud.authenticate_async(
+            session=session, email=form_data.username, password=form_data.password
+        )
+
+    @app.get("/ping")
+    def ping() -> None:
+        pass
+
+    return app
+
+
+async def burst(
+    app: FastAPI, path: str, email: str, *, logins: int
+) -> tuple[float, list[float]]:
+    """Seconds the logins took, and latencies of pings sent meanwhile."""
+    transport = httpx.ASGITransport(app=app)
+    pings: list[float] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        done = anyio.Event()
+
+        async def login() -> None:
+            data = {"username": email, "password": PASSWORD}
+            response = await c.post(path, data=data)
+            assert response.status_code == 200, response.text
+
+        async def ping() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                await c.get("/ping")
+                pings.append(time.perf_counter() - start)
+                await anyio.sleep(0.01)
+
+        start = time.perf_counter()
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(ping)
+            async with anyio.create_task_group() as logins_tg:
+                for _ in range(logins):
+                    logins_tg.start_soon(login)
+            elapsed = time.perf_counter() - start
+            done.set()
+    return elapsed, pings
+
+
+async def compare(email: str, logins: int) -> None:
+    app = create_app()
+    for path in ("/inline", "/pooled"):
+        await burst(app, path, email, logins=4)  # warm up, start the processes
+        elapsed, pings = await burst(app, path, email, logins=logins)
+        logger.info(
+            "%7s: %d logins in %5.2f s, ping p50 %6.1f ms, p99 %6.1f ms",
+            path,
+            logins,
+            elapsed,
+            statistics.median(pings) * 1000,
+            statistics.quantiles(pings, n=100)[98] * 1000,
+        )
+    await async_engine.dispose()
+
+
+def run(logins: int = 30) -> None:
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            owner.hashed_password = get_password_hash(PASSWORD)
+            session.add(owner)
+            session.commit()
+            anyio.run(compare, owner.email, logins)
+        finally:
+            password_hasher.shutdown()
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
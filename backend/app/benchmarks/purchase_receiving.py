@@ -0,0 +1,85 @@
+"""
+Time and peak Python memory of receiving deliveries of growing size.
+
+    python -m app.benchmarks.purchase_receiving
+"""
+
+import logging
+import time
+import tracemalloc
+import uuid
+from collections.abc import Iterator, Sequence
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner
+from app.core.db import engine
+from app.models import (
+    Item,
+    PurchaseReceive,
+    PurchaseReceiveLine,
+    StoreCreate,
+    SupplierCreate,
+)
+from app.repositories import RPurchase
+from app.services import SPurchase
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def delivery(item_ids: Sequence[uuid.UUID], n: int) -> Iterator[PurchaseReceiveLine]:
+    # generated lazily, like lines parsed from a streamed request body
+    for i in range(n):
+        yield PurchaseReceiveLine(
+            item_id=item_ids[i % len(item_ids)], quantity=1 + i % 10, price=1000
+        )
+
+
+def run(sizes: tuple[int, ...] = (1_000, 10_000, 50_000), items: int = 1_000) -> None:
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, items)
+            item_ids = session.exec(
+                select(Item.id).where(Item.owner_id == owner.id)
+            ).all()
+            supplier = crud.create_supplier(
+                session=session,
+                supplier_in=SupplierCreate(name="benchmark"),
+                owner_id=owner.id,
+            )
+            store = crud.create_store(
+                session=session,
+                store_in=StoreCreate(name="benchmark"),
+                owner_id=owner.id,
+            )
+            receive_in = PurchaseReceive(supplier_id=supplier.id, store_id=store.id)
+            service = SPurchase(RPurchase(session))
+            for size in sizes:
+                start = time.perf_counter()
+                service.receive(receive_in, delivery(item_ids, size), owner)
+                elapsed = time.perf_counter() - start
+                # traced separately, tracing slows every allocation down
+                tracemalloc.start()
+                service.receive(receive_in, delivery(item_ids, size), owner)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                logger.info(
+                    "%6d lines: %7.1f ms, %8.0f lines/s, peak %6.2f MiB",
+                    size,
+                    elapsed * 1000,
+                    size / elapsed,
+                    peak / 2**20,
+                )
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
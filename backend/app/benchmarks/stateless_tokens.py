@@ -0,0 +1,64 @@
+"""
+Latency of an authenticated request whose access token carries the user's
+claims, vs a token with only a subject, authorized from the user row (with
+and without the principal cache).
+
+    python -m app.benchmarks.stateless_tokens
+"""
+
+import logging
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.benchmarks.utils import timed
+from app.core import security
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.db import engine, init_db
+from app.main import app
+from app.tests.utils.utils import get_superuser_token_headers
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run(repeat: int = 500) -> None:
+    with Session(engine) as session:
+        init_db(session)
+        user = crud.get_user_by_email(session=session, email=settings.FIRST_SUPERUSER)
+        assert user
+    # the cheapest page, so authorizing is most of the request
+    url = f"{settings.API_V1_STR}/items/?limit=1&count=none"
+    with TestClient(app) as client:
+        headers = get_superuser_token_headers(client)
+        subject_only = security.create_access_token(
+            user.id, expires_delta=timedelta(minutes=15)
+        )
+        subject_headers = {"Authorization": f"Bearer {subject_only}"}
+
+        def get(headers: dict[str, str]) -> None:
+            assert client.get(url, headers=headers).status_code == 200
+
+        ttl_seconds = principal_cache.ttl_seconds
+        principal_cache.ttl_seconds = 0
+        principal_cache.clear()
+        uncached = timed(lambda: get(subject_headers), repeat=repeat)
+        principal_cache.ttl_seconds = ttl_seconds
+        cached = timed(lambda: get(subject_headers), repeat=repeat)
+        claims = timed(lambda: get(headers), repeat=repeat)
+
+    logger.info("GET %s, median latency:", url)
+    logger.info("  user row:          %.2f ms", uncached)
+    logger.info("  principal cache:   %.2f ms", cached)
+    logger.info("  token claims:      %.2f ms", claims)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
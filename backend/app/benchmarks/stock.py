@@ -0,0 +1,88 @@
+"""
+Concurrent stock updates on one hot item: read-modify-write vs atomic UPDATE.
+
+    python -m app.benchmarks.stock
+"""
+
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner
+from app.core.db import engine
+from app.models import BaseModelUpdate, Item
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def read_modify_write(item_id: uuid.UUID) -> None:
+    # how PUT /items/{id}/stock used to update the stock
+    with Session(engine) as session:
+        item = session.get(Item, item_id)
+        assert item
+        item.stock += 1
+        item.sqlmodel_update(BaseModelUpdate().model_dump())
+        session.add(item)
+        session.commit()
+        session.refresh(item)
+
+
+def atomic_update(item_id: uuid.UUID) -> None:
+    with Session(engine) as session:
+        crud.update_item_stock(session=session, item_id=item_id, quantity=1)
+
+
+def hammer(
+    fn: Callable[[uuid.UUID], None], item_id: uuid.UUID, *, n: int, threads: int
+) -> tuple[float, int]:
+    """Run `fn` `n` times from `threads` threads, return (calls/s, final stock)."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: fn(item_id), range(n)))
+    elapsed = time.perf_counter() - start
+    with Session(engine) as session:
+        item = session.get(Item, item_id)
+        assert item
+        return n / elapsed, item.stock
+
+
+def run(n: int = 2000, threads: int = 16) -> None:
+    with Session(engine) as session:
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, 2)
+            item_ids = session.exec(
+                select(Item.id).where(Item.owner_id == owner.id)
+            ).all()
+            for name, fn, item_id in (
+                ("read-modify-write", read_modify_write, item_ids[0]),
+                ("atomic update", atomic_update, item_ids[1]),
+            ):
+                start_stock = session.exec(
+                    select(Item.stock).where(Item.id == item_id)
+                ).one()
+                session.commit()
+                rate, stock = hammer(fn, item_id, n=n, threads=threads)
+                logger.info(
+                    "%-17s %6.0f updates/s, %4d of %d updates lost",
+                    name,
+                    rate,
+                    start_stock + n - stock,
+                    n,
+                )
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
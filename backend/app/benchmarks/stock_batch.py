@@ -0,0 +1,80 @@
+"""
+Latency of one multi-line stock movement: one call per line vs one batch call.
+
+    python -m app.benchmarks.stock_batch
+"""
+
+import logging
+import uuid
+from collections.abc import Sequence
+from functools import partial
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.benchmarks.utils import drop_owner, seed_items, seed_owner, timed
+from app.core.config import settings
+from app.core.db import engine, init_db
+from app.main import app
+from app.models import Item
+from app.tests.utils.utils import get_superuser_token_headers
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run(sizes: tuple[int, ...] = (1, 20, 80)) -> None:
+    with Session(engine) as session:
+        init_db(session)
+        owner = seed_owner(session)
+        try:
+            seed_items(session, owner, max(sizes))
+            item_ids = session.exec(
+                select(Item.id).where(Item.owner_id == owner.id)
+            ).all()
+            session.commit()
+            with TestClient(app) as client:
+                headers = get_superuser_token_headers(client)
+
+                def put_each(lines: Sequence[uuid.UUID]) -> None:
+                    for item_id in lines:
+                        client.put(
+                            f"{settings.API_V1_STR}/items/{item_id}/stock",
+                            headers=headers,
+                            params={"quantity": 1},
+                        )
+
+                for size in sizes:
+                    lines = item_ids[:size]
+                    sequential_ms = timed(partial(put_each, lines))
+                    data = {
+                        "data": [
+                            {"item_id": str(item_id), "quantity": 1}
+                            for item_id in lines
+                        ]
+                    }
+                    batch_ms = timed(
+                        partial(
+                            client.post,
+                            f"{settings.API_V1_STR}/items/stock/batch",
+                            headers=headers,
+                            json=data,
+                        )
+                    )
+                    logger.info(
+                        "%3d lines: %3d calls %8.2f ms, one batch %8.2f ms",
+                        size,
+                        size,
+                        sequential_ms,
+                        batch_ms,
+                    )
+        finally:
+            drop_owner(session, owner)
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Access token verifications/sec per signing algorithm, with the verifying key
+parsed once (KeySet) vs passed to PyJWT as a PEM on every call.
+
+    python -m app.benchmarks.token_verify
+"""
+
+import logging
+import time
+from datetime import timedelta
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from app.benchmarks.utils import throughput
+from app.core.keys import KeySet
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def generate(algorithm: str) -> Any:
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def run(n: int = 20_000) -> None:
+    payload = {
+        "sub": "00000000-0000-0000-0000-000000000000",
+        "exp": time.time() + timedelta(minutes=15).total_seconds(),
+        "active": True,
+        "superuser": False,
+    }
+    for algorithm in ("HS256", "RS256", "EdDSA"):
+        if algorithm == "HS256":
+            keys = KeySet(algorithm=algorithm, secret_key="secret")
+            pem = "secret"
+        else:
+            private_key = generate(algorithm)
+            keys = KeySet(
+                algorithm=algorithm,
+                secret_key="",
+                private_key=private_key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption(),
+                ).decode(),
+                key_id="1",
+            )
+            pem = (
+                private_key.public_key()
+                .public_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PublicFormat.SubjectPublicKeyInfo,
+                )
+                .decode()
+            )
+        token = keys.sign(payload)
+        parsed = throughput(lambda: keys.verify(token), n=n)  # noqa: B023
+        unparsed = throughput(
+            lambda: jwt.decode(token, pem, algorithms=[algorithm]),  # noqa: B023
+            n=n,
+        )
+        sign = throughput(lambda: keys.sign(payload), n=n // 10)  # noqa: B023
+        logger.info(
+            "%5s: verify %7.0f/s (key parsed once), %7.0f/s (PEM per call),"
+            " sign %7.0f/s, %d bytes",
+            algorithm,
+            parsed,
+            unparsed,
+            sign,
+            len(token),
+        )
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == "__main__":
+    main()
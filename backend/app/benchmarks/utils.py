@@ -0,0 +1,90 @@
+import logging
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from sqlmodel import Session, col, delete, insert, text
+
+from app.core.security import get_password_hash
+from app.models import Item, ItemCategory, ItemUnit, User
+from app.utils import utcnow
+
+# every TestClient request is logged at INFO level, which drowns the results
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def throughput(fn: Callable[[], Any], *, n: int, warmup: int = 10) -> float:
+    """Call `fn` `n` times and return the achieved calls per second."""
+    for _ in range(warmup):
+        fn()
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - start)
+
+
+def timed(fn: Callable[[], Any], *, repeat: int = 20) -> float:
+    """Median wall time of `fn` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def seed_owner(session: Session) -> User:
+    """Create a throwaway owner, `drop_owner` cascades its rows away afterwards."""
+    user = User(
+        email=f"benchmark-{uuid.uuid4().hex}@example.com",
+        hashed_password=get_password_hash(uuid.uuid4().hex),
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def drop_owner(session: Session, owner: User) -> None:
+    # a bulk delete lets the database cascade, instead of the ORM loading and
+    # deleting every child row one by one
+    session.rollback()
+    session.exec(delete(User).where(col(User.id) == owner.id))
+    session.commit()
+
+
+def seed_items(session: Session, owner: User, n: int) -> tuple[ItemCategory, ItemUnit]:
+    """Bulk insert `n` items (with one category and unit) owned by `owner`."""
+    item_category = ItemCategory(name="benchmark", owner_id=owner.id)
+    item_unit = ItemUnit(name="benchmark", owner_id=owner.id)
+    session.add(item_category)
+    session.add(item_unit)
+    session.commit()
+    start = utcnow()
+    for offset in range(0, n, 10_000):
+        session.execute(
+            insert(Item),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "title": f"item {i}",
+                    "price_purchase": 1000,
+                    "price_sell": 1500,
+                    "stock": i % 50,
+                    "stock_minimum": 10,
+                    "is_active": True,
+                    "date_created": start + timedelta(microseconds=i),
+                    "date_updated": start + timedelta(microseconds=i),
+                    "owner_id": owner.id,
+                    "item_category_id": item_category.id,
+                    "item_unit_id": item_unit.id,
+                }
+                for i in range(offset, min(offset + 10_000, n))
+            ],
+        )
+    session.commit()
+    session.execute(text("ANALYZE item"))
+    return item_category, item_unit
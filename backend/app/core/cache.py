@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.models import Permission, Role, RolePermission, UserRole
+
+K = TypeVar("K", bound=Hashable)  # Cache key
+V = TypeVar("V")  # Cached value
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe, in-process LRU cache whose entries expire after a fixed TTL.
+
+    The cache is local to a worker process, so entries can outlive a change made
+    by another worker for at most `ttl_seconds`. A `max_size` or `ttl_seconds`
+    of zero disables the cache.
+    """
+
+    def __init__(self, *, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "max_size": self.max_size,
+            }
+
+
+class Version:
+    """
+    Monotonic counter, cache entries stamped with an older value are stale.
+
+    Bumping it invalidates every entry at once, which suits data that changes
+    rarely but fans out to many keys (e.g. one role shared by many users).
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self) -> int:
+        with self._lock:
+            self.value += 1
+            return self.value
+
+
+# Snapshot of the authenticated user's columns, keyed by the token `sub`, with
+# the time.time() it was read at. Another worker's change to the user reaches
+# this one's snapshot when it revokes the user's claims (is_active,
+# is_superuser, deletion), once revocations sync; other columns for up to the TTL
+principal_cache: TTLCache[str, tuple[float, dict[str, Any]]] = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Effective permission names of a user, stamped with `permission_version`.
+# Only the worker changing roles or permissions bumps its version: the others
+# serve what they cached for up to the TTL, kept short for that
+permission_cache: TTLCache[str, tuple[int, frozenset[str]]] = TTLCache(
+    max_size=settings.PERMISSION_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+permission_version = Version()
+
+_PERMISSION_MODELS = (Permission, Role, RolePermission, UserRole)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_permission_flush(session: Session, _flush_context: Any) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _PERMISSION_MODELS) for obj in changed):
+        session.info["permissions_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_permission_statement(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _PERMISSION_MODELS):
+        orm_execute_state.session.info["permissions_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_permission_version(session: Session) -> None:
+    # bump only once committed, so a concurrent reader can't cache the old rows
+    # under the new version
+    if session.info.pop("permissions_changed", False):
+        permission_version.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_permission_tracking(session: Session) -> None:
+    session.info.pop("permissions_changed", None)
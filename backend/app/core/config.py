@@ -18,7 +18,7 @@ from typing_extensions import Self
 def parse_cors(v: Any) -> list[str] | str:
     # TODO: remove below line if [fix : character encoded to \\x3a] in .env solved
     v = v.replace("\\x3a", ":")
-    
+
     if isinstance(v, str) and not v.startswith("["):
         return [i.strip() for i in v.split(",")]
     elif isinstance(v, list | str):
@@ -26,6 +26,15 @@ def parse_cors(v: Any) -> list[str] | str:
     raise ValueError(v)
 
 
+def parse_list(v: Any) -> list[str] | str:
+    # a comma separated string, or a JSON list
+    if isinstance(v, str) and not v.startswith("["):
+        return [i.strip() for i in v.split(",") if i.strip()]
+    elif isinstance(v, list | str):
+        return v
+    raise ValueError(v)
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         # Use top level .env file (one level above ./backend/)
@@ -35,8 +44,36 @@ class Settings(BaseSettings):
     )
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Access tokens carry the user's claims and are trusted without a database
+    # lookup, so they are short-lived, refresh tokens get new ones
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     # 60 minutes * 24 hours * 8 days = 8 days
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # How often each worker reloads the revoked tokens from the database
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5
+    # Signs access/refresh tokens with SECRET_KEY (HS256), or with a private
+    # key (RS256, EdDSA) so nodes only verifying tokens need no secret: they
+    # get the public keys of JWT_JWKS, a JWKS document keyed by "kid" that
+    # keeps retired keys around while tokens they signed are unexpired
+    JWT_ALGORITHM: Literal["HS256", "RS256", "EdDSA"] = "HS256"
+    JWT_PRIVATE_KEY: str | None = None  # PEM, on the nodes logging users in
+    JWT_KEY_ID: str | None = None  # "kid" of JWT_PRIVATE_KEY
+    JWT_JWKS: str | None = None
+    # Authenticated users are cached per worker, set TTL to 0 to disable
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    # How long other workers may still grant a permission after it is revoked
+    PERMISSION_CACHE_TTL_SECONDS: int = 5
+    PERMISSION_CACHE_MAX_SIZE: int = 10_000
+    # bcrypt cost factor, passwords hashed at a lower one are rehashed at login
+    PASSWORD_HASH_ROUNDS: int = 12
+    # Processes hashing passwords, per worker, and how many hashes may wait for
+    # them before requests needing one are turned away (503) instead of queuing
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # Outside production, a statement run this many times by one request is
+    # logged as likely N+1 loading
+    QUERY_REPEAT_THRESHOLD: int = 5
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -58,6 +95,24 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    # Connection pool of each engine, per worker process, see /utils/pool-stats/.
+    # Defaults are SQLAlchemy's; size them against PgBouncer/max_connections
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30
+    # Seconds before a connection is replaced (-1 never), keep it below any idle
+    # timeout of PgBouncer or a load balancer in between
+    POSTGRES_POOL_RECYCLE: int = -1
+    # Test connections on checkout (a round trip), to survive server restarts
+    POSTGRES_POOL_PRE_PING: bool = False
+    # Cancel statements running longer than this, 0 to disable
+    POSTGRES_STATEMENT_TIMEOUT_MS: int = 0
+    # Read replicas (comma separated postgresql+psycopg:// URLs) serving reads
+    # of GET routes, and how far behind the primary they may be to do so
+    POSTGRES_REPLICA_URIS: Annotated[list[str] | str, BeforeValidator(parse_list)] = []
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: float = 5
+    # After a user writes, their reads go to the primary for this long
+    POSTGRES_REPLICA_STICKY_SECONDS: float = 10
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -1,10 +1,102 @@
+from collections.abc import Callable
+from typing import Any, Concatenate, ParamSpec, TypeVar
+
+import psycopg
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session as ORMSession
 from sqlmodel import Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
 
 from app import crud
 from app.core.config import settings
+from app.core.pool import TimedAsyncQueuePool, TimedQueuePool
+from app.core.replicas import Replica, ReplicaRouter
+from app.core.uow import wrote
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def engine_options() -> dict[str, Any]:
+    """Pool and connection options of the engines, from the settings."""
+    options: dict[str, Any] = {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
+    if settings.POSTGRES_STATEMENT_TIMEOUT_MS:
+        # set at connection startup, so it holds for every transaction
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.POSTGRES_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI), poolclass=TimedQueuePool, **engine_options()
+)
+# The same database for `async def` routes, which wait on it without holding
+# one of the threadpool's threads like sync routes do
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=TimedAsyncQueuePool,
+    **engine_options(),
+)
+
+
+class AsyncSession(SQLModelAsyncSession):
+    """
+    sqlmodel's `AsyncSession`, whose `run_sync` is typed for the session it
+    calls `fn` with: a sqlmodel `Session` (its `sync_session_class`), so the
+    functions the sync routes call run as they are.
+    """
+
+    async def run_sync(
+        self,
+        fn: Callable[Concatenate[Session, P], T],
+        *arg: P.args,
+        **kw: P.kwargs,
+    ) -> T:
+        return await super().run_sync(fn, *arg, **kw)  # type: ignore[arg-type]
+
+
+def create_replica(url: str) -> Replica:
+    # read only, like a real replica would be, even when standing in for one
+    return Replica(
+        create_engine(
+            url, poolclass=TimedQueuePool, **engine_options()
+        ).execution_options(postgresql_readonly=True),
+        create_async_engine(
+            url, poolclass=TimedAsyncQueuePool, **engine_options()
+        ).execution_options(postgresql_readonly=True),
+    )
+
+
+replicas = ReplicaRouter(
+    [create_replica(url) for url in settings.POSTGRES_REPLICA_URIS],
+    max_lag_seconds=settings.POSTGRES_REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.POSTGRES_REPLICA_STICKY_SECONDS,
+)
+
+
+def driver_connection(session: Session) -> psycopg.Connection[Any]:
+    """The psycopg connection under `session`'s, for what only it does (COPY)."""
+    connection = session.connection().connection.driver_connection
+    if not isinstance(connection, psycopg.Connection):
+        raise TypeError(f"Expected a psycopg connection, got {connection!r}")
+    return connection
+
+
+@event.listens_for(ORMSession, "after_commit")
+def _read_own_writes(session: ORMSession) -> None:
+    # the current user dependencies tag their session with the user, whose
+    # reads stick to the primary once a transaction of theirs wrote something
+    if session.info.get("user_id") is not None and wrote(session):
+        replicas.wrote()
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,99 @@
+import functools
+import json
+from typing import Any
+
+import jwt
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import InvalidKeyError, InvalidTokenError
+from jwt.utils import base64url_decode
+
+from app.core.config import settings
+
+
+@functools.lru_cache(maxsize=64)
+def _key_id(header: str) -> str | None:
+    # the tokens a key signs share their header, decoded once
+    try:
+        kid = json.loads(base64url_decode(header)).get("kid")
+    except (ValueError, AttributeError):
+        raise InvalidTokenError("Invalid header")
+    return kid if isinstance(kid, str) else None
+
+
+class KeySet:
+    """
+    The keys signing and verifying tokens, parsed once per process (PyJWT
+    parses a PEM on every call it is passed one).
+
+    With HS256, `secret_key` does both. Otherwise tokens are signed with
+    `private_key` (when given, only nodes logging users in need it) under
+    `key_id`, and verified with the public key of their "kid", from `jwks`
+    or `private_key`'s own.
+    """
+
+    def __init__(
+        self,
+        *,
+        algorithm: str,
+        secret_key: str,
+        private_key: str | None = None,
+        key_id: str | None = None,
+        jwks: str | dict[str, Any] | None = None,
+    ) -> None:
+        self.algorithm = algorithm
+        self.key_id = key_id
+        self.signing_key: Any = None
+        self.verifying_keys: dict[str | None, Any] = {}
+        if algorithm == "HS256":
+            self.signing_key = secret_key
+            self.verifying_keys[None] = secret_key
+            return
+        algorithm_ = get_default_algorithms()[algorithm]
+        if private_key is not None:
+            self.signing_key = algorithm_.prepare_key(private_key)
+            self.verifying_keys[key_id] = self.signing_key.public_key()
+        keys = json.loads(jwks) if isinstance(jwks, str) else jwks or {}
+        for jwk in keys.get("keys", []):
+            self.verifying_keys[jwk.get("kid")] = jwt.PyJWK(jwk, algorithm).key
+        if not self.verifying_keys:
+            raise InvalidKeyError(f"{algorithm} needs a private key or a JWKS")
+
+    def sign(self, payload: dict[str, Any]) -> str:
+        if self.signing_key is None:
+            raise InvalidKeyError("This node has no key to sign tokens with")
+        headers = {"kid": self.key_id} if self.key_id is not None else None
+        return jwt.encode(
+            payload, self.signing_key, algorithm=self.algorithm, headers=headers
+        )
+
+    def verify(self, token: str) -> dict[str, Any]:
+        if self.algorithm == "HS256":
+            key = self.verifying_keys[None]
+        else:
+            kid = _key_id(token.partition(".")[0])
+            if kid not in self.verifying_keys:
+                raise InvalidTokenError(f"Unknown key id {kid!r}")
+            key = self.verifying_keys[kid]
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    def jwks(self) -> dict[str, Any]:
+        """The public keys, as a JWKS document (empty with HS256)."""
+        if self.algorithm == "HS256":
+            return {"keys": []}
+        algorithm = get_default_algorithms()[self.algorithm]
+        keys = []
+        for kid, key in self.verifying_keys.items():
+            jwk = algorithm.to_jwk(key, as_dict=True)
+            if kid is not None:
+                jwk["kid"] = kid
+            keys.append({**jwk, "alg": self.algorithm, "use": "sig"})
+        return {"keys": keys}
+
+
+token_keys = KeySet(
+    algorithm=settings.JWT_ALGORITHM,
+    secret_key=settings.SECRET_KEY,
+    private_key=settings.JWT_PRIVATE_KEY,
+    key_id=settings.JWT_KEY_ID,
+    jwks=settings.JWT_JWKS,
+)
@@ -0,0 +1,91 @@
+import bisect
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+# Upper bounds (seconds) of the buckets of checkout waits
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class WaitHistogram:
+    """Thread-safe histogram of how long connection checkouts took."""
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is unbounded
+        self.total_seconds = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.total_seconds += seconds
+            self.timeouts += timed_out
+
+    def stats(self) -> dict[str, Any]:
+        """Counts per bucket are cumulative, keyed by the bucket's upper bound."""
+        with self._lock:
+            histogram, count = {}, 0
+            for bound, n in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+                count += n
+                histogram[str(bound)] = count
+            return {
+                "checkouts": count,
+                "timeouts": self.timeouts,
+                "wait_seconds": self.total_seconds,
+                "wait_histogram": histogram,
+            }
+
+
+class TimedPoolMixin:
+    """
+    Records in `waits` how long each checkout took to get a connection, from
+    the pool or newly opened, so requests queuing on the pool show up.
+    """
+
+    waits: WaitHistogram
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.waits = WaitHistogram()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection: PoolProxiedConnection = super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.waits.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        self.waits.observe(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> Any:
+        # engine.dispose() replaces the pool, keep counting across it
+        pool = super().recreate()  # type: ignore[misc]
+        pool.waits = self.waits
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        pool: QueuePool = self  # type: ignore[assignment]
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # negative while the pool itself isn't full yet
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            **self.waits.stats(),
+        }
+
+
+# logged as the pools they extend, under the quiet "sqlalchemy" logger
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
@@ -0,0 +1,106 @@
+import functools
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine import ExceptionContext
+
+# bound parameters, and lists of them (expanded IN, multi-row VALUES)
+_PARAMETERS = re.compile(r"%\(\w+\)s(?:, %\(\w+\)s)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """`statement` without its parameters, the same whatever their values."""
+    return _WHITESPACE.sub(" ", _PARAMETERS.sub("?", statement)).strip()
+
+
+class QueryStats:
+    """
+    What a block of code ran on the database (see `record_queries`): its
+    statements and commits, the time spent on them, and how many times each
+    statement ran by fingerprint, which flags N+1 loads.
+    """
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.commits = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least `threshold` times, most repeated first."""
+        return [
+            (statement, count)
+            for statement, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+    def report(self) -> str:
+        lines = [
+            f"{self.statements} statements, {self.commits} commits"
+            f" in {self.seconds * 1000:.1f} ms"
+        ]
+        for statement, count in self.fingerprints.most_common():
+            lines.append(f"{count:4d} x {statement}")
+        return "\n".join(lines)
+
+
+_recording: ContextVar[tuple[QueryStats, ...]] = ContextVar("recording", default=())
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    """
+    Record what every engine runs within the block, in this context and the
+    threads and tasks it starts (a request, see the middleware in app.main).
+    Blocks nested in another record for both.
+    """
+    stats = QueryStats()
+    token = _recording.set((*_recording.get(), stats))
+    try:
+        yield stats
+    finally:
+        _recording.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn: Connection, *_args: Any) -> None:
+    if _recording.get():
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn: Connection, _cursor: Any, statement: str, *_args: Any) -> None:
+    recording = _recording.get()
+    if not recording:
+        return
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    key = fingerprint(statement)
+    for stats in recording:
+        # an executemany is one round trip too
+        stats.statements += 1
+        stats.seconds += seconds
+        stats.fingerprints[key] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed(context: ExceptionContext) -> None:
+    # a statement that raised never gets to `_after_execute`: drop its start,
+    # or the connection's next statement would be timed from it
+    if context.connection is not None:
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+@event.listens_for(Engine, "commit")
+def _count_commit(*_args: Any) -> None:
+    for stats in _recording.get():
+        stats.commits += 1
@@ -0,0 +1,147 @@
+import itertools
+import logging
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# The cookie of a client that wrote: the time.time() its reads go to the
+# primary until. The client carries it, so every worker honors it
+STICKY_COOKIE = "read_primary_until"
+
+# Seconds the replica is behind its primary, 0 when it has replayed all it
+# received (an idle primary sends nothing, its last replay just gets older)
+LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery()"
+    " OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class Replica:
+    """A read replica's engines, and its replication lag as last measured."""
+
+    def __init__(self, engine: Engine, async_engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.async_engine = async_engine
+        self.lag = math.inf  # unknown until checked, or unreachable
+        self.checked_at = -math.inf
+
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as connection:
+                self.lag = float(connection.execute(LAG_QUERY).scalar_one())
+        except Exception:
+            logger.warning("Replica %r is unreachable", self.engine.url, exc_info=True)
+            self.lag = math.inf
+        self.checked_at = time.monotonic()
+
+
+class Writes:
+    """Whether a transaction committed a write, see `ReplicaRouter.track_writes`."""
+
+    def __init__(self) -> None:
+        self.committed = False
+
+
+_tracking: ContextVar[Writes | None] = ContextVar("tracking_writes", default=None)
+
+
+class ReplicaRouter:
+    """
+    Chooses a replica to read from, round-robin, or None for the primary.
+
+    Replicas lagging more than `max_lag_seconds`, or whose lag wasn't checked
+    recently, are skipped. A client whose request wrote (see `track_writes`)
+    reads from the primary for `sticky_seconds` after, so it sees its own
+    writes: its `STICKY_COOKIE` says until when.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        *,
+        max_lag_seconds: float,
+        sticky_seconds: float,
+        check_interval_seconds: float = 1,
+    ) -> None:
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.sticky_seconds = sticky_seconds
+        self._turn = itertools.count()
+        self._stop = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    @contextmanager
+    def track_writes(self) -> Iterator[Writes]:
+        """
+        Note whether a transaction committed a write (see `wrote`) within the
+        block, in this context and the threads and tasks it starts (a
+        request, see the middleware in app.main).
+        """
+        writes = Writes()
+        token = _tracking.set(writes)
+        try:
+            yield writes
+        finally:
+            _tracking.reset(token)
+
+    def wrote(self) -> None:
+        writes = _tracking.get()
+        if writes is not None:
+            writes.committed = True
+
+    def choose(self, read_primary_until: float | None = None) -> Replica | None:
+        if not self.replicas:
+            return None
+        if read_primary_until is not None and time.time() < read_primary_until:
+            return None
+        # a lag measured before the monitor stalled doesn't say much anymore
+        checked_after = time.monotonic() - 3 * self.check_interval_seconds
+        start = next(self._turn)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if (
+                replica.lag <= self.max_lag_seconds
+                and replica.checked_at >= checked_after
+            ):
+                return replica
+        return None
+
+    def check(self) -> None:
+        """Measure the lag of every replica."""
+        for replica in self.replicas:
+            replica.check()
+
+    def start(self) -> None:
+        """Keep measuring lags in a background thread, until `stop`."""
+        if not self.replicas or self._monitor is not None:
+            return
+        self._stop.clear()
+        self.check()
+
+        def monitor() -> None:
+            while not self._stop.wait(self.check_interval_seconds):
+                self.check()
+
+        self._monitor = threading.Thread(
+            target=monitor, name="replica-monitor", daemon=True
+        )
+        self._monitor.start()
+
+    def stop(self) -> None:
+        if self._monitor is None:
+            return
+        self._stop.set()
+        self._monitor.join()
+        self._monitor = None
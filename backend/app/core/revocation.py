@@ -0,0 +1,116 @@
+import logging
+import threading
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Engine, func
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.models import TokenPayload, TokenRevocation
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    The unexpired rows of the token_revocation table, in memory.
+
+    Each worker adds what it revokes right away, and reloads the table every
+    `sync_interval_seconds` (see `start`) to pick up what other workers
+    revoked, so a revocation takes at most that long to apply everywhere.
+    """
+
+    def __init__(self, *, sync_interval_seconds: float) -> None:
+        self.sync_interval_seconds = sync_interval_seconds
+        self.jtis: set[uuid.UUID] = set()
+        # user id -> time up to which their access tokens' claims are stale
+        self.stale_before: dict[uuid.UUID, float] = {}
+        # added while a sync is under way, which may have read the table before
+        self._added: list[tuple[uuid.UUID, uuid.UUID | None, datetime]] | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    def add(self, revocation: TokenRevocation) -> None:
+        entry = (revocation.user_id, revocation.jti, revocation.revoked_at)
+        with self._lock:
+            self._add(*entry)
+            if self._added is not None:
+                self._added.append(entry)
+
+    def _add(
+        self, user_id: uuid.UUID, jti: uuid.UUID | None, revoked_at: datetime
+    ) -> None:
+        if jti is not None:
+            self.jtis.add(jti)
+            return
+        at = revoked_at.timestamp()
+        self.stale_before[user_id] = max(self.stale_before.get(user_id, 0), at)
+
+    def is_revoked(self, payload: TokenPayload) -> bool:
+        return payload.jti is not None and payload.jti in self.jtis
+
+    def is_stale(self, payload: TokenPayload) -> bool:
+        """Whether the token's claims may no longer match the user row."""
+        if payload.sub is None or payload.iat is None:
+            return True
+        return self.changed_since(uuid.UUID(payload.sub), payload.iat)
+
+    def changed_since(self, user_id: uuid.UUID, at: float) -> bool:
+        """Whether the user's claims were revoked at `at` (a time.time()) or after."""
+        stale_before = self.stale_before.get(user_id)
+        return stale_before is not None and at <= stale_before
+
+    def sync(self, engine: Engine) -> None:
+        """
+        Reload the unexpired revocations. Only reads: the expired ones are
+        purged as tokens are revoked (see `crud.revoke_token`).
+        """
+        with self._lock:
+            self._added = []
+        with Session(engine) as session:
+            rows = session.exec(
+                select(
+                    TokenRevocation.user_id,
+                    TokenRevocation.jti,
+                    TokenRevocation.revoked_at,
+                ).where(col(TokenRevocation.expires_at) > func.now())
+            ).all()
+        with self._lock:
+            self.jtis.clear()
+            self.stale_before.clear()
+            for user_id, jti, revoked_at in [*rows, *(self._added or [])]:
+                self._add(user_id, jti, revoked_at)
+            self._added = None
+
+    def start(self, engine: Engine) -> None:
+        """Keep syncing in a background thread, until `stop`."""
+        if self._monitor is not None:
+            return
+        self._stop.clear()
+        self.sync(engine)
+
+        def monitor() -> None:
+            while not self._stop.wait(self.sync_interval_seconds):
+                try:
+                    self.sync(engine)
+                except Exception:
+                    logger.warning("Syncing revoked tokens failed", exc_info=True)
+
+        self._monitor = threading.Thread(
+            target=monitor, name="token-revocation-sync", daemon=True
+        )
+        self._monitor.start()
+
+    def stop(self) -> None:
+        if self._monitor is None:
+            return
+        self._stop.set()
+        self._monitor.join()
+        self._monitor = None
+
+
+revoked_tokens = RevocationList(
+    sync_interval_seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS
+)
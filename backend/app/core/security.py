@@ -1,22 +1,51 @@
+import multiprocessing
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TypeVar
 
-import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.keys import token_keys
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
 
+# hashes below the configured rounds are `deprecated`, see `verify_and_update`
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
+
+# of the password reset tokens, access and refresh tokens use `token_keys`
 ALGORITHM = "HS256"
 
 
-def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
-    expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+def create_token(subject: str | Any, expires_delta: timedelta, **claims: Any) -> str:
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        "exp": now + expires_delta,
+        # not truncated to the second, to compare with revocation times
+        "iat": now.timestamp(),
+        "jti": str(uuid.uuid4()),
+        "sub": str(subject),
+        **claims,
+    }
+    return token_keys.sign(to_encode)
+
+
+def create_access_token(
+    subject: str | Any, expires_delta: timedelta, claims: dict[str, Any] | None = None
+) -> str:
+    return create_token(subject, expires_delta, type="access", **(claims or {}))
+
+
+def create_refresh_token(subject: str | Any, expires_delta: timedelta) -> str:
+    return create_token(subject, expires_delta, type="refresh")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -25,3 +54,87 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Whether the password matches, and its new hash if it should be rehashed."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """Too many passwords are already waiting to be hashed."""
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords on a pool of `workers` processes, so bcrypt
+    neither blocks the event loop nor holds the GIL of the request threads.
+
+    At most `max_pending` hashes are queued or running at once, beyond that
+    `hash` and `verify_and_update` raise PasswordHasherBusy rather than let
+    requests pile up behind the pool. The processes start on first use.
+    """
+
+    def __init__(self, *, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.peak_pending = 0
+        self.rejected = 0
+        self.completed = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def hash(self, password: str) -> Future[str]:
+        return self._submit(get_password_hash, password)
+
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Future[tuple[bool, str | None]]:
+        return self._submit(verify_and_update_password, plain_password, hashed_password)
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> Future[T]:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy
+            if self._executor is None:
+                # forking would copy the parent's threads and connections
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            future = self._executor.submit(fn, *args)
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future: Future[Any]) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "peak_pending": self.peak_pending,
+                "max_pending": self.max_pending,
+                "rejected": self.rejected,
+                "completed": self.completed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
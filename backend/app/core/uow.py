@@ -0,0 +1,128 @@
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, SessionTransaction, UOWTransaction
+from sqlalchemy.orm import Session as ORMSession
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# session.info keys: how many unit of work blocks are open on the session, what
+# to call once they commit, and whether its transaction wrote anything
+DEPTH = "unit_of_work_depth"
+AFTER_COMMIT = "unit_of_work_after_commit"
+WROTE = "transaction_wrote"
+
+
+def wrote(session: ORMSession) -> bool:
+    """
+    Whether the session's transaction wrote, or is about to: it flushed
+    changes, ran an INSERT, UPDATE or DELETE, was asked to commit within a unit
+    of work (what it wrote may have bypassed the ORM, e.g. COPY), or holds
+    changes yet to flush.
+    """
+    return bool(
+        session.info.get(WROTE) or session.new or session.dirty or session.deleted
+    )
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _flushed(session: ORMSession, _flush_context: UOWTransaction) -> None:
+    # only dispatched when there was something to flush
+    session.info[WROTE] = True
+
+
+@event.listens_for(ORMSession, "do_orm_execute")
+def _executed(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[WROTE] = True
+
+
+@event.listens_for(ORMSession, "after_transaction_end")
+def _ended(session: ORMSession, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(WROTE, None)
+
+
+class UnitOfWorkSession(Session):
+    """
+    A session whose `commit` only flushes while a unit of work is open on it
+    (see `unit_of_work`), which commits once as it closes.
+
+    So the crud functions, repositories and routes committing as they go all
+    write in one transaction, whichever of them a request goes through.
+    """
+
+    def commit(self) -> None:
+        if self.info.get(DEPTH):
+            self.info[WROTE] = True
+            self.flush()
+        else:
+            super().commit()
+
+
+def after_commit(session: Session | AsyncSession, callback: Callable[[], Any]) -> None:
+    """
+    Call `callback` once what `session` wrote is committed: when its unit of
+    work closes, or right away outside one. Dropped if it is rolled back.
+    """
+    if session.info.get(DEPTH):
+        session.info.setdefault(AFTER_COMMIT, []).append(callback)
+    else:
+        callback()
+
+
+def _enter(session: Session | AsyncSession) -> int:
+    depth: int = session.info.get(DEPTH, 0)
+    session.info[DEPTH] = depth + 1
+    return depth
+
+
+def _committed(session: Session | AsyncSession) -> None:
+    for callback in session.info.pop(AFTER_COMMIT, []):
+        callback()
+
+
+@contextmanager
+def unit_of_work(session: UnitOfWorkSession) -> Iterator[UnitOfWorkSession]:
+    """
+    Commit what `session` writes within the block once, at its end, or roll it
+    all back on an exception. Blocks nested in another join it. A block that
+    wrote nothing commits nothing.
+    """
+    depth = _enter(session)
+    try:
+        yield session
+    except BaseException:
+        session.info[DEPTH] = depth
+        if not depth:
+            session.info.pop(AFTER_COMMIT, None)
+            session.rollback()
+        raise
+    session.info[DEPTH] = depth
+    if not depth:
+        # a read only transaction is left to end with the session, without a
+        # COMMIT round trip
+        if wrote(session):
+            session.commit()
+        _committed(session)
+
+
+@asynccontextmanager
+async def async_unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """`unit_of_work` on an `AsyncSession` of `UnitOfWorkSession`s."""
+    depth = _enter(session)
+    try:
+        yield session
+    except BaseException:
+        session.info[DEPTH] = depth
+        if not depth:
+            session.info.pop(AFTER_COMMIT, None)
+            await session.rollback()
+        raise
+    session.info[DEPTH] = depth
+    if not depth:
+        if wrote(session.sync_session):
+            await session.commit()
+        _committed(session)
@@ -1,20 +1,38 @@
+from .account import create_account
 from .customer import create_customer
 from .customer_type import create_customer_type
-from .item import create_item
+from .item import (
+    create_item,
+    move_items_stock,
+    stock_errors,
+    update_item_stock,
+    update_items_stock,
+)
 from .item_category import create_item_category
-from .login import authenticate
+from .item_unit import create_item_unit
+from .login import authenticate, authenticate_async
 from .store import create_store
 from .supplier import create_supplier
+from .token_revocation import revoke_token, revoke_user_claims
 from .user import create_user, get_user_by_email, update_user
 
 __all__ = [
+    "create_account",
     "create_customer",
     "create_customer_type",
     "create_item",
+    "move_items_stock",
+    "stock_errors",
+    "update_item_stock",
+    "update_items_stock",
     "create_item_category",
+    "create_item_unit",
     "authenticate",
+    "authenticate_async",
     "create_store",
     "create_supplier",
+    "revoke_token",
+    "revoke_user_claims",
     "create_user",
     "update_user",
     "get_user_by_email",
@@ -0,0 +1,17 @@
+import uuid
+
+from sqlmodel import Session
+
+from app.models import (
+    Account,
+    AccountCreate,
+)
+
+
+def create_account(
+    *, session: Session, account_in: AccountCreate, owner_id: uuid.UUID
+) -> Account:
+    db_account = Account.model_validate(account_in, update={"owner_id": owner_id})
+    session.add(db_account)
+    session.commit()
+    return db_account
@@ -14,5 +14,4 @@ def create_customer(
     db_customer = Customer.model_validate(customer_in, update={"owner_id": owner_id})
     session.add(db_customer)
     session.commit()
-    session.refresh(db_customer)
     return db_customer
@@ -16,5 +16,4 @@ def create_customer_type(
     )
     session.add(db_customer_type)
     session.commit()
-    session.refresh(db_customer_type)
     return db_customer_type
@@ -1,16 +1,157 @@
 import uuid
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
 
-from sqlmodel import Session
+from sqlalchemy import Integer, Uuid, any_, literal
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, col, func, select, update
 
 from app.models import (
     Item,
     ItemCreate,
+    ItemStockLine,
 )
+from app.utils import utcnow
 
 
 def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -> Item:
     db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
     session.add(db_item)
     session.commit()
-    session.refresh(db_item)
     return db_item
+
+
+def update_item_stock(
+    *,
+    session: Session,
+    item_id: uuid.UUID,
+    quantity: int,
+    owner_id: uuid.UUID | None = None,
+) -> Item | None:
+    """
+    Add `quantity` (negative to remove) to an item's stock in one statement.
+
+    The increment runs in the database, so concurrent calls on the same item
+    serialize on its row lock instead of overwriting each other. Returns None
+    when nothing was updated: the item doesn't exist, isn't owned by
+    `owner_id` (if given) or has less stock than would be removed. The
+    returned item is detached from `session`.
+    """
+    statement = (
+        update(Item)
+        .where(col(Item.id) == item_id, col(Item.stock) + quantity >= 0)
+        .values(stock=col(Item.stock) + quantity, date_updated=utcnow())
+        .returning(Item)
+        # synced from RETURNING, instead of loading every Item in the session
+        .execution_options(synchronize_session="fetch")
+    )
+    if owner_id is not None:
+        statement = statement.where(col(Item.owner_id) == owner_id)
+    db_item = session.execute(statement).scalar_one_or_none()
+    # RETURNING already loaded the new row, detach it so the commit doesn't
+    # expire it and cost another SELECT
+    if db_item is not None:
+        session.expunge(db_item)
+    session.commit()
+    return db_item
+
+
+def move_items_stock(
+    *,
+    session: Session,
+    quantities: Mapping[uuid.UUID, int],
+    owner_id: uuid.UUID | None = None,
+) -> Sequence[Item]:
+    """
+    Add each item's quantity to its stock in one statement, without committing.
+
+    Returns the updated items, which are fewer than `quantities` when an item
+    is missing, isn't owned by `owner_id` (if given) or would drop below zero
+    stock; the caller should then roll back.
+    """
+    item_ids = literal(list(quantities), postgresql.ARRAY(Uuid))
+    # lock the rows in id order, so batches touching the same items wait for
+    # each other instead of deadlocking
+    locked = (
+        select(Item.id)
+        .where(col(Item.id) == any_(item_ids))
+        .order_by(col(Item.id))
+        .with_for_update()
+        .cte("locked")
+    )
+    movement = (
+        func.unnest(
+            item_ids, literal(list(quantities.values()), postgresql.ARRAY(Integer))
+        )
+        .table_valued("item_id", "quantity")
+        .render_derived(name="movement")
+    )
+    statement = (
+        update(Item)
+        .where(
+            col(Item.id) == locked.c.id,
+            col(Item.id) == movement.c.item_id,
+            col(Item.stock) + movement.c.quantity >= 0,
+        )
+        .values(stock=col(Item.stock) + movement.c.quantity, date_updated=utcnow())
+        .returning(Item)
+        .execution_options(synchronize_session="fetch")
+    )
+    if owner_id is not None:
+        statement = statement.where(col(Item.owner_id) == owner_id)
+    return session.execute(statement).scalars().all()
+
+
+def update_items_stock(
+    *,
+    session: Session,
+    lines: Sequence[ItemStockLine],
+    owner_id: uuid.UUID | None = None,
+) -> Sequence[Item] | None:
+    """
+    Apply many stock movements in one transaction and one statement.
+
+    Quantities of the same item are summed first. Either every item is
+    updated, or none are and None is returned: an item is missing, isn't owned
+    by `owner_id` (if given) or would drop below zero stock. Like
+    `update_item_stock`, the returned items are detached from `session`.
+    """
+    quantities: dict[uuid.UUID, int] = defaultdict(int)
+    for line in lines:
+        quantities[line.item_id] += line.quantity
+    db_items = move_items_stock(
+        session=session, quantities=quantities, owner_id=owner_id
+    )
+    if len(db_items) < len(quantities):
+        session.rollback()
+        return None
+    for db_item in db_items:
+        session.expunge(db_item)
+    session.commit()
+    return db_items
+
+
+def stock_errors(
+    *,
+    session: Session,
+    quantities: Mapping[uuid.UUID, int],
+    owner_id: uuid.UUID | None = None,
+) -> list[dict[str, str]]:
+    """Why `move_items_stock` didn't update every item, one entry per item."""
+    db_items = {
+        db_item.id: db_item
+        for db_item in session.exec(select(Item).where(col(Item.id).in_(quantities)))
+    }
+    errors = []
+    for item_id, quantity in quantities.items():
+        db_item = db_items.get(item_id)
+        if not db_item:
+            detail = "Item not found"
+        elif owner_id is not None and db_item.owner_id != owner_id:
+            detail = "Not enough permissions"
+        elif db_item.stock + quantity < 0:
+            detail = "Not enough stock"
+        else:
+            continue
+        errors.append({"item_id": str(item_id), "detail": detail})
+    return errors
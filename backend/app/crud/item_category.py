@@ -16,5 +16,4 @@ def create_item_category(
     )
     session.add(db_item_category)
     session.commit()
-    session.refresh(db_item_category)
     return db_item_category
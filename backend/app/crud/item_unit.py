@@ -14,5 +14,4 @@ def create_item_unit(
     db_item_unit = ItemUnit.model_validate(item_unit_in, update={"owner_id": owner_id})
     session.add(db_item_unit)
     session.commit()
-    session.refresh(db_item_unit)
     return db_item_unit
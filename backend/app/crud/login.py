@@ -1,6 +1,12 @@
-from sqlmodel import Session
+import asyncio
+from functools import partial
 
-from app.core.security import verify_password
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import principal_cache
+from app.core.security import password_hasher
+from app.core.uow import after_commit
 from app.crud.user import get_user_by_email
 from app.models import User
 
@@ -9,6 +15,35 @@ def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = password_hasher.verify_and_update(
+        password, db_user.hashed_password
+    ).result()
+    if not verified:
+        return None
+    if new_hash:
+        # hashed at a lower cost than PASSWORD_HASH_ROUNDS
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        session.commit()
+        after_commit(session, partial(principal_cache.invalidate, str(db_user.id)))
+    return db_user
+
+
+async def authenticate_async(
+    *, session: AsyncSession, email: str, password: str
+) -> User | None:
+    statement = select(User).where(User.email == email)
+    db_user = (await session.exec(statement)).first()
+    if not db_user:
+        return None
+    verified, new_hash = await asyncio.wrap_future(
+        password_hasher.verify_and_update(password, db_user.hashed_password)
+    )
+    if not verified:
         return None
+    if new_hash:
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        await session.commit()
+        after_commit(session, partial(principal_cache.invalidate, str(db_user.id)))
     return db_user
@@ -14,5 +14,4 @@ def create_store(
     db_store = Store.model_validate(store_in, update={"owner_id": owner_id})
     session.add(db_store)
     session.commit()
-    session.refresh(db_store)
     return db_store
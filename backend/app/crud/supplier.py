@@ -14,5 +14,4 @@ def create_supplier(
     db_supplier = Supplier.model_validate(supplier_in, update={"owner_id": owner_id})
     session.add(db_supplier)
     session.commit()
-    session.refresh(db_supplier)
     return db_supplier
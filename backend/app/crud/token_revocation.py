@@ -0,0 +1,51 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+from sqlmodel import Session, col, delete, func
+
+from app.core.config import settings
+from app.core.revocation import revoked_tokens
+from app.core.uow import after_commit
+from app.models import TokenPayload, TokenRevocation
+from app.utils import utcnow
+
+
+def _prune_expired(session: Session) -> None:
+    # revoking is rare, unlike the workers' syncs which only read the table
+    session.exec(
+        delete(TokenRevocation).where(col(TokenRevocation.expires_at) <= func.now())
+    )
+
+
+def revoke_token(*, session: Session, token_data: TokenPayload) -> None:
+    """Revoke a token until it expires, e.g. on logout."""
+    if token_data.sub is None or token_data.jti is None:
+        return  # issued before tokens had an id
+    if token_data.exp is not None:
+        expires_at = datetime.fromtimestamp(token_data.exp, timezone.utc)
+    else:
+        expires_at = utcnow() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    revocation = TokenRevocation(
+        user_id=uuid.UUID(token_data.sub), jti=token_data.jti, expires_at=expires_at
+    )
+    _prune_expired(session)
+    session.add(revocation)
+    session.commit()
+    # held in memory once committed, a rolled back revocation would linger
+    after_commit(session, partial(revoked_tokens.add, revocation))
+
+
+def revoke_user_claims(*, session: Session, user_id: uuid.UUID) -> None:
+    """
+    Make the claims of the user's access tokens issued so far stale, after a
+    change of the user they carry (is_active, is_superuser, deletion).
+    """
+    revocation = TokenRevocation(
+        user_id=user_id,
+        expires_at=utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    _prune_expired(session)
+    session.add(revocation)
+    session.commit()
+    after_commit(session, partial(revoked_tokens.add, revocation))
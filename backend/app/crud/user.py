@@ -1,18 +1,22 @@
+from functools import partial
 from typing import Any
 
 from sqlmodel import Session, select
 
-from app.core.security import get_password_hash
+from app.core.cache import principal_cache
+from app.core.security import password_hasher
+from app.core.uow import after_commit
+from app.crud.token_revocation import revoke_user_claims
 from app.models import BaseModelUpdate, User, UserCreate, UserUpdate
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
+    hashed_password = password_hasher.hash(user_create.password).result()
     db_obj = User.model_validate(
-        user_create, update={"hashed_password": get_password_hash(user_create.password)}
+        user_create, update={"hashed_password": hashed_password}
     )
     session.add(db_obj)
     session.commit()
-    session.refresh(db_obj)
     return db_obj
 
 
@@ -21,13 +25,15 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     extra_data = {}
     if "password" in user_data:
         password = user_data["password"]
-        hashed_password = get_password_hash(password)
+        hashed_password = password_hasher.hash(password).result()
         extra_data["hashed_password"] = hashed_password
     user_data.update(BaseModelUpdate().model_dump())
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
-    session.refresh(db_user)
+    after_commit(session, partial(principal_cache.invalidate, str(db_user.id)))
+    if user_data.keys() & {"is_active", "is_superuser"}:
+        revoke_user_claims(session=session, user_id=db_user.id)
     return db_user
 
 
@@ -1,6 +1,13 @@
-from .i_permission import IBase, IPermission
+from .i_base import IBase
+from .i_item import IItem
+from .i_permission import IPermission
+from .i_purchase import IPurchase
+from .i_sale import ISale
 
 __all__ = [
     "IBase",
+    "IItem",
     "IPermission",
+    "IPurchase",
+    "ISale",
 ]
@@ -1,5 +1,9 @@
+import builtins
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from collections.abc import Iterable, Sequence
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import ColumnElement
 
 T = TypeVar("T")  # Entity / Model
 ID = TypeVar("ID")  # Primary key type
@@ -7,25 +11,119 @@ ID = TypeVar("ID")  # Primary key type
 
 class IBase(ABC, Generic[T, ID]):
     @abstractmethod
-    def get(self, id: ID) -> T:
-        ...
+    def get(self, id: ID) -> T: ...
+
+    @abstractmethod
+    def list(
+        self, skip: int = 0, limit: int = 10, after: str | None = None
+    ) -> builtins.list[T]: ...
+
+    @abstractmethod
+    def count(self) -> int: ...
+
+    @abstractmethod
+    def create(self, obj: T) -> T: ...
+
+    @abstractmethod
+    def update(self, obj: T, data: dict[str, Any]) -> T: ...
+
+    @abstractmethod
+    def delete(self, obj: T) -> None: ...
+
+    @abstractmethod
+    def get_many(self, ids: Iterable[ID]) -> builtins.list[T]: ...
+
+    @abstractmethod
+    def exists(self, where: ColumnElement[bool]) -> bool: ...
+
+    @abstractmethod
+    def create_many(
+        self, objs: Sequence[T], *, returning: bool = False
+    ) -> builtins.list[T]: ...
+
+    @abstractmethod
+    def update_many(
+        self, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> int: ...
+
+    @abstractmethod
+    def update_many_returning(
+        self, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> builtins.list[T]: ...
+
+    @abstractmethod
+    def delete_many(self, where: ColumnElement[bool]) -> int: ...
+
+    @abstractmethod
+    def delete_many_returning(self, where: ColumnElement[bool]) -> builtins.list[T]: ...
+
+    @abstractmethod
+    def upsert_many(
+        self,
+        objs: Sequence[T],
+        *,
+        index_elements: Sequence[str] | None = None,
+        returning: bool = False,
+    ) -> builtins.list[T]: ...
+
+
+class IAsyncBase(ABC, Generic[T, ID]):
+    """`IBase` on an `AsyncSession`."""
+
+    @abstractmethod
+    async def get(self, id: ID) -> T | None: ...
+
+    @abstractmethod
+    async def list(
+        self, skip: int = 0, limit: int = 10, after: str | None = None
+    ) -> builtins.list[T]: ...
+
+    @abstractmethod
+    async def count(self) -> int: ...
+
+    @abstractmethod
+    async def create(self, obj: T) -> T: ...
+
+    @abstractmethod
+    async def update(self, obj: T, data: dict[str, Any]) -> T: ...
+
+    @abstractmethod
+    async def delete(self, obj: T) -> None: ...
+
+    @abstractmethod
+    async def get_many(self, ids: Iterable[ID]) -> builtins.list[T]: ...
+
+    @abstractmethod
+    async def exists(self, where: ColumnElement[bool]) -> bool: ...
+
+    @abstractmethod
+    async def create_many(
+        self, objs: Sequence[T], *, returning: bool = False
+    ) -> builtins.list[T]: ...
 
     @abstractmethod
-    def list(self, skip: int = 0, limit: int = 10) -> list[T]:
-        ...
+    async def update_many(
+        self, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> int: ...
 
     @abstractmethod
-    def count(self) -> int:
-        ...
+    async def update_many_returning(
+        self, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> builtins.list[T]: ...
 
     @abstractmethod
-    def create(self, obj: T) -> T:
-        ...
+    async def delete_many(self, where: ColumnElement[bool]) -> int: ...
 
     @abstractmethod
-    def update(self, obj: T, data: dict) -> T:
-        ...
+    async def delete_many_returning(
+        self, where: ColumnElement[bool]
+    ) -> builtins.list[T]: ...
 
     @abstractmethod
-    def delete(self, obj: T) -> None:
-        ...
+    async def upsert_many(
+        self,
+        objs: Sequence[T],
+        *,
+        index_elements: Sequence[str] | None = None,
+        returning: bool = False,
+    ) -> builtins.list[T]: ...
@@ -0,0 +1,17 @@
+import uuid
+from abc import abstractmethod
+from collections.abc import Iterable
+
+from app.models import Item, ItemCreate
+
+from .i_base import IBase
+
+
+class IItem(IBase[Item, uuid.UUID]):
+    @abstractmethod
+    def references(
+        self, owner_id: uuid.UUID
+    ) -> tuple[dict[str, uuid.UUID], dict[str, uuid.UUID]]: ...
+
+    @abstractmethod
+    def copy_items(self, items: Iterable[ItemCreate], owner_id: uuid.UUID) -> int: ...
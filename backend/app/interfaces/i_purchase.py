@@ -0,0 +1,27 @@
+import uuid
+from abc import abstractmethod
+from collections.abc import Iterable
+
+from app.models import Purchase, PurchaseReceiveLine
+
+from .i_base import IBase
+
+
+class IPurchase(IBase[Purchase, uuid.UUID]):
+    @abstractmethod
+    def copy_items(
+        self, purchase_id: uuid.UUID, lines: Iterable[PurchaseReceiveLine]
+    ) -> None: ...
+
+    @abstractmethod
+    def update_amount(self, purchase_id: uuid.UUID) -> tuple[float, int, int]: ...
+
+    @abstractmethod
+    def receive_stock(
+        self, purchase_id: uuid.UUID, owner_id: uuid.UUID | None = None
+    ) -> int: ...
+
+    @abstractmethod
+    def foreign_items(
+        self, purchase_id: uuid.UUID, owner_id: uuid.UUID, limit: int = 100
+    ) -> list[uuid.UUID]: ...
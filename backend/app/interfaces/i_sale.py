@@ -0,0 +1,9 @@
+import uuid
+
+from app.models import Sale
+
+from .i_base import IBase
+
+
+class ISale(IBase[Sale, uuid.UUID]):
+    pass
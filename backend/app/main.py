@@ -1,10 +1,24 @@
+import logging
+import math
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.db import async_engine, engine, replicas
+from app.core.query_stats import record_queries
+from app.core.replicas import STICKY_COOKIE
+from app.core.revocation import revoked_tokens
+from app.core.security import PasswordHasherBusy, password_hasher
+
+logger = logging.getLogger(__name__)
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,8 +28,24 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    replicas.start()
+    revoked_tokens.start(engine)
+    yield
+    revoked_tokens.stop()
+    replicas.stop()
+    password_hasher.shutdown()
+    # pooled async connections are bound to the event loop that is stopping
+    await async_engine.dispose()
+    for replica in replicas.replicas:
+        await replica.async_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
 )
@@ -30,4 +60,61 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+
+@app.middleware("http")
+async def read_own_writes(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # the next reads of a client whose request wrote go to the primary,
+    # whichever worker serves them: replicas may not have replayed it yet
+    with replicas.track_writes() as writes:
+        response = await call_next(request)
+    if writes.committed and replicas.replicas:
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{time.time() + replicas.sticky_seconds:.3f}",
+            max_age=math.ceil(replicas.sticky_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
+if settings.ENVIRONMENT != "production":
+
+    @app.middleware("http")
+    async def record_request_queries(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        # what the request ran up to its commit (see `unit_of_work`)
+        with record_queries() as stats:
+            response = await call_next(request)
+        milliseconds = stats.seconds * 1000
+        response.headers["X-DB-Statements"] = str(stats.statements)
+        response.headers["X-DB-Commits"] = str(stats.commits)
+        response.headers.append(
+            "Server-Timing",
+            f'db;dur={milliseconds:.1f};desc="{stats.statements} statements"',
+        )
+        for statement, count in stats.repeated(settings.QUERY_REPEAT_THRESHOLD):
+            logger.warning(
+                "%s %s ran a statement %d times, N+1 loading? %s",
+                request.method,
+                request.url.path,
+                count,
+                statement,
+            )
+        return response
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy(_request: Request, _exc: PasswordHasherBusy) -> JSONResponse:
+    # the hashing queue is full, retrying shortly is cheaper than waiting in it
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many password checks, try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
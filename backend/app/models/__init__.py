@@ -20,9 +20,12 @@ from app.models.account_transaction import (
 )
 from app.models.customer import (
     Customer,
+    CustomerChangesPublic,
     CustomerCreate,
     CustomerPublic,
+    CustomerPublicExpanded,
     CustomersPublic,
+    CustomersPublicExpanded,
     CustomerUpdate,
 )
 from app.models.customer_type import (
@@ -32,32 +35,51 @@ from app.models.customer_type import (
     CustomerTypesPublic,
     CustomerTypeUpdate,
 )
+from app.models.deletion import Deletion
 from app.models.item import (
     Item,
+    ItemChangesPublic,
     ItemCreate,
+    ItemImportError,
     ItemPublic,
+    ItemPublicExpanded,
+    ItemsImportPublic,
     ItemsPublic,
+    ItemsPublicExpanded,
+    ItemsStockPublic,
+    ItemsStockUpdate,
+    ItemStockLine,
+    ItemStockPublic,
     ItemUpdate,
 )
 from app.models.item_category import (
     ItemCategoriesPublic,
     ItemCategory,
+    ItemCategoryChangesPublic,
     ItemCategoryCreate,
     ItemCategoryPublic,
     ItemCategoryUpdate,
 )
 from app.models.item_unit import (
     ItemUnit,
+    ItemUnitChangesPublic,
     ItemUnitCreate,
     ItemUnitPublic,
     ItemUnitsPublic,
     ItemUnitUpdate,
 )
 from app.models.main import (
+    CacheStats,
+    CountMode,
+    ExportFormat,
     Message,
+    PasswordHasherStats,
+    PoolStats,
+    RefreshToken,
     Token,
     TokenPayload,
 )
+from app.models.owner_count import OwnerCount
 from app.models.payable import (
     Payable,
     PayableCreate,
@@ -82,6 +104,9 @@ from app.models.purchase import (
     Purchase,
     PurchaseCreate,
     PurchasePublic,
+    PurchaseReceive,
+    PurchaseReceiveLine,
+    PurchaseReceivePublic,
     PurchasesPublic,
     PurchaseUpdate,
 )
@@ -129,9 +154,14 @@ from app.models.role_permission import (
 )
 from app.models.sale import (
     Sale,
+    SaleCheckout,
+    SaleCheckoutLine,
+    SaleCheckoutPublic,
     SaleCreate,
     SalePublic,
+    SalePublicExpanded,
     SalesPublic,
+    SalesPublicExpanded,
     SaleUpdate,
 )
 from app.models.sale_item import (
@@ -169,6 +199,7 @@ from app.models.stock_transfer import (
 )
 from app.models.store import (
     Store,
+    StoreChangesPublic,
     StoreCreate,
     StorePublic,
     StoresPublic,
@@ -181,6 +212,7 @@ from app.models.supplier import (
     SuppliersPublic,
     SupplierUpdate,
 )
+from app.models.token_revocation import TokenRevocation
 from app.models.user import (
     NewPassword,
     UpdatePassword,
@@ -222,26 +254,49 @@ __all__ = [
     "CustomerCreate",
     "CustomerUpdate",
     "CustomerPublic",
+    "CustomerPublicExpanded",
     "CustomersPublic",
+    "CustomerChangesPublic",
+    "CustomersPublicExpanded",
     "ItemCategory",
     "ItemCategoryCreate",
     "ItemCategoryUpdate",
     "ItemCategoryPublic",
     "ItemCategoriesPublic",
+    "ItemCategoryChangesPublic",
     "ItemUnit",
     "ItemUnitCreate",
     "ItemUnitUpdate",
     "ItemUnitPublic",
     "ItemUnitsPublic",
+    "ItemUnitChangesPublic",
     "Item",
     "ItemCreate",
     "ItemUpdate",
     "ItemPublic",
+    "ItemPublicExpanded",
     "ItemsPublic",
+    "ItemChangesPublic",
+    "ItemsPublicExpanded",
+    "ItemImportError",
+    "ItemsImportPublic",
+    "ItemStockLine",
+    "ItemsStockUpdate",
+    "ItemStockPublic",
+    "ItemsStockPublic",
+    "CacheStats",
+    "PasswordHasherStats",
+    "PoolStats",
+    "CountMode",
+    "ExportFormat",
     "Message",
+    "RefreshToken",
     "Token",
     "TokenPayload",
+    "TokenRevocation",
     "NewPassword",
+    "OwnerCount",
+    "Deletion",
     "Payment",
     "PaymentCreate",
     "PaymentPublic",
@@ -255,6 +310,9 @@ __all__ = [
     "PurchaseCreate",
     "PurchaseUpdate",
     "PurchasePublic",
+    "PurchaseReceive",
+    "PurchaseReceiveLine",
+    "PurchaseReceivePublic",
     "PurchasesPublic",
     "PurchaseReturn",
     "PurchaseReturnCreate",
@@ -302,10 +360,15 @@ __all__ = [
     "SaleItemPublic",
     "SaleItemsPublic",
     "Sale",
+    "SaleCheckout",
+    "SaleCheckoutLine",
+    "SaleCheckoutPublic",
     "SaleCreate",
     "SaleUpdate",
     "SalePublic",
+    "SalePublicExpanded",
     "SalesPublic",
+    "SalesPublicExpanded",
     "StockAdjustment",
     "StockAdjustmentCreate",
     "StockAdjustmentPublic",
@@ -319,6 +382,7 @@ __all__ = [
     "StoreUpdate",
     "StorePublic",
     "StoresPublic",
+    "StoreChangesPublic",
     "Supplier",
     "SupplierCreate",
     "SupplierUpdate",
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
@@ -30,6 +31,11 @@ class AccountUpdate(AccountBase):
 
 
 class Account(AccountBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_account_owner_id_date_created_id", "owner_id", "date_created", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
@@ -27,6 +28,15 @@ class AccountTransactionCreate(AccountTransactionBase):
 
 class AccountTransaction(AccountTransactionBase, table=True):
     __tablename__ = "account_transaction"
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index(
+            "ix_account_transaction_owner_id_date_created_id",
+            "owner_id",
+            "date_created",
+            "id",
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
@@ -34,7 +44,7 @@ class AccountTransaction(AccountTransactionBase, table=True):
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     account_id: uuid.UUID = Field(
-        foreign_key="account.id", nullable=False, ondelete="CASCADE"
+        foreign_key="account.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="account_transactions")
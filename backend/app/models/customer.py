@@ -2,9 +2,12 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import BigInteger, Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.customer_type import CustomerTypePublic
+from app.models.main import CountMode
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -31,14 +34,25 @@ class CustomerUpdate(CustomerBase):
 
 
 class Customer(CustomerBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_customer_owner_id_date_created_id", "owner_id", "date_created", "id"),
+        # delta sync (`/changes`), by the transaction that last wrote each row
+        Index("ix_customer_owner_id_change_xid_id", "owner_id", "change_xid", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
+    # the transaction that last wrote the row, stamped by a trigger
+    change_xid: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     customer_type_id: uuid.UUID = Field(
-        foreign_key="customer_type.id", nullable=False, ondelete="CASCADE"
+        foreign_key="customer_type.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="customers")
@@ -62,4 +76,22 @@ class CustomerPublic(CustomerBase):
 
 class CustomersPublic(BaseModel):
     data: list[CustomerPublic]
-    count: int
+    count: int | None
+    count_mode: CountMode = "exact"
+    next_cursor: str | None = None
+
+
+class CustomerChangesPublic(BaseModel):
+    data: list[CustomerPublic]
+    deleted: list[uuid.UUID]
+    next_cursor: str
+    has_more: bool
+
+
+# With the related rows asked for by `expand`
+class CustomerPublicExpanded(CustomerPublic):
+    customer_type: CustomerTypePublic | None = None
+
+
+class CustomersPublicExpanded(CustomersPublic):
+    data: list[CustomerPublicExpanded]  # type: ignore[assignment]
@@ -2,9 +2,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.main import CountMode
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -27,6 +29,15 @@ class CustomerTypeUpdate(CustomerTypeBase):
 
 class CustomerType(CustomerTypeBase, table=True):
     __tablename__ = "customer_type"
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index(
+            "ix_customer_type_owner_id_date_created_id",
+            "owner_id",
+            "date_created",
+            "id",
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
@@ -50,4 +61,6 @@ class CustomerTypePublic(CustomerTypeBase):
 
 class CustomerTypesPublic(BaseModel):
     data: list[CustomerTypePublic]
-    count: int
+    count: int | None
+    count_mode: CountMode = "exact"
+    next_cursor: str | None = None
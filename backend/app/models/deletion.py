@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Index
+from sqlmodel import Field
+
+from app.models import BaseModel
+from app.utils import utcnow
+
+
+# A deleted row of a synced table, logged by database triggers (see the "add
+# deletion table" migration) so `/changes` can return it as a tombstone
+class Deletion(BaseModel, table=True):
+    __tablename__ = "deletion"
+    __table_args__ = (
+        # a table's tombstones for one owner, in the order `/changes` reads them
+        Index(
+            "ix_deletion_owner_id_table_name_change_xid_id",
+            "owner_id",
+            "table_name",
+            "change_xid",
+            "id",
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    owner_id: uuid.UUID = Field(
+        foreign_key="user.id", nullable=False, ondelete="CASCADE"
+    )
+    table_name: str = Field(max_length=63)
+    row_id: uuid.UUID = Field(nullable=False)
+    date_deleted: datetime = Field(default_factory=utcnow)
+    # the transaction that deleted the row
+    change_xid: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
@@ -1,10 +1,14 @@
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from sqlalchemy import BigInteger, Index, text
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.item_category import ItemCategoryPublic
+from app.models.item_unit import ItemUnitPublic
+from app.models.main import CountMode
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -46,17 +50,36 @@ class ItemUpdate(ItemBase):
 
 # Database model, database table inferred from class name
 class Item(ItemBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_item_owner_id_date_created_id", "owner_id", "date_created", "id"),
+        # low stock listings only ever look at the rows below their minimum
+        Index(
+            "ix_item_owner_id_date_created_id_low_stock",
+            "owner_id",
+            "date_created",
+            "id",
+            postgresql_where=text("stock <= stock_minimum"),
+        ),
+        # delta sync (`/changes`), by the transaction that last wrote each row
+        Index("ix_item_owner_id_change_xid_id", "owner_id", "change_xid", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
+    # the transaction that last wrote the row, stamped by a trigger
+    change_xid: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     item_category_id: uuid.UUID = Field(
-        foreign_key="item_category.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item_category.id", nullable=False, ondelete="CASCADE", index=True
     )
     item_unit_id: uuid.UUID = Field(
-        foreign_key="item_unit.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item_unit.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="items")
@@ -94,4 +117,60 @@ class ItemPublic(ItemBase):
 
 class ItemsPublic(BaseModel):
     data: list[ItemPublic]
-    count: int
+    count: int | None
+    count_mode: CountMode = "exact"
+    next_cursor: str | None = None
+
+
+# Rows created or updated since a cursor, and the ids of those deleted
+class ItemChangesPublic(BaseModel):
+    data: list[ItemPublic]
+    deleted: list[uuid.UUID]
+    next_cursor: str
+    has_more: bool
+
+
+# With the related rows asked for by `expand`
+class ItemPublicExpanded(ItemPublic):
+    item_category: ItemCategoryPublic | None = None
+    item_unit: ItemUnitPublic | None = None
+
+
+class ItemsPublicExpanded(ItemsPublic):
+    data: list[ItemPublicExpanded]  # type: ignore[assignment]
+
+
+# One line of a batch stock movement, a negative quantity takes stock out
+class ItemStockLine(BaseModel):
+    item_id: uuid.UUID
+    quantity: int
+
+
+class ItemsStockUpdate(BaseModel):
+    data: list[ItemStockLine] = Field(min_length=1, max_length=1000)
+
+
+# Stock of the line's item after the whole batch was applied
+class ItemStockPublic(BaseModel):
+    item_id: uuid.UUID
+    quantity: int
+    stock: int
+    stock_minimum: int
+
+
+class ItemsStockPublic(BaseModel):
+    data: list[ItemStockPublic]
+
+
+# A row rejected by an item import, `errors` are shaped like FastAPI's
+# validation errors
+class ItemImportError(BaseModel):
+    row: int
+    errors: list[dict[str, Any]]
+
+
+class ItemsImportPublic(BaseModel):
+    imported: int
+    failed: int
+    # only the first rejected rows are reported
+    errors: list[ItemImportError]
@@ -2,9 +2,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import BigInteger, Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.main import CountMode
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -27,10 +29,30 @@ class ItemCategoryUpdate(ItemCategoryBase):
 
 class ItemCategory(ItemCategoryBase, table=True):
     __tablename__ = "item_category"
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index(
+            "ix_item_category_owner_id_date_created_id",
+            "owner_id",
+            "date_created",
+            "id",
+        ),
+        # delta sync (`/changes`), by the transaction that last wrote each row
+        Index(
+            "ix_item_category_owner_id_change_xid_id",
+            "owner_id",
+            "change_xid",
+            "id",
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
+    # the transaction that last wrote the row, stamped by a trigger
+    change_xid: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
@@ -50,4 +72,13 @@ class ItemCategoryPublic(ItemCategoryBase):
 
 class ItemCategoriesPublic(BaseModel):
     data: list[ItemCategoryPublic]
-    count: int
+    count: int | None
+    count_mode: CountMode = "exact"
+    next_cursor: str | None = None
+
+
+class ItemCategoryChangesPublic(BaseModel):
+    data: list[ItemCategoryPublic]
+    deleted: list[uuid.UUID]
+    next_cursor: str
+    has_more: bool
@@ -1,17 +1,72 @@
+import uuid
+from typing import Literal
+
 from app.models import BaseModel
 
+# How the total of a list envelope was computed
+CountMode = Literal["exact", "estimate", "none"]
+
+# Body format of a table export
+ExportFormat = Literal["csv", "ndjson"]
+
 
 # Generic message
 class Message(BaseModel):
     message: str
 
 
-# JSON payload containing access token
+# JSON payload containing access token, and the refresh token to get the next
+# one with
 class Token(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
 
 
-# Contents of JWT token
+class RefreshToken(BaseModel):
+    refresh_token: str
+
+
+# Contents of JWT token. Access tokens also carry the user's claims, but those
+# issued before claims existed only have a subject
 class TokenPayload(BaseModel):
     sub: str | None = None
+    type: Literal["access", "refresh"] = "access"
+    jti: uuid.UUID | None = None
+    iat: float | None = None
+    exp: float | None = None
+    active: bool | None = None
+    superuser: bool | None = None
+
+
+# Counters of an in-process cache
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+# State of a connection pool, and how long checkouts waited on it. Histogram
+# counts are cumulative, by the upper bound (seconds) of their bucket
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds: float
+    wait_histogram: dict[str, int]
+
+
+# Hashes queued or running on the password hashing processes, their peak, and
+# how many were turned away for exceeding max_pending
+class PasswordHasherStats(BaseModel):
+    workers: int
+    pending: int
+    peak_pending: int
+    max_pending: int
+    rejected: int
+    completed: int
@@ -0,0 +1,18 @@
+import uuid
+
+from sqlmodel import Field
+
+from app.models import BaseModel
+
+
+# Number of rows a user owns in a tenant-scoped table, maintained by database
+# triggers (see the "add owner count table" migration) so exact per-owner
+# counts don't need a COUNT(*) scan
+class OwnerCount(BaseModel, table=True):
+    __tablename__ = "owner_count"
+
+    owner_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, nullable=False, ondelete="CASCADE"
+    )
+    table_name: str = Field(primary_key=True, max_length=63)
+    count: int = Field(default=0)
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
@@ -32,6 +33,11 @@ class PayableUpdate(PayableBase):
 
 
 class Payable(PayableBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_payable_owner_id_date_created_id", "owner_id", "date_created", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
@@ -39,10 +45,10 @@ class Payable(PayableBase, table=True):
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     supplier_id: uuid.UUID = Field(
-        foreign_key="supplier.id", nullable=False, ondelete="CASCADE"
+        foreign_key="supplier.id", nullable=False, ondelete="CASCADE", index=True
     )
     purchase_id: uuid.UUID = Field(
-        foreign_key="purchase.id", nullable=False, ondelete="CASCADE"
+        foreign_key="purchase.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="payables")
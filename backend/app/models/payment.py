@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
@@ -31,13 +32,18 @@ class PaymentCreate(PaymentBase):
 
 
 class Payment(PaymentBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_payment_owner_id_date_created_id", "owner_id", "date_created", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     account_id: uuid.UUID = Field(
-        foreign_key="account.id", nullable=False, ondelete="CASCADE"
+        foreign_key="account.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="payments")
@@ -34,10 +34,10 @@ class Permission(PermissionBase, table=True):
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
     owner_id: uuid.UUID = Field(
-        foreign_key="user.id", nullable=False, ondelete="CASCADE"
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
     )
     editor_id: uuid.UUID = Field(
-        foreign_key="user.id", nullable=False, ondelete="CASCADE"
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(
@@ -63,3 +63,4 @@ class PermissionPublic(PermissionBase):
 class PermissionsPublic(BaseModel):
     data: list[PermissionPublic]
     count: int
+    next_cursor: str | None = None
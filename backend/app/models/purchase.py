@@ -2,9 +2,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.payable import PayablePublic
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -32,6 +34,11 @@ class PurchaseUpdate(PurchaseBase):
 
 
 class Purchase(PurchaseBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_purchase_owner_id_date_created_id", "owner_id", "date_created", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
@@ -39,10 +46,10 @@ class Purchase(PurchaseBase, table=True):
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     supplier_id: uuid.UUID = Field(
-        foreign_key="supplier.id", nullable=False, ondelete="CASCADE"
+        foreign_key="supplier.id", nullable=False, ondelete="CASCADE", index=True
     )
     store_id: uuid.UUID = Field(
-        foreign_key="store.id", nullable=False, ondelete="CASCADE"
+        foreign_key="store.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="purchases")
@@ -71,3 +78,26 @@ class PurchasePublic(PurchaseBase):
 class PurchasesPublic(BaseModel):
     data: list[PurchasePublic]
     count: int
+
+
+# One delivered line of a purchase, `price` is per unit
+class PurchaseReceiveLine(BaseModel):
+    item_id: uuid.UUID
+    quantity: int = Field(gt=0)
+    price: float = Field(default=0, ge=0)
+
+
+# Properties to receive a delivery, its lines are streamed separately and the
+# purchase amount is the sum of them
+class PurchaseReceive(BaseModel):
+    date_purchase: datetime = Field(default_factory=utcnow)
+    description: str | None = Field(default=None, max_length=255)
+    supplier_id: uuid.UUID
+    store_id: uuid.UUID
+    date_payable: datetime | None = None
+
+
+class PurchaseReceivePublic(BaseModel):
+    purchase: PurchasePublic
+    payable: PayablePublic
+    lines: int
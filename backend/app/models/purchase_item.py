@@ -33,10 +33,10 @@ class PurchaseItem(PurchaseItemBase, table=True):
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
     purchase_id: uuid.UUID = Field(
-        foreign_key="purchase.id", nullable=False, ondelete="CASCADE"
+        foreign_key="purchase.id", nullable=False, ondelete="CASCADE", index=True
     )
     item_id: uuid.UUID = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     purchase: "Purchase" = Relationship(back_populates="purchase_items")
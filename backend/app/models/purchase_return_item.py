@@ -33,10 +33,10 @@ class PurchaseReturnItem(PurchaseReturnItemBase, table=True):
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
     purchase_return_id: uuid.UUID = Field(
-        foreign_key="purchase_return.id", nullable=False, ondelete="CASCADE"
+        foreign_key="purchase_return.id", nullable=False, ondelete="CASCADE", index=True
     )
     item_id: uuid.UUID = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     purchase_return: "PurchaseReturn" = Relationship(
@@ -41,6 +41,7 @@ class RolePermission(RolePermissionBase, table=True):
         primary_key=True,
         nullable=False,
         ondelete="CASCADE",
+        index=True,
     )
 
     role: "Role" = Relationship(back_populates="role_permission")
@@ -2,9 +2,17 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.customer import CustomerPublic
+from app.models.main import CountMode
+from app.models.payment import PaymentPublic
+from app.models.receivable import ReceivablePublic
+from app.models.sale_item import SaleItemPublic
+from app.models.sale_return import SaleReturnPublic
+from app.models.store import StorePublic
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -32,6 +40,11 @@ class SaleUpdate(SaleBase):
 
 
 class Sale(SaleBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_sale_owner_id_date_created_id", "owner_id", "date_created", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
@@ -39,10 +52,10 @@ class Sale(SaleBase, table=True):
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     customer_id: uuid.UUID = Field(
-        foreign_key="customer.id", nullable=False, ondelete="CASCADE"
+        foreign_key="customer.id", nullable=False, ondelete="CASCADE", index=True
     )
     store_id: uuid.UUID = Field(
-        foreign_key="store.id", nullable=False, ondelete="CASCADE"
+        foreign_key="store.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="sales")
@@ -70,4 +83,47 @@ class SalePublic(SaleBase):
 
 class SalesPublic(BaseModel):
     data: list[SalePublic]
-    count: int
+    count: int | None
+    count_mode: CountMode = "exact"
+    next_cursor: str | None = None
+
+
+# With the related rows asked for by `expand`
+class SalePublicExpanded(SalePublic):
+    customer: CustomerPublic | None = None
+    store: StorePublic | None = None
+    sale_items: list[SaleItemPublic] | None = None
+    receivables: list[ReceivablePublic] | None = None
+    sale_returns: list[SaleReturnPublic] | None = None
+
+
+class SalesPublicExpanded(SalesPublic):
+    data: list[SalePublicExpanded]  # type: ignore[assignment]
+
+
+# One basket line of a checkout, `price` is per unit
+class SaleCheckoutLine(BaseModel):
+    item_id: uuid.UUID
+    quantity: int = Field(gt=0)
+    price: float = Field(default=0, ge=0)
+
+
+# Properties to receive on checkout, the sale amount is the sum of its lines
+class SaleCheckout(BaseModel):
+    date_sale: datetime = Field(default_factory=utcnow)
+    description: str | None = Field(default=None, max_length=255)
+    customer_id: uuid.UUID
+    store_id: uuid.UUID
+    lines: list[SaleCheckoutLine] = Field(min_length=1, max_length=1000)
+    # paid now into `account_id`, the rest of the amount becomes a receivable
+    amount_paid: float = Field(default=0, ge=0)
+    account_id: uuid.UUID | None = None
+    payment_method: str = Field(default="cash", max_length=255)
+    date_payable: datetime | None = None
+
+
+class SaleCheckoutPublic(BaseModel):
+    sale: SalePublic
+    sale_items: list[SaleItemPublic]
+    receivable: ReceivablePublic | None = None
+    payment: PaymentPublic | None = None
@@ -33,10 +33,10 @@ class SaleItem(SaleItemBase, table=True):
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
     sale_id: uuid.UUID = Field(
-        foreign_key="sale.id", nullable=False, ondelete="CASCADE"
+        foreign_key="sale.id", nullable=False, ondelete="CASCADE", index=True
     )
     item_id: uuid.UUID = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     sale: "Sale" = Relationship(back_populates="sale_items")
@@ -45,7 +45,6 @@ class SaleItem(SaleItemBase, table=True):
 
 class SaleItemPublic(SaleItemBase):
     id: uuid.UUID
-    owner_id: uuid.UUID
     sale_id: uuid.UUID
     item_id: uuid.UUID
     date_created: datetime
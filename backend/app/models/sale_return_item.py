@@ -33,10 +33,10 @@ class SaleReturnItem(SaleReturnItemBase, table=True):
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
     sale_return_id: uuid.UUID = Field(
-        foreign_key="sale_return.id", nullable=False, ondelete="CASCADE"
+        foreign_key="sale_return.id", nullable=False, ondelete="CASCADE", index=True
     )
     item_id: uuid.UUID = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     sale_return: "SaleReturn" = Relationship(back_populates="sale_return_items")
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
@@ -25,6 +26,15 @@ class StockAdjustmentCreate(StockAdjustmentBase):
 
 class StockAdjustment(StockAdjustmentBase, table=True):
     __tablename__ = "stock_adjustment"
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index(
+            "ix_stock_adjustment_owner_id_date_created_id",
+            "owner_id",
+            "date_created",
+            "id",
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
@@ -32,7 +42,7 @@ class StockAdjustment(StockAdjustmentBase, table=True):
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     item_id: uuid.UUID = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="stock_adjustments")
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
@@ -26,6 +27,15 @@ class StockTransferCreate(StockTransferBase):
 
 class StockTransfer(StockTransferBase, table=True):
     __tablename__ = "stock_transfer"
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index(
+            "ix_stock_transfer_owner_id_date_created_id",
+            "owner_id",
+            "date_created",
+            "id",
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
@@ -33,13 +43,13 @@ class StockTransfer(StockTransferBase, table=True):
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     item_id: uuid.UUID = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
     src_store_id: uuid.UUID = Field(
-        foreign_key="store.id", nullable=False, ondelete="CASCADE"
+        foreign_key="store.id", nullable=False, ondelete="CASCADE", index=True
     )
     dst_store_id: uuid.UUID = Field(
-        foreign_key="store.id", nullable=False, ondelete="CASCADE"
+        foreign_key="store.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     owner: "User" = Relationship(back_populates="stock_transfers")
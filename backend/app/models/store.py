@@ -2,9 +2,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import BigInteger, Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.main import CountMode
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -30,9 +32,20 @@ class StoreUpdate(StoreBase):
 
 
 class Store(StoreBase, table=True):
+    __table_args__ = (
+        # tenant-scoped listings, ordered for (cursor) pagination
+        Index("ix_store_owner_id_date_created_id", "owner_id", "date_created", "id"),
+        # delta sync (`/changes`), by the transaction that last wrote each row
+        Index("ix_store_owner_id_change_xid_id", "owner_id", "change_xid", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     date_created: datetime = Field(default_factory=utcnow)
     date_updated: datetime = Field(default_factory=utcnow)
+    # the transaction that last wrote the row, stamped by a trigger
+    change_xid: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
@@ -63,4 +76,13 @@ class StorePublic(StoreBase):
 
 class StoresPublic(BaseModel):
     data: list[StorePublic]
-    count: int
+    count: int | None
+    count_mode: CountMode = "exact"
+    next_cursor: str | None = None
+
+
+class StoreChangesPublic(BaseModel):
+    data: list[StorePublic]
+    deleted: list[uuid.UUID]
+    next_cursor: str
+    has_more: bool
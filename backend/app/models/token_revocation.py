@@ -0,0 +1,21 @@
+import uuid
+from datetime import datetime
+
+from sqlmodel import Field
+
+from app.models import BaseModel
+from app.utils import utcnow
+
+
+# A revoked token, by its `jti`. Without one, the claims of every access token
+# issued to the user up to `revoked_at` are stale, and those tokens are checked
+# against the user row instead. Kept until the tokens it covers have expired.
+# No foreign key on the user: a deleted user's tokens must stay covered
+class TokenRevocation(BaseModel, table=True):
+    __tablename__ = "token_revocation"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(nullable=False)
+    jti: uuid.UUID | None = Field(default=None)
+    revoked_at: datetime = Field(default_factory=utcnow)
+    expires_at: datetime = Field(nullable=False, index=True)
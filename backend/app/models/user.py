@@ -3,9 +3,11 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from pydantic import EmailStr
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from app.models import BaseModel
+from app.models.main import CountMode
 from app.utils import utcnow
 
 if TYPE_CHECKING:
@@ -74,6 +76,11 @@ class UpdatePassword(BaseModel):
 
 # Database model, database table inferred from class name
 class User(UserBase, table=True):
+    __table_args__ = (
+        # superuser listing, ordered for (cursor) pagination
+        Index("ix_user_date_created_id", "date_created", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
     date_created: datetime = Field(default_factory=utcnow)
@@ -161,4 +168,6 @@ class UserPublic(UserBase):
 
 class UsersPublic(BaseModel):
     data: list[UserPublic]
-    count: int
+    count: int | None
+    count_mode: CountMode = "exact"
+    next_cursor: str | None = None
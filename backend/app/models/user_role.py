@@ -37,7 +37,11 @@ class UserRole(UserRoleBase, table=True):
         foreign_key="user.id", primary_key=True, nullable=False, ondelete="CASCADE"
     )
     role_id: uuid.UUID = Field(
-        foreign_key="role.id", primary_key=True, nullable=False, ondelete="CASCADE"
+        foreign_key="role.id",
+        primary_key=True,
+        nullable=False,
+        ondelete="CASCADE",
+        index=True,
     )
 
     user: "User" = Relationship(back_populates="user_role")
@@ -1,7 +1,13 @@
 from .r_base import RBase
+from .r_item import RItem
 from .r_permission import RPermission
+from .r_purchase import RPurchase
+from .r_sale import RSale
 
 __all__ = [
     "RBase",
+    "RItem",
     "RPermission",
+    "RPurchase",
+    "RSale",
 ]
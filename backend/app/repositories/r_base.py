@@ -1,15 +1,100 @@
-from typing import Generic, TypeVar
+import builtins
+from collections.abc import Iterable, Sequence
+from typing import Any, Generic, TypeVar, cast
 
-from sqlmodel import func, select
+from sqlalchemy import ColumnElement, CursorResult, Delete, Insert, Update
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlmodel import SQLModel, delete, func, insert, select, update
 
-from app.api.deps import SessionDep
+from app.api.deps import AsyncSessionDep, SessionDep
+from app.api.pagination import seek
 from app.interfaces import IBase
+from app.interfaces.i_base import IAsyncBase
+from app.utils import utcnow
 
-T = TypeVar("T")  # Entity
+T = TypeVar("T", bound=SQLModel)  # Entity
 ID = TypeVar("ID")  # Primary Key
 
+# Upserting keeps the row's original creation date
+UPSERT_KEEPS = ("date_created",)
+
+
+def _rows(objs: Sequence[Any]) -> list[dict[str, Any]]:
+    # the objects already carry their client-side defaults (id, dates)
+    return [obj.model_dump() for obj in objs]
+
+
+def _attach(session: Session, objs: Sequence[Any]) -> None:
+    # as persistent, like loaded objects, without reading them back
+    for obj in objs:
+        make_transient_to_detached(obj)
+        session.add(obj)
+
+
+def _commit(session: Session, /) -> None:
+    # what was just written is what the database holds, expiring it would
+    # read every object back on its next use, which RETURNING is there to save
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
+
+
+def _in_order(objs: Iterable[Any], ids: Sequence[Any]) -> list[Any]:
+    by_id = {obj.id: obj for obj in objs}
+    return [by_id[id] for id in ids if id in by_id]
+
+
+def _id_in(model: Any, ids: Sequence[Any]) -> ColumnElement[bool]:
+    [primary_key] = sa_inspect(model).primary_key
+    return cast(ColumnElement[bool], primary_key.in_(ids))
+
+
+def _rowcount(result: Any) -> int:
+    # an UPDATE or DELETE without RETURNING runs on a cursor
+    return cast(CursorResult[Any], result).rowcount
+
+
+def _update_statement(
+    model: Any, where: ColumnElement[bool], values: dict[str, Any]
+) -> Update:
+    if "date_updated" in model.model_fields and "date_updated" not in values:
+        values = {**values, "date_updated": utcnow()}
+    return update(model).where(where).values(values)
+
+
+def _upsert_statement(model: Any, index_elements: Sequence[str] | None) -> Insert:
+    if index_elements is None:
+        index_elements = [column.name for column in sa_inspect(model).primary_key]
+    statement = pg_insert(model)
+    return statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in model.__table__.columns
+            if column.name not in index_elements and column.name not in UPSERT_KEEPS
+        },
+    )
+
 
 class RBase(IBase[T, ID], Generic[T, ID]):
+    """
+    Single-object and set-based access to `model`'s table, whose writes stay
+    loaded after committing (see `_commit`).
+
+    The `*_many` methods each run one statement (INSERT ... RETURNING with
+    psycopg batches the rows into a few multi-row INSERTs) and commit, instead
+    of one round trip per object plus a refreshing SELECT. With `returning`,
+    or through the `*_many_returning` methods, the written rows come back from
+    the statement itself; otherwise inserts return the given objects, whose
+    ids and dates were set on construction, and updates and deletes how many
+    rows they matched.
+    """
+
     def __init__(self, session: SessionDep, model: type[T]) -> None:
         self.session = session
         self.model = model
@@ -17,9 +102,11 @@ class RBase(IBase[T, ID], Generic[T, ID]):
     def get(self, id: ID) -> T:
         return self.session.get(self.model, id)
 
-    def list(self, skip=0, limit=0) -> list[T]:
-        stmt = select(self.model).offset(skip).limit(limit)
-        return self.session.exec(stmt).all()
+    def list(
+        self, skip: int = 0, limit: int = 10, after: str | None = None
+    ) -> builtins.list[T]:
+        stmt = seek(select(self.model), self.model, skip=skip, limit=limit, after=after)
+        return list(self.session.exec(stmt))
 
     def count(self) -> int:
         stmt = select(func.count()).select_from(self.model)
@@ -27,17 +114,213 @@ class RBase(IBase[T, ID], Generic[T, ID]):
 
     def create(self, obj: T) -> T:
         self.session.add(obj)
-        self.session.commit()
-        self.session.refresh(obj)
+        _commit(self.session)
         return obj
 
-    def update(self, obj: T, data: dict) -> T:
+    def update(self, obj: T, data: dict[str, Any]) -> T:
         obj.sqlmodel_update(data)
         self.session.add(obj)
-        self.session.commit()
-        self.session.refresh(obj)
+        _commit(self.session)
         return obj
 
     def delete(self, obj: T) -> None:
         self.session.delete(obj)
         self.session.commit()
+
+    def get_many(self, ids: Iterable[ID]) -> builtins.list[T]:
+        """The objects with `ids` that exist, in the order of `ids`."""
+        unique = list(dict.fromkeys(ids))
+        if not unique:
+            return []
+        stmt = select(self.model).where(_id_in(self.model, unique))
+        return _in_order(self.session.exec(stmt), unique)
+
+    def exists(self, where: ColumnElement[bool]) -> bool:
+        stmt = select(select(self.model).where(where).exists())
+        return self.session.exec(stmt).one()
+
+    def create_many(
+        self, objs: Sequence[T], *, returning: bool = False
+    ) -> builtins.list[T]:
+        if not objs:
+            return []
+        if returning:
+            stmt = insert(self.model).returning(self.model)
+            created = list(self.session.scalars(stmt, _rows(objs)))
+        else:
+            self.session.execute(insert(self.model), _rows(objs))
+            _attach(self.session, objs)
+            created = list(objs)
+        _commit(self.session)
+        return created
+
+    def update_many(self, where: ColumnElement[bool], values: dict[str, Any]) -> int:
+        """Set `values` on the rows matching `where`, returns their count."""
+        stmt = _update_statement(self.model, where, values)
+        return self._write_count(stmt)
+
+    def update_many_returning(
+        self, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> builtins.list[T]:
+        """Set `values` on the rows matching `where`, returns them."""
+        stmt = _update_statement(self.model, where, values)
+        return self._write_returning(stmt)
+
+    def delete_many(self, where: ColumnElement[bool]) -> int:
+        """Delete the rows matching `where`, returns their count."""
+        return self._write_count(delete(self.model).where(where))
+
+    def delete_many_returning(self, where: ColumnElement[bool]) -> builtins.list[T]:
+        """Delete the rows matching `where`, returns them."""
+        return self._write_returning(delete(self.model).where(where))
+
+    def upsert_many(
+        self,
+        objs: Sequence[T],
+        *,
+        index_elements: Sequence[str] | None = None,
+        returning: bool = False,
+    ) -> builtins.list[T]:
+        """
+        Insert `objs`, or update the rows they conflict with on `index_elements`
+        (the primary key by default).
+
+        Without `returning`, `objs` are returned as given, though an updated
+        row keeps its date_created, and loaded objects aren't refreshed.
+        """
+        if not objs:
+            return []
+        stmt = _upsert_statement(self.model, index_elements)
+        if returning:
+            stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+            upserted = list(self.session.scalars(stmt, _rows(objs)))
+        else:
+            self.session.execute(stmt, _rows(objs))
+            upserted = list(objs)
+        _commit(self.session)
+        return upserted
+
+    def _write_count(self, stmt: Update | Delete) -> int:
+        count = _rowcount(self.session.execute(stmt))
+        _commit(self.session)
+        return count
+
+    def _write_returning(self, stmt: Update | Delete) -> builtins.list[T]:
+        written = list(self.session.scalars(stmt.returning(self.model)))
+        _commit(self.session)
+        return written
+
+
+class RAsyncBase(IAsyncBase[T, ID], Generic[T, ID]):
+    """`RBase` on an `AsyncSession`."""
+
+    def __init__(self, session: AsyncSessionDep, model: type[T]) -> None:
+        self.session = session
+        self.model = model
+
+    async def get(self, id: ID) -> T | None:
+        return await self.session.get(self.model, id)
+
+    async def list(
+        self, skip: int = 0, limit: int = 10, after: str | None = None
+    ) -> builtins.list[T]:
+        stmt = seek(select(self.model), self.model, skip=skip, limit=limit, after=after)
+        return list(await self.session.exec(stmt))
+
+    async def count(self) -> int:
+        stmt = select(func.count()).select_from(self.model)
+        return (await self.session.exec(stmt)).one()
+
+    async def create(self, obj: T) -> T:
+        self.session.add(obj)
+        await self._commit()
+        return obj
+
+    async def update(self, obj: T, data: dict[str, Any]) -> T:
+        obj.sqlmodel_update(data)
+        self.session.add(obj)
+        await self._commit()
+        return obj
+
+    async def delete(self, obj: T) -> None:
+        await self.session.delete(obj)
+        await self.session.commit()
+
+    async def get_many(self, ids: Iterable[ID]) -> builtins.list[T]:
+        unique = list(dict.fromkeys(ids))
+        if not unique:
+            return []
+        stmt = select(self.model).where(_id_in(self.model, unique))
+        return _in_order(await self.session.exec(stmt), unique)
+
+    async def exists(self, where: ColumnElement[bool]) -> bool:
+        stmt = select(select(self.model).where(where).exists())
+        return (await self.session.exec(stmt)).one()
+
+    async def create_many(
+        self, objs: Sequence[T], *, returning: bool = False
+    ) -> builtins.list[T]:
+        if not objs:
+            return []
+        if returning:
+            stmt = insert(self.model).returning(self.model)
+            created = list(await self.session.scalars(stmt, _rows(objs)))
+        else:
+            await self.session.execute(insert(self.model), _rows(objs))
+            _attach(self.session.sync_session, objs)
+            created = list(objs)
+        await self._commit()
+        return created
+
+    async def update_many(
+        self, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> int:
+        stmt = _update_statement(self.model, where, values)
+        return await self._write_count(stmt)
+
+    async def update_many_returning(
+        self, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> builtins.list[T]:
+        stmt = _update_statement(self.model, where, values)
+        return await self._write_returning(stmt)
+
+    async def delete_many(self, where: ColumnElement[bool]) -> int:
+        return await self._write_count(delete(self.model).where(where))
+
+    async def delete_many_returning(
+        self, where: ColumnElement[bool]
+    ) -> builtins.list[T]:
+        return await self._write_returning(delete(self.model).where(where))
+
+    async def upsert_many(
+        self,
+        objs: Sequence[T],
+        *,
+        index_elements: Sequence[str] | None = None,
+        returning: bool = False,
+    ) -> builtins.list[T]:
+        if not objs:
+            return []
+        stmt = _upsert_statement(self.model, index_elements)
+        if returning:
+            stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+            upserted = list(await self.session.scalars(stmt, _rows(objs)))
+        else:
+            await self.session.execute(stmt, _rows(objs))
+            upserted = list(objs)
+        await self._commit()
+        return upserted
+
+    async def _write_count(self, stmt: Update | Delete) -> int:
+        count = _rowcount(await self.session.execute(stmt))
+        await self._commit()
+        return count
+
+    async def _write_returning(self, stmt: Update | Delete) -> builtins.list[T]:
+        scalars = await self.session.scalars(stmt.returning(self.model))
+        written = list(scalars)
+        await self._commit()
+        return written
+
+    async def _commit(self) -> None:
+        await self.session.run_sync(_commit)
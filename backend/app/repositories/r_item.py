@@ -0,0 +1,69 @@
+import uuid
+from collections.abc import Iterable
+
+from sqlmodel import col, select
+
+from app.api.deps import SessionDep
+from app.core.db import driver_connection
+from app.interfaces import IItem
+from app.models import Item, ItemCategory, ItemCreate, ItemUnit
+from app.repositories import RBase
+from app.utils import utcnow
+
+
+def reference_key(name: str) -> str:
+    """How category and unit names are matched, regardless of case and spacing."""
+    return " ".join(name.split()).casefold()
+
+
+class RItem(RBase[Item, uuid.UUID], IItem):
+    def __init__(self, session: SessionDep) -> None:
+        super().__init__(session, Item)
+
+    def references(
+        self, owner_id: uuid.UUID
+    ) -> tuple[dict[str, uuid.UUID], dict[str, uuid.UUID]]:
+        """The ids of the owner's item categories and units, by `reference_key`."""
+        lookups: list[dict[str, uuid.UUID]] = []
+        for model in (ItemCategory, ItemUnit):
+            rows = self.session.exec(
+                select(model.name, model.id).where(col(model.owner_id) == owner_id)
+            ).all()
+            lookups.append({reference_key(name): id for name, id in rows})
+        categories, units = lookups
+        return categories, units
+
+    def copy_items(self, items: Iterable[ItemCreate], owner_id: uuid.UUID) -> int:
+        """COPY `items` into item as they are iterated, returns how many."""
+        now = utcnow()
+        count = 0
+        connection = driver_connection(self.session)
+        with (
+            connection.cursor() as cursor,
+            cursor.copy(
+                "COPY item (id, title, description, price_purchase, price_sell, stock,"
+                " stock_minimum, is_active, location, item_category_id, item_unit_id,"
+                " owner_id, date_created, date_updated) FROM STDIN"
+            ) as copy,
+        ):
+            for item in items:
+                copy.write_row(
+                    (
+                        uuid.uuid4(),
+                        item.title,
+                        item.description,
+                        item.price_purchase,
+                        item.price_sell,
+                        item.stock,
+                        item.stock_minimum,
+                        item.is_active,
+                        item.location,
+                        item.item_category_id,
+                        item.item_unit_id,
+                        owner_id,
+                        now,
+                        now,
+                    )
+                )
+                count += 1
+        return count
@@ -0,0 +1,132 @@
+import uuid
+from collections.abc import Iterable
+from typing import Any, cast
+
+from sqlalchemy import CursorResult
+from sqlmodel import col, func, select, update
+
+from app.api.deps import SessionDep
+from app.core.db import driver_connection
+from app.interfaces import IPurchase
+from app.models import Item, Purchase, PurchaseItem, PurchaseReceiveLine
+from app.repositories import RBase
+from app.utils import utcnow
+
+
+class RPurchase(RBase[Purchase, uuid.UUID], IPurchase):
+    def __init__(self, session: SessionDep) -> None:
+        super().__init__(session, Purchase)
+
+    def copy_items(
+        self, purchase_id: uuid.UUID, lines: Iterable[PurchaseReceiveLine]
+    ) -> None:
+        """
+        COPY `lines` into purchase_item as they are iterated.
+
+        psycopg sends the rows in buffered chunks, so memory stays flat however
+        many lines a delivery has.
+        """
+        now = utcnow()
+        connection = driver_connection(self.session)
+        with (
+            connection.cursor() as cursor,
+            cursor.copy(
+                "COPY purchase_item (id, purchase_id, item_id, quantity, price,"
+                " date_created, date_updated) FROM STDIN"
+            ) as copy,
+        ):
+            for line in lines:
+                copy.write_row(
+                    (
+                        uuid.uuid4(),
+                        purchase_id,
+                        line.item_id,
+                        line.quantity,
+                        line.price,
+                        now,
+                        now,
+                    )
+                )
+
+    def update_amount(self, purchase_id: uuid.UUID) -> tuple[float, int, int]:
+        """
+        Sum up the purchase's lines into its amount, in the database.
+
+        Returns the amount, the number of lines and of distinct items.
+        """
+        totals = (
+            select(
+                func.coalesce(
+                    func.sum(col(PurchaseItem.quantity) * col(PurchaseItem.price)), 0
+                ).label("amount"),
+                func.count().label("line_count"),
+                func.count(col(PurchaseItem.item_id).distinct()).label("item_count"),
+            )
+            .where(col(PurchaseItem.purchase_id) == purchase_id)
+            .subquery("totals")
+        )
+        statement = (
+            update(Purchase)
+            .where(col(Purchase.id) == purchase_id)
+            .values(amount=totals.c.amount, date_updated=utcnow())
+            .returning(col(Purchase.amount), totals.c.line_count, totals.c.item_count)
+            .execution_options(synchronize_session=False)
+        )
+        amount, line_count, item_count = self.session.execute(statement).one()
+        return amount, line_count, item_count
+
+    def receive_stock(
+        self, purchase_id: uuid.UUID, owner_id: uuid.UUID | None = None
+    ) -> int:
+        """
+        Add the purchase's quantities to their items' stock in one statement.
+
+        Returns the number of items updated, fewer than the purchase's distinct
+        items when some aren't owned by `owner_id` (if given).
+        """
+        received = (
+            select(
+                col(PurchaseItem.item_id).label("item_id"),
+                func.sum(col(PurchaseItem.quantity)).label("quantity"),
+            )
+            .where(col(PurchaseItem.purchase_id) == purchase_id)
+            .group_by(col(PurchaseItem.item_id))
+            .cte("received")
+        )
+        # lock the rows in id order, like crud.move_items_stock
+        locked = (
+            select(Item.id)
+            .join(received, col(Item.id) == received.c.item_id)
+            .order_by(col(Item.id))
+            .with_for_update(of=Item)
+        )
+        if owner_id is not None:
+            locked = locked.where(col(Item.owner_id) == owner_id)
+        locked_cte = locked.cte("locked")
+        statement = (
+            update(Item)
+            .where(
+                col(Item.id) == locked_cte.c.id,
+                col(Item.id) == received.c.item_id,
+            )
+            .values(stock=col(Item.stock) + received.c.quantity, date_updated=utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        # an UPDATE's result is a CursorResult, which has its rowcount
+        return cast(CursorResult[Any], self.session.execute(statement)).rowcount
+
+    def foreign_items(
+        self, purchase_id: uuid.UUID, owner_id: uuid.UUID, limit: int = 100
+    ) -> list[uuid.UUID]:
+        """Items of the purchase owned by someone other than `owner_id`."""
+        statement = (
+            select(Item.id)
+            .distinct()
+            .join(PurchaseItem, col(PurchaseItem.item_id) == col(Item.id))
+            .where(
+                col(PurchaseItem.purchase_id) == purchase_id,
+                col(Item.owner_id) != owner_id,
+            )
+            .limit(limit)
+        )
+        return list(self.session.exec(statement).all())
@@ -0,0 +1,11 @@
+import uuid
+
+from app.api.deps import SessionDep
+from app.interfaces import ISale
+from app.models import Sale
+from app.repositories import RBase
+
+
+class RSale(RBase[Sale, uuid.UUID], ISale):
+    def __init__(self, session: SessionDep) -> None:
+        super().__init__(session, Sale)
@@ -34,3 +34,4 @@ class PermissionPublic(PermissionBase):
 class PermissionsPublic(BaseModel):
     data: list[PermissionPublic]
     count: int
+    next_cursor: str | None = None
@@ -1,3 +1,15 @@
+from .errors import ServiceError
+from .s_item import SItem
 from .s_permission import SPermission
+from .s_purchase import PurchaseReceiveError, SPurchase
+from .s_sale import SaleCheckoutError, SSale
 
-__all__ = ["SPermission"]
+__all__ = [
+    "ServiceError",
+    "SItem",
+    "SPermission",
+    "SPurchase",
+    "PurchaseReceiveError",
+    "SSale",
+    "SaleCheckoutError",
+]
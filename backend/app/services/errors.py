@@ -0,0 +1,10 @@
+from typing import Any
+
+
+class ServiceError(ValueError):
+    """A request was rejected by a service and nothing of it was written."""
+
+    def __init__(self, detail: Any, status_code: int = 400) -> None:
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
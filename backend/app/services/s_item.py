@@ -0,0 +1,134 @@
+import uuid
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, NamedTuple, cast
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.api.streaming import chunked
+from app.models import ItemCreate, ItemImportError, ItemsImportPublic, User
+from app.repositories import RItem
+from app.repositories.r_item import reference_key
+
+# rows validated at once, and rejected rows reported back at most
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ERRORS = 100
+
+_items_adapter = TypeAdapter(list[ItemCreate])
+
+
+class Reference(NamedTuple):
+    """
+    The owner's rows a reference field may name: their ids by `reference_key`
+    of their name, and as a set to check given ids against, built once.
+    """
+
+    by_name: Mapping[str, uuid.UUID]
+    ids: frozenset[uuid.UUID]
+
+    @classmethod
+    def of(cls, by_name: Mapping[str, uuid.UUID]) -> "Reference":
+        return cls(by_name, frozenset(by_name.values()))
+
+
+References = Mapping[str, Reference]
+
+
+def _error(loc: list[str], msg: str, type: str) -> dict[str, Any]:
+    return {"loc": loc, "msg": msg, "type": type}
+
+
+def _resolve(row: dict[str, Any], references: References) -> list[dict[str, Any]]:
+    """
+    Replace the category and unit names of `row` by their ids, and check that
+    the ones given by id are the owner's. Returns the errors found.
+    """
+    errors = []
+    for field, reference in references.items():
+        name = row.pop(field, None)
+        label = field.replace("_", " ").capitalize()
+        if f"{field}_id" in row:
+            try:
+                given_id = uuid.UUID(str(row[f"{field}_id"]))
+            except ValueError:
+                continue  # left to ItemCreate to report
+            if given_id not in reference.ids:
+                errors.append(
+                    _error([f"{field}_id"], f"{label} not found", "not_found")
+                )
+        elif name is not None:
+            named_id = reference.by_name.get(reference_key(str(name)))
+            if named_id is None:
+                errors.append(_error([field], f"{label} not found", "not_found"))
+            row[f"{field}_id"] = named_id
+    return errors
+
+
+def _validate(
+    chunk: list[tuple[int, Any]], references: References
+) -> Iterator[tuple[int, ItemCreate | list[dict[str, Any]]]]:
+    """Each row of `chunk` as an ItemCreate, or the errors rejecting it."""
+    numbers, values = [], []
+    for number, row in chunk:
+        if not isinstance(row, dict):
+            yield number, [_error([], "Row is not an object", "dict_type")]
+            continue
+        # empty CSV cells, and extra cells without a header, count as missing
+        row = {k: v for k, v in row.items() if k is not None and v != ""}
+        if errors := _resolve(row, references):
+            yield number, errors
+            continue
+        numbers.append(number)
+        values.append(row)
+    try:
+        yield from zip(numbers, _items_adapter.validate_python(values), strict=True)
+        return
+    except ValidationError:
+        pass
+    # some row of the chunk is invalid, find out which
+    for number, value in zip(numbers, values, strict=True):
+        try:
+            yield number, ItemCreate.model_validate(value)
+        except ValidationError as e:
+            details = e.errors(
+                include_url=False, include_context=False, include_input=False
+            )
+            # ErrorDetails are TypedDicts, plain dicts at runtime
+            yield number, cast(list[dict[str, Any]], details)
+
+
+class SItem:
+    def __init__(self, repo: RItem) -> None:
+        self.repo = repo
+
+    def import_items(
+        self, rows: Iterable[tuple[int, Any]], owner: User
+    ) -> ItemsImportPublic:
+        """
+        Import items for `owner` from (row number, row) pairs, e.g. parsed CSV.
+
+        A row holds ItemCreate's fields, with its category and unit either by
+        id (`item_category_id`, `item_unit_id`) or by name (`item_category`,
+        `item_unit`) among the owner's, which are looked up once. Rows are
+        validated a chunk at a time and the valid ones COPYed as the rest is
+        read, so memory stays flat. Invalid rows are skipped and reported.
+        """
+        categories, units = self.repo.references(owner.id)
+        references = {
+            "item_category": Reference.of(categories),
+            "item_unit": Reference.of(units),
+        }
+        report = ItemsImportPublic(imported=0, failed=0, errors=[])
+
+        def valid_items() -> Iterator[ItemCreate]:
+            for chunk in chunked(rows, IMPORT_CHUNK_SIZE):
+                for number, result in _validate(chunk, references):
+                    if isinstance(result, ItemCreate):
+                        yield result
+                        continue
+                    report.failed += 1
+                    if len(report.errors) < IMPORT_MAX_ERRORS:
+                        report.errors.append(ItemImportError(row=number, errors=result))
+
+        report.imported = self.repo.copy_items(valid_items(), owner.id)
+        self.repo.session.commit()
+        return report
@@ -1,5 +1,6 @@
 import uuid
 
+from app.api.pagination import split_page
 from app.models import (
     Permission,
     PermissionPublic,
@@ -18,10 +19,10 @@ class SPermission:
             raise ValueError("Permission not found")
         return obj
 
-    def read_permissions(self, skip=0, limit=10) -> PermissionsPublic:
-        objs = self.repo.list()
+    def read_permissions(self, skip=0, limit=10, after=None) -> PermissionsPublic:
+        objs, next_cursor = split_page(self.repo.list(skip, limit + 1, after), limit)
         count = self.repo.count()
-        return PermissionsPublic(data=objs, count=count)
+        return PermissionsPublic(data=objs, count=count, next_cursor=next_cursor)
 
     def create_permission(self, obj: Permission):
         return self.repo.create(obj)
@@ -0,0 +1,116 @@
+import re
+from collections.abc import Iterable
+
+from psycopg.errors import ForeignKeyViolation
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import (
+    Payable,
+    Purchase,
+    PurchaseReceive,
+    PurchaseReceiveLine,
+    PurchaseReceivePublic,
+    Store,
+    Supplier,
+    User,
+)
+from app.repositories import RPurchase
+from app.services.errors import ServiceError
+
+# e.g. 'Key (item_id)=(...) is not present in table "item".'
+_MISSING_KEY = re.compile(r"Key \(item_id\)=\((?P<item_id>[^)]+)\)")
+
+
+class PurchaseReceiveError(ServiceError):
+    pass
+
+
+class SPurchase:
+    def __init__(self, repo: RPurchase) -> None:
+        self.repo = repo
+
+    def receive(
+        self,
+        receive_in: PurchaseReceive,
+        lines: Iterable[PurchaseReceiveLine],
+        owner: User,
+    ) -> PurchaseReceivePublic:
+        """
+        Record a supplier delivery, add it to stock and open its payable.
+
+        `lines` is consumed once and lazily, it is COPYed into purchase_item
+        as it is read. The purchase amount and the stock increments are then
+        computed from purchase_item by the database, set-based, so neither
+        memory nor the number of statements grows with the delivery.
+        """
+        session = self.repo.session
+        # superusers may receive into anyone's suppliers, stores and items
+        owner_id = None if owner.is_superuser else owner.id
+        supplier = session.get(Supplier, receive_in.supplier_id)
+        if not supplier:
+            raise PurchaseReceiveError("Supplier not found", status_code=404)
+        store = session.get(Store, receive_in.store_id)
+        if not store:
+            raise PurchaseReceiveError("Store not found", status_code=404)
+        if owner_id is not None and owner_id != supplier.owner_id:
+            raise PurchaseReceiveError("Not enough permissions")
+        if owner_id is not None and owner_id != store.owner_id:
+            raise PurchaseReceiveError("Not enough permissions")
+
+        purchase = Purchase(
+            date_purchase=receive_in.date_purchase,
+            description=receive_in.description,
+            owner_id=owner.id,
+            supplier_id=supplier.id,
+            store_id=store.id,
+        )
+        session.add(purchase)
+        session.flush()
+        try:
+            self.repo.copy_items(purchase.id, lines)
+        except ForeignKeyViolation as e:
+            session.rollback()
+            match = _MISSING_KEY.search(e.diag.message_detail or "")
+            raise PurchaseReceiveError(
+                [
+                    {
+                        "item_id": match["item_id"] if match else None,
+                        "detail": "Item not found",
+                    }
+                ]
+            )
+        amount, line_count, item_count = self.repo.update_amount(purchase.id)
+        if not line_count:
+            session.rollback()
+            raise PurchaseReceiveError("Purchase has no lines")
+        if self.repo.receive_stock(purchase.id, owner_id) < item_count:
+            if owner_id is None:
+                # every item is a superuser's to receive into: one went missing
+                # since the lines were copied
+                session.rollback()
+                raise PurchaseReceiveError("Item not found", status_code=404)
+            item_ids = self.repo.foreign_items(purchase.id, owner_id)
+            session.rollback()
+            raise PurchaseReceiveError(
+                [
+                    {"item_id": str(item_id), "detail": "Not enough permissions"}
+                    for item_id in item_ids
+                ]
+            )
+        set_committed_value(purchase, "amount", amount)
+
+        payable = Payable(
+            date_payable=receive_in.date_payable or receive_in.date_purchase,
+            amount=amount,
+            status="unpaid",
+            owner_id=owner.id,
+            supplier_id=supplier.id,
+            purchase_id=purchase.id,
+        )
+        session.add(payable)
+        session.flush()
+        received = PurchaseReceivePublic.model_validate(
+            {"purchase": purchase, "payable": payable, "lines": line_count}
+        )
+        session.commit()
+        return received
@@ -0,0 +1,165 @@
+import uuid
+from collections import defaultdict
+
+from sqlmodel import col, insert, update
+
+from app import crud
+from app.models import (
+    Account,
+    AccountTransaction,
+    Customer,
+    Payment,
+    Receivable,
+    Sale,
+    SaleCheckout,
+    SaleCheckoutPublic,
+    SaleItem,
+    SaleItemPublic,
+    Store,
+    User,
+)
+from app.repositories import RSale
+from app.services.errors import ServiceError
+from app.utils import utcnow
+
+
+class SaleCheckoutError(ServiceError):
+    pass
+
+
+class SSale:
+    def __init__(self, repo: RSale) -> None:
+        self.repo = repo
+
+    def checkout(self, checkout_in: SaleCheckout, owner: User) -> SaleCheckoutPublic:
+        """
+        Record a sale with its lines, stock, payment and receivable at once.
+
+        Everything is written in one transaction, with the same number of
+        statements whatever the number of lines: the stock of every line's item
+        is taken out by one UPDATE, and the rows of each table are inserted by
+        one flush. The amount paid goes to the account, whatever is left of
+        the sale amount becomes a receivable.
+        """
+        session = self.repo.session
+        # superusers may sell from anyone's customers, stores and items
+        owner_id = None if owner.is_superuser else owner.id
+        customer = session.get(Customer, checkout_in.customer_id)
+        if not customer:
+            raise SaleCheckoutError("Customer not found", status_code=404)
+        store = session.get(Store, checkout_in.store_id)
+        if not store:
+            raise SaleCheckoutError("Store not found", status_code=404)
+        if owner_id is not None and owner_id != customer.owner_id:
+            raise SaleCheckoutError("Not enough permissions")
+        if owner_id is not None and owner_id != store.owner_id:
+            raise SaleCheckoutError("Not enough permissions")
+        amount = sum(line.quantity * line.price for line in checkout_in.lines)
+        amount_paid = checkout_in.amount_paid
+        if amount_paid > amount:
+            raise SaleCheckoutError("Amount paid exceeds the sale amount")
+        if amount_paid and checkout_in.account_id is None:
+            raise SaleCheckoutError("Account is required to pay")
+
+        quantities: dict[uuid.UUID, int] = defaultdict(int)
+        for line in checkout_in.lines:
+            quantities[line.item_id] -= line.quantity
+        items = crud.move_items_stock(
+            session=session, quantities=quantities, owner_id=owner_id
+        )
+        if len(items) < len(quantities):
+            errors = crud.stock_errors(
+                session=session, quantities=quantities, owner_id=owner_id
+            )
+            session.rollback()
+            raise SaleCheckoutError(errors)
+
+        sale = Sale(
+            date_sale=checkout_in.date_sale,
+            amount=amount,
+            description=checkout_in.description,
+            owner_id=owner.id,
+            customer_id=customer.id,
+            store_id=store.id,
+        )
+        # plain rows rather than ORM objects, the lines are inserted in bulk
+        now = utcnow()
+        sale_items = [
+            SaleItemPublic(
+                id=uuid.uuid4(),
+                sale_id=sale.id,
+                item_id=line.item_id,
+                quantity=line.quantity,
+                price=line.price,
+                date_created=now,
+                date_updated=now,
+            )
+            for line in checkout_in.lines
+        ]
+        session.add(sale)
+        receivable = None
+        if amount_paid < amount:
+            receivable = Receivable(
+                date_payable=checkout_in.date_payable or checkout_in.date_sale,
+                amount=amount,
+                amount_paid=amount_paid,
+                status="partial" if amount_paid else "unpaid",
+                owner_id=owner.id,
+                customer_id=customer.id,
+                sale_id=sale.id,
+            )
+            session.add(receivable)
+        payment = None
+        if amount_paid:
+            statement = (
+                update(Account)
+                .where(col(Account.id) == checkout_in.account_id)
+                .values(
+                    balance=col(Account.balance) + amount_paid,
+                    date_updated=utcnow(),
+                )
+                .returning(col(Account.id))
+                .execution_options(synchronize_session="fetch")
+            )
+            if owner_id is not None:
+                statement = statement.where(col(Account.owner_id) == owner_id)
+            account_id = session.execute(statement).scalar_one_or_none()
+            if account_id is None:
+                session.rollback()
+                raise SaleCheckoutError("Account not found", status_code=404)
+            payment = Payment(
+                date_payment=checkout_in.date_sale,
+                amount=amount_paid,
+                method=checkout_in.payment_method,
+                transaction_type="sale",
+                transaction_id=sale.id,
+                subject_type="customer",
+                subject_id=customer.id,
+                owner_id=owner.id,
+                account_id=account_id,
+            )
+            session.add(payment)
+            session.add(
+                AccountTransaction(
+                    type="in",
+                    amount=amount_paid,
+                    reference_name="sale",
+                    reference_id=sale.id,
+                    owner_id=owner.id,
+                    account_id=account_id,
+                )
+            )
+        session.flush()
+        session.execute(
+            insert(SaleItem), [sale_item.model_dump() for sale_item in sale_items]
+        )
+        checkout = SaleCheckoutPublic.model_validate(
+            {
+                "sale": sale,
+                "sale_items": sale_items,
+                "receivable": receivable,
+                "payment": payment,
+            }
+        )
+        session.commit()
+        return checkout
@@ -1,11 +1,12 @@
+import json
 import uuid
 
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
 from app.core.config import settings
-from app.models import Customer
-from app.tests.conftest import authentication_token_from_email
+from app.models import Customer, CustomerPublic
+from app.tests.conftest import QueryBudget, authentication_token_from_email
 from app.tests.utils.customer import create_random_customer
 from app.tests.utils.customer_type import create_random_customer_type
 from app.tests.utils.user import create_random_user
@@ -61,6 +62,30 @@ def test_create_customer_customer_type_not_found(
     assert content["detail"] == "Customer type not found"
 
 
+def test_export_customers(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    customer_1 = create_random_customer(db, user)
+    customer_2 = create_random_customer(db, user)
+    create_random_customer(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/customers/export",
+        headers=user_token_headers,
+        params={"format": "ndjson"},
+    )
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [customer["id"] for customer in exported] == [
+        str(customer_1.id),
+        str(customer_2.id),
+    ]
+    assert exported[0]["name"] == customer_1.name
+    assert exported[0]["customer_type_id"] == str(customer_1.customer_type_id)
+    assert set(exported[0]) == set(CustomerPublic.model_fields)
+
+
 def test_read_customer(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
     user_token_headers = authentication_token_from_email(
@@ -123,6 +148,30 @@ def test_read_customers(client: TestClient, db: Session) -> None:
     assert len(content["data"]) == 2
 
 
+def test_read_customers_not_modified(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    create_random_customer(db, user)
+    response = client.get(
+        f"{settings.API_V1_STR}/customers/", headers=user_token_headers
+    )
+    etag = response.headers["ETag"]
+    response = client.get(
+        f"{settings.API_V1_STR}/customers/",
+        headers={**user_token_headers, "If-None-Match": f'"x", {etag}'},
+    )
+    assert response.status_code == 304
+    create_random_customer(db, user)
+    response = client.get(
+        f"{settings.API_V1_STR}/customers/",
+        headers={**user_token_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 2
+
+
 def test_read_customers_superuser(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -141,6 +190,24 @@ def test_read_customers_superuser(
     assert len(content["data"]) == 2
 
 
+def test_read_customers_expand(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    query_budget: QueryBudget,
+) -> None:
+    for _ in range(3):
+        create_random_customer(db)
+    with query_budget(2):
+        response = client.get(
+            f"{settings.API_V1_STR}/customers/?limit=3&expand=customer_type",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+    for customer in response.json()["data"]:
+        assert customer["customer_type"]["id"] == customer["customer_type_id"]
+
+
 def test_update_customer(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
     user_token_headers = authentication_token_from_email(
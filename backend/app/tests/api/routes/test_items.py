@@ -1,15 +1,20 @@
+import csv
+import io
+import json
 import uuid
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session, delete
+from sqlmodel import Session, delete, select
 
 from app.core.config import settings
-from app.models import Item
-from app.tests.conftest import authentication_token_from_email
-from app.tests.utils.user import create_random_user
+from app.core.db import engine
+from app.core.query_stats import record_queries
+from app.models import Item, ItemPublic
+from app.tests.conftest import QueryBudget, authentication_token_from_email
 from app.tests.utils.item import create_random_item
 from app.tests.utils.item_category import create_random_item_category
 from app.tests.utils.item_unit import create_random_item_unit
+from app.tests.utils.user import create_random_user
 
 
 def test_create_item(
@@ -17,7 +22,12 @@ def test_create_item(
 ) -> None:
     item_category = create_random_item_category(db)
     item_unit = create_random_item_unit(db)
-    data = {"title": "Foo", "description": "Fighters", "item_category_id": str(item_category.id), "item_unit_id": str(item_unit.id)}
+    data = {
+        "title": "Foo",
+        "description": "Fighters",
+        "item_category_id": str(item_category.id),
+        "item_unit_id": str(item_unit.id),
+    }
     response = client.post(
         f"{settings.API_V1_STR}/items/",
         headers=superuser_token_headers,
@@ -35,7 +45,12 @@ def test_create_item_not_found_category(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
     item_unit = create_random_item_unit(db)
-    data = {"title": "Foo", "description": "Fighters", "item_category_id": str(uuid.uuid4()), "item_unit_id": str(item_unit.id)}
+    data = {
+        "title": "Foo",
+        "description": "Fighters",
+        "item_category_id": str(uuid.uuid4()),
+        "item_unit_id": str(item_unit.id),
+    }
     response = client.post(
         f"{settings.API_V1_STR}/items/",
         headers=superuser_token_headers,
@@ -50,7 +65,12 @@ def test_create_item_not_found_unit(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
     item_category = create_random_item_category(db)
-    data = {"title": "Foo", "description": "Fighters", "item_category_id": str(item_category.id), "item_unit_id": str(uuid.uuid4())}
+    data = {
+        "title": "Foo",
+        "description": "Fighters",
+        "item_category_id": str(item_category.id),
+        "item_unit_id": str(uuid.uuid4()),
+    }
     response = client.post(
         f"{settings.API_V1_STR}/items/",
         headers=superuser_token_headers,
@@ -61,6 +81,63 @@ def test_create_item_not_found_unit(
     assert content["detail"] == "Item unit not found"
 
 
+def test_export_items_csv(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item_1 = create_random_item(db, user, stock=3)
+    item_2 = create_random_item(db, user)
+    create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/export", headers=user_token_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="items.csv"'
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [str(item_1.id), str(item_2.id)]
+    assert list(rows[0]) == list(ItemPublic.model_fields)
+    assert rows[0]["stock"] == "3"
+    assert rows[0]["title"] == item_1.title
+    assert rows[0]["owner_id"] == str(user.id)
+
+
+def test_export_items_ndjson(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    create_random_item(db, user)
+    create_random_item(db, user)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/export",
+        headers=user_token_headers,
+        params={"format": "ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    response = client.get(f"{settings.API_V1_STR}/items/", headers=user_token_headers)
+    assert [ItemPublic.model_validate(item) for item in exported] == [
+        ItemPublic.model_validate(item) for item in response.json()["data"]
+    ]
+
+
+def test_export_items_empty(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/items/export", headers=user_token_headers
+    )
+    assert response.status_code == 200
+    assert response.text.strip() == ",".join(ItemPublic.model_fields)
+
+
 def test_read_item(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -77,6 +154,54 @@ def test_read_item(
     assert content["owner_id"] == str(item.owner_id)
 
 
+def test_read_item_fields(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item = create_random_item(db, user, stock=4)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}?fields=title,stock",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"title": item.title, "stock": 4}
+
+
+def test_read_item_not_modified(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    last_modified = response.headers["Last-Modified"]
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers={**superuser_token_headers, "If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 304
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers={
+            **superuser_token_headers,
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        },
+    )
+    assert response.status_code == 200
+    # the ETag wins over the date
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers={
+            **superuser_token_headers,
+            "If-Modified-Since": last_modified,
+            "If-None-Match": 'W/"other"',
+        },
+    )
+    assert response.status_code == 200
+
+
 def test_read_item_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -119,11 +244,173 @@ def test_read_items(
     assert len(content["data"]) == 2
 
 
-def test_read_items_with_owner(
-    client: TestClient, db: Session
+def test_read_items_as_public(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item = create_random_item(db, user, price_sell=1500.5)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    # the rows encoded as is, exactly as the models would have been
+    assert response.json() == {
+        "data": [ItemPublic.model_validate(item).model_dump(mode="json")],
+        "count": 1,
+        "count_mode": "exact",
+        "next_cursor": None,
+    }
+
+
+def test_read_items_fields(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    items = [create_random_item(db, user, price_sell=1500) for _ in range(3)]
+    with record_queries() as stats:
+        response = client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers=user_token_headers,
+            params={"fields": "stock,id,title,price_sell", "limit": 2},
+        )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["data"] == [
+        {"title": item.title, "price_sell": 1500, "stock": 0, "id": str(item.id)}
+        for item in items[:2]
+    ]
+    assert content["next_cursor"] is not None
+    # only the columns asked for, and the cursor's, are read
+    assert not any("description" in statement for statement in stats.fingerprints)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=user_token_headers,
+        params={"fields": "id", "after": content["next_cursor"]},
+    )
+    assert response.json()["data"] == [{"id": str(items[2].id)}]
+
+
+def test_read_items_not_modified(
+    client: TestClient, db: Session, query_budget: QueryBudget
+) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item = create_random_item(db, user)
+    response = client.get(f"{settings.API_V1_STR}/items/", headers=user_token_headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    # told apart by the transactions that wrote it, not by a date
+    assert "Last-Modified" not in response.headers
+    # answered from the indexes, without counting or reading the page
+    with query_budget(1):
+        response = client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers={**user_token_headers, "If-None-Match": etag},
+        )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    # another page is another representation
+    response = client.get(
+        f"{settings.API_V1_STR}/items/?fields=id",
+        headers={**user_token_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    response = client.put(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers=user_token_headers,
+        json={"title": "Updated title"},
+    )
+    assert response.status_code == 200
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers={**user_token_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    etag = response.headers["ETag"]
+    client.delete(f"{settings.API_V1_STR}/items/{item.id}", headers=user_token_headers)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers={**user_token_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+
+
+def test_read_items_not_modified_in_flight(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item = create_random_item(db, user)
+    with Session(engine) as pending:
+        # a long transaction writes first, and commits last
+        pending_item = pending.get_one(Item, item.id)
+        pending_item.title = "Pending title"
+        pending.add(pending_item)
+        pending.flush()
+        create_random_item(db, user)
+        response = client.get(
+            f"{settings.API_V1_STR}/items/", headers=user_token_headers
+        )
+        # nothing would tell this listing from the one after it commits
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        pending.commit()
+    response = client.get(f"{settings.API_V1_STR}/items/", headers=user_token_headers)
+    assert "Pending title" in {row["title"] for row in response.json()["data"]}
+    assert "ETag" in response.headers
+
+
+def test_read_items_counted_as_asked(
+    client: TestClient, db: Session, query_budget: QueryBudget
 ) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    create_random_item(db, user)
+    # the validators, and the page: neither counts the rows
+    with query_budget(2):
+        response = client.get(
+            f"{settings.API_V1_STR}/items/?count=none", headers=user_token_headers
+        )
+    assert response.json()["count"] is None
+    assert "ETag" in response.headers
+
+
+def test_read_items_fields_unknown(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/?fields=id,secret",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Cannot return secret, only title,")
+
+
+def test_read_items_fields_and_expand(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/?fields=id&expand=item_unit",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Cannot both expand and pick fields"
+
+
+def test_read_items_with_owner(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     create_random_item(db, user)
     create_random_item(db, user)
     response = client.get(
@@ -135,6 +422,126 @@ def test_read_items_with_owner(
     assert len(content["data"]) == 2
 
 
+def test_read_item_changes(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item = create_random_item(db, user)
+    other_item = create_random_item(db, user)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/changes", headers=user_token_headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [row["id"] for row in content["data"]] == [
+        str(item.id),
+        str(other_item.id),
+    ]
+    assert content["deleted"] == []
+    assert content["has_more"] is False
+    cursor = content["next_cursor"]
+
+    client.put(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers=user_token_headers,
+        json={"title": "Updated title"},
+    )
+    client.delete(
+        f"{settings.API_V1_STR}/items/{other_item.id}", headers=user_token_headers
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/items/changes",
+        headers=user_token_headers,
+        params={"since": cursor},
+    )
+    content = response.json()
+    assert [row["title"] for row in content["data"]] == ["Updated title"]
+    assert content["deleted"] == [str(other_item.id)]
+    # up to date
+    response = client.get(
+        f"{settings.API_V1_STR}/items/changes",
+        headers=user_token_headers,
+        params={"since": content["next_cursor"]},
+    )
+    content = response.json()
+    assert content["data"] == []
+    assert content["deleted"] == []
+    assert content["has_more"] is False
+
+
+def test_read_item_changes_pages(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    items = [create_random_item(db, user) for _ in range(3)]
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get(
+            f"{settings.API_V1_STR}/items/changes",
+            headers=user_token_headers,
+            params=params,
+        )
+        content = response.json()
+        seen += [row["id"] for row in content["data"]]
+        if not content["has_more"]:
+            break
+        params["since"] = content["next_cursor"]
+    assert seen == [str(item.id) for item in items]
+
+
+def test_read_item_changes_in_flight(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item = create_random_item(db, user)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/changes", headers=user_token_headers
+    )
+    cursor = response.json()["next_cursor"]
+    with Session(engine) as pending:
+        # a long transaction writes first, and commits last
+        pending_item = pending.get_one(Item, item.id)
+        pending_item.title = "Pending title"
+        pending.add(pending_item)
+        pending.flush()
+        other_item = create_random_item(db, user)
+        response = client.get(
+            f"{settings.API_V1_STR}/items/changes",
+            headers=user_token_headers,
+            params={"since": cursor},
+        )
+        content = response.json()
+        # held back, rather than moved past
+        assert content["data"] == []
+        assert content["next_cursor"] == cursor
+        pending.commit()
+    response = client.get(
+        f"{settings.API_V1_STR}/items/changes",
+        headers=user_token_headers,
+        params={"since": cursor},
+    )
+    assert [row["title"] for row in response.json()["data"]] == [
+        "Pending title",
+        other_item.title,
+    ]
+
+
+def test_read_item_changes_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/changes",
+        headers=superuser_token_headers,
+        params={"since": "not a cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
 def test_update_item(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -186,7 +593,11 @@ def test_update_item_not_found_category(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
     item = create_random_item(db)
-    data = {"title": "Updated title", "description": "Updated description", "item_category_id": str(uuid.uuid4())}
+    data = {
+        "title": "Updated title",
+        "description": "Updated description",
+        "item_category_id": str(uuid.uuid4()),
+    }
     response = client.put(
         f"{settings.API_V1_STR}/items/{item.id}",
         headers=superuser_token_headers,
@@ -201,7 +612,11 @@ def test_update_item_not_found_unit(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
     item = create_random_item(db)
-    data = {"title": "Updated title", "description": "Updated description", "item_unit_id": str(uuid.uuid4())}
+    data = {
+        "title": "Updated title",
+        "description": "Updated description",
+        "item_unit_id": str(uuid.uuid4()),
+    }
     response = client.put(
         f"{settings.API_V1_STR}/items/{item.id}",
         headers=superuser_token_headers,
@@ -279,6 +694,187 @@ def test_update_stock_item_not_enough_permissions(
     assert content["detail"] == "Not enough permissions"
 
 
+def test_update_stock_item_not_enough_stock(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db, stock=10)
+    data = {"quantity": -11}
+    response = client.put(
+        f"{settings.API_V1_STR}/items/{item.id}/stock",
+        headers=superuser_token_headers,
+        params=data,
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == "Not enough stock"
+    db.refresh(item)
+    assert item.stock == 10
+
+
+def test_update_stock_items(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item_1 = create_random_item(db, stock=10, stock_minimum=5)
+    item_2 = create_random_item(db, stock=10)
+    data = {
+        "data": [
+            {"item_id": str(item_1.id), "quantity": -4},
+            {"item_id": str(item_2.id), "quantity": 5},
+            {"item_id": str(item_1.id), "quantity": -2},
+        ]
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/items/stock/batch",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["data"] == [
+        {"item_id": str(item_1.id), "quantity": -4, "stock": 4, "stock_minimum": 5},
+        {"item_id": str(item_2.id), "quantity": 5, "stock": 15, "stock_minimum": 0},
+        {"item_id": str(item_1.id), "quantity": -2, "stock": 4, "stock_minimum": 5},
+    ]
+
+
+def test_update_stock_items_all_or_nothing(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item_1 = create_random_item(db, stock=10)
+    item_2 = create_random_item(db, stock=1)
+    missing_id = uuid.uuid4()
+    data = {
+        "data": [
+            {"item_id": str(item_1.id), "quantity": -4},
+            {"item_id": str(item_2.id), "quantity": -2},
+            {"item_id": str(missing_id), "quantity": 1},
+        ]
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/items/stock/batch",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == [
+        {"item_id": str(item_2.id), "detail": "Not enough stock"},
+        {"item_id": str(missing_id), "detail": "Item not found"},
+    ]
+    db.refresh(item_1)
+    assert item_1.stock == 10
+
+
+def test_update_stock_items_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db, stock=10)
+    data = {"data": [{"item_id": str(item.id), "quantity": -1}]}
+    response = client.post(
+        f"{settings.API_V1_STR}/items/stock/batch",
+        headers=normal_user_token_headers,
+        json=data,
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == [
+        {"item_id": str(item.id), "detail": "Not enough permissions"}
+    ]
+    db.refresh(item)
+    assert item.stock == 10
+
+
+def test_import_items_csv(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item_category = create_random_item_category(db, user)
+    item_unit = create_random_item_unit(db, user)
+    body = (
+        "title,price_sell,stock,item_category,item_unit,item_category_id,item_unit_id\n"
+        f"Foo,1500,3,{item_category.name.upper()},{item_unit.name},,\n"
+        f"Bar,,,,,{item_category.id},{item_unit.id}\n"
+    )
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers={**user_token_headers, "Content-Type": "text/csv"},
+        content=body,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content == {"imported": 2, "failed": 0, "errors": []}
+    items = db.exec(
+        select(Item).where(Item.owner_id == user.id).order_by(Item.title)
+    ).all()
+    assert [(i.title, i.price_sell, i.stock) for i in items] == [
+        ("Bar", None, 0),
+        ("Foo", 1500, 3),
+    ]
+    assert all(i.item_category_id == item_category.id for i in items)
+    assert all(i.item_unit_id == item_unit.id for i in items)
+
+
+def test_import_items_invalid_rows(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    item_category = create_random_item_category(db, user)
+    item_unit = create_random_item_unit(db, user)
+    other_category = create_random_item_category(db)
+    names = {"item_category": item_category.name, "item_unit": item_unit.name}
+    rows = [
+        {"title": "Foo", **names},
+        {"title": "Bar", "item_category": "missing", "item_unit": item_unit.name},
+        {"title": "Baz", "stock": -1, **names},
+        ["not", "an", "object"],
+        {
+            "title": "Qux",
+            "item_category_id": str(other_category.id),
+            "item_unit_id": str(item_unit.id),
+        },
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{broken\n"
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers={**user_token_headers, "Content-Type": "application/x-ndjson"},
+        content=body,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["imported"] == 1
+    assert content["failed"] == 5
+    errors = {error["row"]: error["errors"] for error in content["errors"]}
+    assert sorted(errors) == [2, 3, 4, 5, 6]
+    assert errors[2] == [
+        {
+            "loc": ["item_category"],
+            "msg": "Item category not found",
+            "type": "not_found",
+        }
+    ]
+    assert errors[3][0]["loc"] == ["stock"]
+    assert errors[4][0]["type"] == "dict_type"
+    assert errors[5][0]["loc"] == ["item_category_id"]
+    assert errors[6][0]["type"] == "dict_type"
+    items = db.exec(select(Item).where(Item.owner_id == user.id)).all()
+    assert [i.title for i in items] == ["Foo"]
+
+
+def test_import_items_unsupported_content_type(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers=superuser_token_headers,
+        json=[{"title": "Foo"}],
+    )
+    assert response.status_code == 415
+    content = response.json()
+    assert content["detail"] == "Unsupported content type"
+
+
 def test_read_low_stock_items(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -294,13 +890,13 @@ def test_read_low_stock_items(
     assert response.status_code == 200
     content = response.json()
     assert len(content["data"]) == 1
-    
 
-def test_read_low_stock_items_with_owner(
-    client: TestClient, db: Session
-) -> None:
+
+def test_read_low_stock_items_with_owner(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     create_random_item(db, user, stock_minimum=10)
     create_random_item(db, user, stock_minimum=10)
     response = client.get(
@@ -317,7 +913,7 @@ def test_activate_item(
 ) -> None:
     item = create_random_item(db, is_active=False)
     assert item.is_active == False
-    
+
     response = client.put(
         f"{settings.API_V1_STR}/items/{item.id}/activate/",
         headers=superuser_token_headers,
@@ -437,3 +1033,71 @@ def test_delete_item_not_enough_permissions(
     assert response.status_code == 400
     content = response.json()
     assert content["detail"] == "Not enough permissions"
+
+
+def test_read_items_query_budget(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    query_budget: QueryBudget,
+) -> None:
+    for _ in range(6):
+        create_random_item(db)
+    # the page and its count, however many items it holds
+    with query_budget(2):
+        response = client.get(
+            f"{settings.API_V1_STR}/items/?limit=6",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 6
+    assert response.headers["X-DB-Statements"] == "2"
+    assert "db;dur=" in response.headers["Server-Timing"]
+
+
+def test_read_items_expand(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    query_budget: QueryBudget,
+) -> None:
+    for _ in range(6):
+        create_random_item(db)
+    # the categories and units are joined to the page, no query per item
+    with query_budget(2):
+        response = client.get(
+            f"{settings.API_V1_STR}/items/?limit=6&expand=item_category,item_unit",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+    for item in response.json()["data"]:
+        assert item["item_category"]["id"] == item["item_category_id"]
+        assert item["item_unit"]["id"] == item["item_unit_id"]
+
+
+def test_read_item_expand(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}?expand=item_unit",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["item_unit"]["id"] == str(item.item_unit_id)
+    assert content["item_category"] is None
+
+
+def test_read_item_expand_unknown(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}?expand=owner",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"] == (
+        "Cannot expand owner, only item_category, item_unit"
+    )
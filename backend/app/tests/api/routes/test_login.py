@@ -1,11 +1,20 @@
+from typing import Any
 from unittest.mock import patch
 
+import jwt
+import pytest
 from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlmodel import Session, select
 
+from app.core import security
 from app.core.config import settings
-from app.core.security import verify_password
+from app.core.db import async_engine
+from app.core.security import password_hasher, verify_password
 from app.models import User
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import random_lower_string
 from app.utils import generate_password_reset_token
 
 
@@ -30,6 +39,147 @@ def test_get_access_token_incorrect_password(client: TestClient) -> None:
     assert r.status_code == 400
 
 
+def test_get_access_token_rehashes_password(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    password = random_lower_string()
+    # hashed before the cost factor was raised
+    user.hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(
+        password
+    )
+    db.add(user)
+    db.commit()
+    login_data = {"username": user.email, "password": password}
+    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith(f"$2b${settings.PASSWORD_HASH_ROUNDS}$")
+    assert verify_password(password, user.hashed_password)
+    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 200
+
+
+def test_get_access_token_hasher_busy(client: TestClient) -> None:
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    with patch.object(password_hasher, "max_pending", 0):
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+
+
+def login(client: TestClient, email: str, password: str) -> dict[str, Any]:
+    login_data = {"username": email, "password": password}
+    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 200
+    tokens: dict[str, Any] = r.json()
+    return tokens
+
+
+def bearer(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_access_token_claims(client: TestClient) -> None:
+    tokens = login(client, settings.FIRST_SUPERUSER, settings.FIRST_SUPERUSER_PASSWORD)
+    claims = jwt.decode(
+        tokens["access_token"], settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+    )
+    assert claims["type"] == "access"
+    assert claims["active"] is True
+    assert claims["superuser"] is True
+    # permissions are resolved per request, not claimed
+    assert "perms" not in claims
+    lifetime = claims["exp"] - claims["iat"]
+    assert lifetime == pytest.approx(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, abs=1)
+
+
+def test_access_token_authorizes_without_user_lookup(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    password = random_lower_string()
+    user.hashed_password = security.get_password_hash(password)
+    db.add(user)
+    db.commit()
+    tokens = login(client, user.email, password)
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        r = client.get(
+            f"{settings.API_V1_STR}/items/", headers=bearer(tokens["access_token"])
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert r.status_code == 200
+    assert not [s for s in statements if 'FROM "user"' in s]
+
+
+def test_refresh_token(client: TestClient) -> None:
+    tokens = login(client, settings.FIRST_SUPERUSER, settings.FIRST_SUPERUSER_PASSWORD)
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 200
+    refreshed = r.json()
+    r = client.post(
+        f"{settings.API_V1_STR}/login/test-token",
+        headers=bearer(refreshed["access_token"]),
+    )
+    assert r.status_code == 200
+    assert r.json()["email"] == settings.FIRST_SUPERUSER
+    # rotated, a refresh token is good for one refresh
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 403
+
+
+def test_tokens_are_not_interchangeable(client: TestClient) -> None:
+    tokens = login(client, settings.FIRST_SUPERUSER, settings.FIRST_SUPERUSER_PASSWORD)
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": tokens["access_token"]},
+    )
+    assert r.status_code == 403
+    r = client.post(
+        f"{settings.API_V1_STR}/login/test-token",
+        headers=bearer(tokens["refresh_token"]),
+    )
+    assert r.status_code == 403
+
+
+def test_logout(client: TestClient) -> None:
+    tokens = login(client, settings.FIRST_SUPERUSER, settings.FIRST_SUPERUSER_PASSWORD)
+    headers = bearer(tokens["access_token"])
+    r = client.post(
+        f"{settings.API_V1_STR}/logout",
+        headers=headers,
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 200
+    r = client.post(f"{settings.API_V1_STR}/login/test-token", headers=headers)
+    assert r.status_code == 403
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 403
+
+
+def test_read_jwks(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/.well-known/jwks.json")
+    assert r.status_code == 200
+    assert r.json() == {"keys": []}  # HS256
+
+
 def test_use_access_token(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
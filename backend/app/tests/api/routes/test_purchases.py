@@ -0,0 +1,160 @@
+import json
+import uuid
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.config import settings
+from app.models import Purchase, PurchaseItem
+from app.tests.utils.item import create_random_item
+from app.tests.utils.store import create_random_store
+from app.tests.utils.supplier import create_random_supplier
+from app.tests.utils.user import create_random_user
+
+
+def ndjson(lines: list[dict[str, Any]]) -> str:
+    return "\n".join(json.dumps(line) for line in lines) + "\n"
+
+
+def test_receive_purchase(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    supplier = create_random_supplier(db, user)
+    store = create_random_store(db, user)
+    item_1 = create_random_item(db, user, stock=1)
+    item_2 = create_random_item(db, user, stock=0)
+    lines = [
+        {"item_id": str(item_1.id), "quantity": 10, "price": 1000},
+        {"item_id": str(item_2.id), "quantity": 5, "price": 2500},
+        {"item_id": str(item_1.id), "quantity": 2, "price": 1000},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/purchases/receive",
+        headers={**superuser_token_headers, "Content-Type": "application/x-ndjson"},
+        params={"supplier_id": str(supplier.id), "store_id": str(store.id)},
+        content=ndjson(lines),
+    )
+    assert response.status_code == 200
+    content = response.json()
+    purchase_id = content["purchase"]["id"]
+    assert content["lines"] == 3
+    assert content["purchase"]["amount"] == 24500
+    assert content["purchase"]["owner_id"] == str(
+        crud.get_user_by_email(session=db, email=settings.FIRST_SUPERUSER).id  # type: ignore[union-attr]
+    )
+    assert content["payable"]["amount"] == 24500
+    assert content["payable"]["status"] == "unpaid"
+    assert content["payable"]["purchase_id"] == purchase_id
+    db.refresh(item_1)
+    db.refresh(item_2)
+    assert (item_1.stock, item_2.stock) == (13, 5)
+    purchase_items = db.exec(
+        select(PurchaseItem).where(PurchaseItem.purchase_id == uuid.UUID(purchase_id))
+    ).all()
+    assert sorted(line.quantity for line in purchase_items) == [2, 5, 10]
+
+
+def test_receive_purchase_invalid_line(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    supplier = create_random_supplier(db)
+    store = create_random_store(db)
+    item = create_random_item(db, stock=1)
+    lines = [
+        {"item_id": str(item.id), "quantity": 10, "price": 1000},
+        {"item_id": str(item.id), "quantity": -1, "price": 1000},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/purchases/receive",
+        headers={**superuser_token_headers, "Content-Type": "application/x-ndjson"},
+        params={"supplier_id": str(supplier.id), "store_id": str(store.id)},
+        content=ndjson(lines),
+    )
+    assert response.status_code == 422
+    content = response.json()
+    assert content["detail"][0]["loc"] == ["body", 2, "quantity"]
+    db.refresh(item)
+    assert item.stock == 1
+    assert not db.exec(
+        select(Purchase).where(Purchase.supplier_id == supplier.id)
+    ).all()
+
+
+def test_receive_purchase_item_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    supplier = create_random_supplier(db)
+    store = create_random_store(db)
+    missing_id = uuid.uuid4()
+    lines = [{"item_id": str(missing_id), "quantity": 10, "price": 1000}]
+    response = client.post(
+        f"{settings.API_V1_STR}/purchases/receive",
+        headers={**superuser_token_headers, "Content-Type": "application/x-ndjson"},
+        params={"supplier_id": str(supplier.id), "store_id": str(store.id)},
+        content=ndjson(lines),
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == [
+        {"item_id": str(missing_id), "detail": "Item not found"}
+    ]
+
+
+def test_receive_purchase_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    supplier = create_random_supplier(db, user)
+    store = create_random_store(db, user)
+    own_item = create_random_item(db, user, stock=0)
+    other_item = create_random_item(db, stock=0)
+    lines = [
+        {"item_id": str(own_item.id), "quantity": 1, "price": 1000},
+        {"item_id": str(other_item.id), "quantity": 1, "price": 1000},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/purchases/receive",
+        headers={**normal_user_token_headers, "Content-Type": "application/x-ndjson"},
+        params={"supplier_id": str(supplier.id), "store_id": str(store.id)},
+        content=ndjson(lines),
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == [
+        {"item_id": str(other_item.id), "detail": "Not enough permissions"}
+    ]
+    db.refresh(own_item)
+    assert own_item.stock == 0
+
+
+def test_receive_purchase_without_lines(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    supplier = create_random_supplier(db)
+    store = create_random_store(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/purchases/receive",
+        headers={**superuser_token_headers, "Content-Type": "application/x-ndjson"},
+        params={"supplier_id": str(supplier.id), "store_id": str(store.id)},
+        content="\n",
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Purchase has no lines"
+
+
+def test_receive_purchase_supplier_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    store = create_random_store(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/purchases/receive",
+        headers={**superuser_token_headers, "Content-Type": "application/x-ndjson"},
+        params={"supplier_id": str(uuid.uuid4()), "store_id": str(store.id)},
+        content="\n",
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Supplier not found"
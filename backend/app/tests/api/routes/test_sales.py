@@ -0,0 +1,339 @@
+import csv
+import io
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.config import settings
+from app.models import AccountTransaction, Payment, Receivable, Sale
+from app.tests.conftest import QueryBudget
+from app.tests.utils.account import create_random_account
+from app.tests.utils.customer import create_random_customer
+from app.tests.utils.item import create_random_item
+from app.tests.utils.store import create_random_store
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+from app.utils import utcnow
+
+
+def test_checkout_sale(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    account = create_random_account(db, user, balance=100)
+    item_1 = create_random_item(db, user, stock=10)
+    item_2 = create_random_item(db, user, stock=10)
+    data = {
+        "customer_id": str(customer.id),
+        "store_id": str(store.id),
+        "lines": [
+            {"item_id": str(item_1.id), "quantity": 2, "price": 150},
+            {"item_id": str(item_2.id), "quantity": 1, "price": 200},
+            {"item_id": str(item_1.id), "quantity": 1, "price": 150},
+        ],
+        "amount_paid": 500,
+        "account_id": str(account.id),
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    sale_id = content["sale"]["id"]
+    assert content["sale"]["amount"] == 650
+    assert content["sale"]["customer_id"] == str(customer.id)
+    assert [line["quantity"] for line in content["sale_items"]] == [2, 1, 1]
+    assert {line["sale_id"] for line in content["sale_items"]} == {sale_id}
+    assert content["receivable"]["amount"] == 650
+    assert content["receivable"]["amount_paid"] == 500
+    assert content["receivable"]["status"] == "partial"
+    assert content["payment"]["amount"] == 500
+    assert content["payment"]["transaction_id"] == sale_id
+    db.refresh(item_1)
+    db.refresh(item_2)
+    db.refresh(account)
+    assert (item_1.stock, item_2.stock) == (7, 9)
+    assert account.balance == 600
+    transaction = db.exec(
+        select(AccountTransaction).where(
+            AccountTransaction.reference_id == uuid.UUID(sale_id)
+        )
+    ).one()
+    assert transaction.amount == 500
+    assert transaction.account_id == account.id
+
+
+def test_checkout_sale_unpaid(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    item = create_random_item(db, user, stock=1)
+    data = {
+        "customer_id": str(customer.id),
+        "store_id": str(store.id),
+        "lines": [{"item_id": str(item.id), "quantity": 1, "price": 100}],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=normal_user_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["sale"]["owner_id"] == str(user.id)
+    assert content["receivable"]["status"] == "unpaid"
+    assert content["payment"] is None
+
+
+def test_checkout_sale_not_enough_stock(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    account = create_random_account(db, user)
+    item_1 = create_random_item(db, user, stock=10)
+    item_2 = create_random_item(db, user, stock=1)
+    data = {
+        "customer_id": str(customer.id),
+        "store_id": str(store.id),
+        "lines": [
+            {"item_id": str(item_1.id), "quantity": 2, "price": 150},
+            {"item_id": str(item_2.id), "quantity": 2, "price": 200},
+        ],
+        "amount_paid": 700,
+        "account_id": str(account.id),
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == [
+        {"item_id": str(item_2.id), "detail": "Not enough stock"}
+    ]
+    db.refresh(item_1)
+    db.refresh(account)
+    assert item_1.stock == 10
+    assert account.balance == 0
+    assert not db.exec(select(Sale).where(Sale.customer_id == customer.id)).all()
+    assert not db.exec(select(Payment).where(Payment.account_id == account.id)).all()
+
+
+def test_checkout_sale_account_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    item = create_random_item(db, user, stock=10)
+    data = {
+        "customer_id": str(customer.id),
+        "store_id": str(store.id),
+        "lines": [{"item_id": str(item.id), "quantity": 1, "price": 100}],
+        "amount_paid": 100,
+        "account_id": str(uuid.uuid4()),
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Account not found"
+    db.refresh(item)
+    assert item.stock == 10
+    assert not db.exec(
+        select(Receivable).where(Receivable.customer_id == customer.id)
+    ).all()
+
+
+def test_checkout_sale_customer_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    store = create_random_store(db)
+    item = create_random_item(db, stock=10)
+    data = {
+        "customer_id": str(uuid.uuid4()),
+        "store_id": str(store.id),
+        "lines": [{"item_id": str(item.id), "quantity": 1, "price": 100}],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Customer not found"
+
+
+def test_checkout_sale_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    item = create_random_item(db, user, stock=10)
+    data = {
+        "customer_id": str(customer.id),
+        "store_id": str(store.id),
+        "lines": [{"item_id": str(item.id), "quantity": 1, "price": 100}],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=normal_user_token_headers,
+        json=data,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_checkout_sale_paid_without_account(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    item = create_random_item(db, user, stock=10)
+    data = {
+        "customer_id": str(customer.id),
+        "store_id": str(store.id),
+        "lines": [{"item_id": str(item.id), "quantity": 1, "price": 100}],
+        "amount_paid": 100,
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Account is required to pay"
+
+
+def test_export_sales(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    sales = [
+        Sale(
+            date_sale=utcnow(),
+            amount=amount,
+            owner_id=user.id,
+            customer_id=customer.id,
+            store_id=store.id,
+        )
+        for amount in (100, 250)
+    ]
+    db.add_all(sales)
+    db.commit()
+    response = client.get(
+        f"{settings.API_V1_STR}/sales/export", headers=user_token_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="sales.csv"'
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [str(sale.id) for sale in sales]
+    assert [float(row["amount"]) for row in rows] == [100, 250]
+    assert rows[0]["customer_id"] == str(customer.id)
+
+
+def test_read_sales_expand(
+    client: TestClient, db: Session, query_budget: QueryBudget
+) -> None:
+    user = create_random_user(db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    item = create_random_item(db, user, stock=10)
+    for quantity in (1, 2, 3):
+        response = client.post(
+            f"{settings.API_V1_STR}/sales/checkout",
+            headers=user_token_headers,
+            json={
+                "customer_id": str(customer.id),
+                "store_id": str(store.id),
+                "lines": [{"item_id": str(item.id), "quantity": quantity}],
+            },
+        )
+        assert response.status_code == 200
+    # the page with its customers joined, one query for the lines, and the
+    # count (looked up in owner_count first)
+    with query_budget(4):
+        response = client.get(
+            f"{settings.API_V1_STR}/sales/?limit=3&expand=customer,sale_items",
+            headers=user_token_headers,
+        )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content["data"]) == 3
+    for sale in content["data"]:
+        assert sale["customer"]["id"] == str(customer.id)
+        assert [line["sale_id"] for line in sale["sale_items"]] == [sale["id"]]
+        assert sale["store"] is None
+
+
+def test_read_sale(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    item = create_random_item(db, user, stock=1)
+    response = client.post(
+        f"{settings.API_V1_STR}/sales/checkout",
+        headers=normal_user_token_headers,
+        json={
+            "customer_id": str(customer.id),
+            "store_id": str(store.id),
+            "lines": [{"item_id": str(item.id), "quantity": 1, "price": 100}],
+        },
+    )
+    sale_id = response.json()["sale"]["id"]
+    response = client.get(
+        f"{settings.API_V1_STR}/sales/{sale_id}",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["amount"] == 100
+    assert "store" not in content
+
+
+def test_read_sale_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    customer = create_random_customer(db, user)
+    store = create_random_store(db, user)
+    sale = Sale(
+        date_sale=utcnow(),
+        owner_id=user.id,
+        customer_id=customer.id,
+        store_id=store.id,
+    )
+    db.add(sale)
+    db.commit()
+    response = client.get(
+        f"{settings.API_V1_STR}/sales/{sale.id}",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
@@ -4,16 +4,23 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
 from app.core.config import settings
+from app.models import Store
 from app.tests.conftest import authentication_token_from_email
-from app.tests.utils.user import create_random_user
 from app.tests.utils.store import create_random_store
-from app.models import Store
+from app.tests.utils.user import create_random_user
 
 
 def test_create_store(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
-    data = {"name": "Foo", "address": "St. Groove", "latitude": 7.534, "longitude": 112.8347}
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    data = {
+        "name": "Foo",
+        "address": "St. Groove",
+        "latitude": 7.534,
+        "longitude": 112.8347,
+    }
     response = client.post(
         f"{settings.API_V1_STR}/stores/",
         headers=user_token_headers,
@@ -31,7 +38,9 @@ def test_create_store(client: TestClient, db: Session) -> None:
 
 def test_read_store(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     store = create_random_store(db, user)
     response = client.get(
         f"{settings.API_V1_STR}/stores/{store.id}",
@@ -47,7 +56,9 @@ def test_read_store(client: TestClient, db: Session) -> None:
 
 def test_read_store_not_found(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     response = client.get(
         f"{settings.API_V1_STR}/stores/{uuid.uuid4()}",
         headers=user_token_headers,
@@ -72,7 +83,9 @@ def test_read_store_not_enough_permissions(
 
 def test_read_stores(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     create_random_store(db, user)
     create_random_store(db, user)
     response = client.get(
@@ -84,11 +97,137 @@ def test_read_stores(client: TestClient, db: Session) -> None:
     assert len(content["data"]) == 2
 
 
-def test_read_stores_superuser(client: TestClient, superuser_token_headers: dict[str, str], db: Session) -> None:
+def test_read_stores_cursor(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    stores = [create_random_store(db, user) for _ in range(5)]
+    seen = []
+    after = None
+    while True:
+        params = {"limit": 2} if after is None else {"limit": 2, "after": after}
+        response = client.get(
+            f"{settings.API_V1_STR}/stores/",
+            headers=user_token_headers,
+            params=params,
+        )
+        assert response.status_code == 200
+        content = response.json()
+        assert content["count"] == 5
+        seen += [store["id"] for store in content["data"]]
+        after = content["next_cursor"]
+        if after is None:
+            break
+    assert seen == [str(store.id) for store in stores]
+
+
+def test_read_stores_cursor_full_last_page(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    for _ in range(4):
+        create_random_store(db, user)
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/",
+        headers=user_token_headers,
+        params={"limit": 2},
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/",
+        headers=user_token_headers,
+        params={"limit": 2, "after": response.json()["next_cursor"]},
+    )
+    content = response.json()
+    assert len(content["data"]) == 2
+    # no cursor to an empty page
+    assert content["next_cursor"] is None
+
+
+def test_read_stores_fields(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    store = create_random_store(db, user)
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/?fields=name",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"name": store.name}]
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/{store.id}?fields=id,name",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"name": store.name, "id": str(store.id)}
+
+
+def test_read_stores_invalid_cursor(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/",
+        headers=user_token_headers,
+        params={"after": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_read_stores_count_modes(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    stores = [create_random_store(db, user) for _ in range(3)]
+    response = client.delete(
+        f"{settings.API_V1_STR}/stores/{stores[0].id}",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/",
+        headers=user_token_headers,
+        params={"count": "exact"},
+    )
+    content = response.json()
+    assert content["count"] == 2
+    assert content["count_mode"] == "exact"
+
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/",
+        headers=user_token_headers,
+        params={"count": "estimate"},
+    )
+    content = response.json()
+    assert content["count"] >= 0
+    assert content["count_mode"] == "estimate"
+    assert len(content["data"]) == 2
+
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/",
+        headers=user_token_headers,
+        params={"count": "none"},
+    )
+    content = response.json()
+    assert content["count"] is None
+    assert content["count_mode"] == "none"
+    assert len(content["data"]) == 2
+
+
+def test_read_stores_superuser(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
     statement = delete(Store)
     db.exec(statement)
     db.commit()
-    
+
     create_random_store(db)
     create_random_store(db)
     response = client.get(
@@ -100,11 +239,47 @@ def test_read_stores_superuser(client: TestClient, superuser_token_headers: dict
     assert len(content["data"]) == 2
 
 
+def test_read_store_changes(client: TestClient, db: Session) -> None:
+    user = create_random_user(db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    store = create_random_store(db, user)
+    other_store = create_random_store(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/changes", headers=user_token_headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [row["id"] for row in content["data"]] == [str(store.id)]
+
+    db.delete(store)
+    db.delete(other_store)
+    db.commit()
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/changes",
+        headers=user_token_headers,
+        params={"since": content["next_cursor"]},
+    )
+    content = response.json()
+    assert content["data"] == []
+    # another owner's tombstones aren't theirs to see
+    assert content["deleted"] == [str(store.id)]
+    assert content["has_more"] is False
+
+
 def test_update_store(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     store = create_random_store(db, user)
-    data = {"name": "Updated name", "address": "Updated address", "latitude": 8.324, "longitude": 113.324}
+    data = {
+        "name": "Updated name",
+        "address": "Updated address",
+        "latitude": 8.324,
+        "longitude": 113.324,
+    }
     response = client.put(
         f"{settings.API_V1_STR}/stores/{store.id}",
         headers=user_token_headers,
@@ -122,8 +297,15 @@ def test_update_store(client: TestClient, db: Session) -> None:
 
 def test_update_store_not_found(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
-    data = {"name": "Updated name", "address": "Updated address", "latitude": 8.324, "longitude": 113.324}
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
+    data = {
+        "name": "Updated name",
+        "address": "Updated address",
+        "latitude": 8.324,
+        "longitude": 113.324,
+    }
     response = client.put(
         f"{settings.API_V1_STR}/stores/{uuid.uuid4()}",
         headers=user_token_headers,
@@ -138,7 +320,12 @@ def test_update_store_not_enough_permissions(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
     store = create_random_store(db)
-    data = {"name": "Updated name", "address": "Updated address", "latitude": 8.324, "longitude": 113.324}
+    data = {
+        "name": "Updated name",
+        "address": "Updated address",
+        "latitude": 8.324,
+        "longitude": 113.324,
+    }
     response = client.put(
         f"{settings.API_V1_STR}/stores/{store.id}",
         headers=normal_user_token_headers,
@@ -151,7 +338,9 @@ def test_update_store_not_enough_permissions(
 
 def test_delete_item_category(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     store = create_random_store(db, user)
     response = client.delete(
         f"{settings.API_V1_STR}/stores/{store.id}",
@@ -164,7 +353,9 @@ def test_delete_item_category(client: TestClient, db: Session) -> None:
 
 def test_delete_store_not_found(client: TestClient, db: Session) -> None:
     user = create_random_user(db=db)
-    user_token_headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    user_token_headers = authentication_token_from_email(
+        client=client, email=user.email, db=db
+    )
     response = client.delete(
         f"{settings.API_V1_STR}/stores/{uuid.uuid4()}",
         headers=user_token_headers,
@@ -7,7 +7,8 @@ from sqlmodel import Session, select
 from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import Permission, Role, RolePermission, User, UserCreate, UserRole
+from app.tests.utils.user import user_authentication_headers
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -75,6 +76,19 @@ def test_get_existing_user(
     assert existing_user.email == api_user["email"]
 
 
+def test_get_existing_user_fields(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = crud.create_user(session=db, user_create=user_in)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{user.id}?fields=email,is_active",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json() == {"email": user.email, "is_active": True}
+
+
 def test_get_existing_user_current_user(client: TestClient, db: Session) -> None:
     username = random_email()
     password = random_lower_string()
@@ -484,3 +498,95 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_deactivated_user_token_rejected(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    headers = user_authentication_headers(
+        client=client, email=username, password=password
+    )
+
+    # the first request caches the user, the second one is served from cache
+    for _ in range(2):
+        r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+        assert r.status_code == 200
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/{user.id}",
+        headers=superuser_token_headers,
+        json={"is_active": False},
+    )
+    assert r.status_code == 200
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Inactive user"
+
+
+def test_user_deactivated_by_another_worker_token_rejected(
+    client: TestClient, db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    headers = user_authentication_headers(
+        client=client, email=username, password=password
+    )
+    # with stale claims the user is loaded, then served from the principal cache
+    crud.revoke_user_claims(session=db, user_id=user.id)
+    for _ in range(2):
+        r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+        assert r.status_code == 200
+
+    # this worker's principal cache isn't invalidated, only the claims revoked
+    user.is_active = False
+    db.add(user)
+    crud.revoke_user_claims(session=db, user_id=user.id)
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Inactive user"
+
+
+def test_read_special_follows_role_changes(client: TestClient, db: Session) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    headers = user_authentication_headers(
+        client=client, email=username, password=password
+    )
+
+    r = client.get(f"{settings.API_V1_STR}/users/special", headers=headers)
+    assert r.status_code == 403
+
+    permission = db.exec(
+        select(Permission).where(Permission.name == "special:read")
+    ).first()
+    if not permission:
+        permission = Permission(
+            name="special:read", owner_id=user.id, editor_id=user.id
+        )
+        db.add(permission)
+    role = Role(name=random_lower_string(), owner_id=user.id, editor_id=user.id)
+    db.add(role)
+    db.flush()
+    db.add(RolePermission(role_id=role.id, permission_id=permission.id))
+    user_role = UserRole(user_id=user.id, role_id=role.id)
+    db.add(user_role)
+    db.commit()
+
+    r = client.get(f"{settings.API_V1_STR}/users/special", headers=headers)
+    assert r.status_code == 200
+
+    db.delete(user_role)
+    db.commit()
+
+    r = client.get(f"{settings.API_V1_STR}/users/special", headers=headers)
+    assert r.status_code == 403
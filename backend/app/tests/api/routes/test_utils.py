@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_cache_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/cache-stats/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    principal = r.json()["principal"]
+    assert principal["hits"] + principal["misses"] > 0
+    assert principal["size"] <= principal["max_size"]
+
+
+def test_cache_stats_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/cache-stats/",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_pool_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/pool-stats/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert {"sync", "async"} <= set(content)
+    pool = content["sync"]
+    assert pool["size"] == settings.POSTGRES_POOL_SIZE
+    assert pool["checkouts"] > 0
+    assert pool["wait_histogram"]["+Inf"] == pool["checkouts"]
+
+
+def test_pool_stats_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/pool-stats/",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_password_hasher_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/password-hasher-stats/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["workers"] == settings.PASSWORD_HASH_WORKERS
+    assert content["max_pending"] == settings.PASSWORD_HASH_MAX_PENDING
+    # the superuser logged in
+    assert content["completed"] > 0
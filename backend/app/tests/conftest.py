@@ -1,4 +1,5 @@
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
@@ -6,6 +7,7 @@ from sqlmodel import Session, delete
 
 from app.core.config import settings
 from app.core.db import engine, init_db
+from app.core.query_stats import QueryStats, record_queries
 from app.main import app
 from app.models import Item, User
 from app.tests.utils.user import authentication_token_from_email
@@ -40,3 +42,25 @@ def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]
     return authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db=db
     )
+
+
+QueryBudget = Callable[[int], AbstractContextManager[QueryStats]]
+
+
+@pytest.fixture
+def query_budget() -> QueryBudget:
+    """
+    Fail the test if the block runs more than `statements` statements, or one
+    statement QUERY_REPEAT_THRESHOLD times or more (N+1 loading).
+    """
+
+    @contextmanager
+    def query_budget(statements: int) -> Iterator[QueryStats]:
+        with record_queries() as stats:
+            yield stats
+        if stats.statements > statements:
+            pytest.fail(f"Over the budget of {statements} statements: {stats.report()}")
+        if stats.repeated(settings.QUERY_REPEAT_THRESHOLD):
+            pytest.fail(f"Repeated statements, N+1 loading? {stats.report()}")
+
+    return query_budget
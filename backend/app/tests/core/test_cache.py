@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from app.core.cache import TTLCache
+
+
+def test_cache_hit_and_miss() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 10}
+
+
+def test_cache_expires_after_ttl() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+    with patch("app.core.cache.time.monotonic", return_value=1000.0):
+        cache.set("a", 1)
+    with patch("app.core.cache.time.monotonic", return_value=1059.0):
+        assert cache.get("a") == 1
+    with patch("app.core.cache.time.monotonic", return_value=1060.0):
+        assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_invalidate() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+def test_cache_disabled() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
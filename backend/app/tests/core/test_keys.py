@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.exceptions import InvalidKeyError, InvalidTokenError
+
+from app.core.keys import KeySet
+
+PAYLOAD = {"sub": "user"}
+
+
+def private_key(algorithm: str) -> str:
+    key: ed25519.Ed25519PrivateKey | rsa.RSAPrivateKey = (
+        ed25519.Ed25519PrivateKey.generate()
+        if algorithm == "EdDSA"
+        else rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    )
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def test_hs256() -> None:
+    keys = KeySet(algorithm="HS256", secret_key="secret")
+    assert keys.verify(keys.sign(PAYLOAD)) == PAYLOAD
+    with pytest.raises(InvalidTokenError):
+        KeySet(algorithm="HS256", secret_key="other").verify(keys.sign(PAYLOAD))
+    assert keys.jwks() == {"keys": []}
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "EdDSA"])
+def test_asymmetric(algorithm: str) -> None:
+    signer = KeySet(
+        algorithm=algorithm,
+        secret_key="secret",
+        private_key=private_key(algorithm),
+        key_id="1",
+    )
+    token = signer.sign(PAYLOAD)
+    assert signer.verify(token) == PAYLOAD
+    jwks = signer.jwks()
+    assert [key["kid"] for key in jwks["keys"]] == ["1"]
+    assert "d" not in jwks["keys"][0]  # no private part
+    # a node with only the public keys verifies, but can't sign
+    verifier = KeySet(algorithm=algorithm, secret_key="", jwks=json.dumps(jwks))
+    assert verifier.verify(token) == PAYLOAD
+    with pytest.raises(InvalidKeyError):
+        verifier.sign(PAYLOAD)
+
+
+def test_key_rotation() -> None:
+    old = KeySet(
+        algorithm="EdDSA", secret_key="", private_key=private_key("EdDSA"), key_id="1"
+    )
+    new = KeySet(
+        algorithm="EdDSA",
+        secret_key="",
+        private_key=private_key("EdDSA"),
+        key_id="2",
+        jwks=old.jwks(),  # retired, still verifying what it signed
+    )
+    assert new.verify(old.sign(PAYLOAD)) == PAYLOAD
+    assert new.verify(new.sign(PAYLOAD)) == PAYLOAD
+    with pytest.raises(InvalidTokenError, match="Unknown key id"):
+        old.verify(new.sign(PAYLOAD))
+
+
+def test_no_keys() -> None:
+    with pytest.raises(InvalidKeyError):
+        KeySet(algorithm="RS256", secret_key="secret")
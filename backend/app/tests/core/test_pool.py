@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.config import settings
+from app.core.db import engine_options
+from app.core.pool import TimedQueuePool, WaitHistogram
+
+
+def test_wait_histogram() -> None:
+    histogram = WaitHistogram(buckets=(0.01, 0.1))
+    histogram.observe(0.001)
+    histogram.observe(0.01)
+    histogram.observe(0.05)
+    histogram.observe(3, timed_out=True)
+    assert histogram.stats() == {
+        "checkouts": 4,
+        "timeouts": 1,
+        "wait_seconds": pytest.approx(3.061),
+        "wait_histogram": {"0.01": 2, "0.1": 3, "+Inf": 4},
+    }
+
+
+def test_timed_pool_records_waits() -> None:
+    engine = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        with engine.connect():
+            stats = engine.pool.stats()  # type: ignore[attr-defined]
+            assert (stats["checked_out"], stats["checked_in"]) == (1, 0)
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        engine.dispose()  # replaces the pool, the counts carry over
+        stats = engine.pool.stats()  # type: ignore[attr-defined]
+        assert stats["checkouts"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds"] >= 0.05
+        assert stats["wait_histogram"]["0.01"] <= 1
+    finally:
+        engine.dispose()
+
+
+def test_statement_timeout() -> None:
+    with patch.object(settings, "POSTGRES_STATEMENT_TIMEOUT_MS", 50):
+        options = engine_options()
+    engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), **options)
+    try:
+        with engine.connect() as connection:
+            with pytest.raises(exc.OperationalError, match="statement timeout"):
+                connection.execute(text("SELECT pg_sleep(1)"))
+    finally:
+        engine.dispose()
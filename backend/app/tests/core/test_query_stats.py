@@ -0,0 +1,74 @@
+import logging
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session, col, select, text
+
+from app.core.config import settings
+from app.core.query_stats import fingerprint, record_queries
+from app.models import Item, User
+from app.tests.utils.item import create_random_item
+
+
+def test_fingerprint() -> None:
+    assert (
+        fingerprint(
+            "SELECT item.id \nFROM item\nWHERE item.id IN (%(id_1_1)s, %(id_1_2)s)"
+        )
+        == "SELECT item.id FROM item WHERE item.id IN (?)"
+    )
+    assert (
+        fingerprint(
+            "INSERT INTO t (a, b) VALUES (%(a__0)s, %(b__0)s), (%(a__1)s, %(b__1)s)"
+        )
+        == "INSERT INTO t (a, b) VALUES (?), (?)"
+    )
+
+
+def test_record_queries_finds_repeated_statements(db: Session) -> None:
+    ids = [create_random_item(db).id for _ in range(3)]
+    db.expire_all()
+    with record_queries() as outer:
+        with record_queries() as inner:
+            loaded = db.exec(select(Item).where(col(Item.id).in_(ids))).all()
+            # a lazy load per item
+            for item in loaded:
+                assert item.owner
+        assert inner.statements == 4
+        assert inner.seconds > 0
+        [(statement, count)] = inner.repeated(3)
+        assert count == 3
+        assert statement.startswith('SELECT "user".')
+        db.get(User, loaded[0].owner_id, populate_existing=True)
+    assert outer.statements == 5
+    assert inner.repeated(4) == []
+
+
+def test_failed_statement_not_left_started(db: Session) -> None:
+    with record_queries() as stats:
+        with pytest.raises(DBAPIError):
+            db.execute(text("SELECT 1 / 0"))
+        db.rollback()
+        connection = db.connection()
+        assert not connection.info.get("query_started")
+        db.exec(select(User.id).limit(1)).all()
+    assert stats.statements == 1
+    assert not connection.info.get("query_started")
+
+
+def test_repeated_statements_logged(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    with (
+        patch.object(settings, "QUERY_REPEAT_THRESHOLD", 1),
+        caplog.at_level(logging.WARNING, logger="app.main"),
+    ):
+        response = client.get(
+            f"{settings.API_V1_STR}/items/", headers=superuser_token_headers
+        )
+    assert response.status_code == 200
+    assert "GET /api/v1/items/ ran a statement 1 times" in caplog.text
@@ -0,0 +1,73 @@
+import time
+import uuid
+from datetime import timedelta
+
+from sqlmodel import Session, col, select
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.core.revocation import RevocationList
+from app.models import TokenPayload, TokenRevocation
+from app.utils import utcnow
+
+
+def revocation_list() -> RevocationList:
+    return RevocationList(sync_interval_seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS)
+
+
+def test_is_stale() -> None:
+    user_id = uuid.uuid4()
+    revoked = revocation_list()
+    before = TokenPayload(sub=str(user_id), iat=time.time() - 1)
+    assert not revoked.is_stale(before)
+    revoked.add(TokenRevocation(user_id=user_id, expires_at=utcnow()))
+    after = TokenPayload(sub=str(user_id), iat=time.time() + 1)
+    assert revoked.is_stale(before)
+    assert not revoked.is_stale(after)
+    assert not revoked.is_stale(TokenPayload(sub=str(uuid.uuid4()), iat=0))
+    # without an issue time, nothing says when they were issued
+    assert revoked.is_stale(TokenPayload(sub=str(user_id)))
+
+
+def test_sync(db: Session) -> None:
+    user_id = uuid.uuid4()
+    token_data = TokenPayload(
+        sub=str(user_id), jti=uuid.uuid4(), exp=time.time() + 60, iat=time.time()
+    )
+    # revoked by another worker
+    crud.revoke_token(session=db, token_data=token_data)
+    crud.revoke_user_claims(session=db, user_id=user_id)
+    expired = TokenRevocation(
+        user_id=user_id, jti=uuid.uuid4(), expires_at=utcnow() - timedelta(seconds=1)
+    )
+    db.add(expired)
+    db.commit()
+    expired_jti = expired.jti
+
+    revoked = revocation_list()
+    assert not revoked.is_revoked(token_data)
+    revoked.sync(engine)
+    assert revoked.is_revoked(token_data)
+    assert revoked.is_stale(token_data)
+    assert not revoked.is_revoked(TokenPayload(jti=expired_jti))
+
+
+def test_revoke_purges_expired(db: Session) -> None:
+    user_id = uuid.uuid4()
+    expired = TokenRevocation(
+        user_id=user_id, jti=uuid.uuid4(), expires_at=utcnow() - timedelta(seconds=1)
+    )
+    db.add(expired)
+    db.commit()
+    expired_id = expired.id
+    # syncing only reads
+    revocation_list().sync(engine)
+    assert db.get(TokenRevocation, expired_id) is not None
+    crud.revoke_user_claims(session=db, user_id=user_id)
+    db.expire_all()
+    rows = db.exec(
+        select(TokenRevocation).where(col(TokenRevocation.user_id) == user_id)
+    ).all()
+    assert expired_id not in {row.id for row in rows}
+    assert len(rows) == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.security import PasswordHasher, PasswordHasherBusy, verify_password
+
+
+def test_password_hasher() -> None:
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    try:
+        hashed_password = hasher.hash("secret").result()
+        assert verify_password("secret", hashed_password)
+        assert hasher.verify_and_update("secret", hashed_password).result() == (
+            True,
+            None,
+        )
+        assert hasher.verify_and_update("wrong", hashed_password).result() == (
+            False,
+            None,
+        )
+        assert hasher.stats() == {
+            "workers": 1,
+            "pending": 0,
+            "peak_pending": 1,
+            "max_pending": 2,
+            "rejected": 0,
+            "completed": 3,
+        }
+    finally:
+        hasher.shutdown()
+
+
+def test_password_hasher_back_pressure() -> None:
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    try:
+        futures = [hasher.hash("secret") for _ in range(2)]
+        with pytest.raises(PasswordHasherBusy):
+            hasher.hash("secret")
+        for future in futures:
+            future.result()
+        stats = hasher.stats()
+        assert stats["rejected"] == 1
+        assert stats["peak_pending"] == 2
+        # room again once they are done
+        hasher.hash("secret").result()
+    finally:
+        hasher.shutdown()
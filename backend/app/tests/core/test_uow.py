@@ -0,0 +1,89 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.core.query_stats import record_queries
+from app.core.uow import (
+    UnitOfWorkSession,
+    after_commit,
+    unit_of_work,
+)
+from app.models import User, UserCreate, UserUpdate
+from app.tests.utils.customer_type import create_random_customer_type
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+def user_create() -> UserCreate:
+    return UserCreate(email=random_email(), password=random_lower_string())
+
+
+def test_unit_of_work_commits_once(db: Session) -> None:
+    committed = []
+    with UnitOfWorkSession(engine, expire_on_commit=False) as session:
+        with record_queries() as count, unit_of_work(session):
+            user = crud.create_user(session=session, user_create=user_create())
+            with unit_of_work(session):
+                crud.update_user(
+                    session=session, db_user=user, user_in=UserUpdate(full_name="Foo")
+                )
+            after_commit(session, lambda: committed.append(count.commits))
+            assert count.commits == 0
+        # the user's INSERT and UPDATE, no refreshing SELECT
+        assert count.statements == 2
+        assert count.commits == 1
+        assert committed == [1]
+    assert user.full_name == "Foo"
+    assert db.get(User, user.id)
+
+
+def test_unit_of_work_rolls_back(db: Session) -> None:
+    committed = []
+    with UnitOfWorkSession(engine) as session:
+        with pytest.raises(RuntimeError), unit_of_work(session):
+            user = crud.create_user(session=session, user_create=user_create())
+            after_commit(session, lambda: committed.append(True))
+            raise RuntimeError
+    assert not db.exec(select(User).where(User.email == user.email)).first()
+    assert committed == []
+
+
+def test_request_commits_once(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    customer_type = create_random_customer_type(db)
+    data = {"name": "Foo", "customer_type_id": str(customer_type.id)}
+    response = client.post(
+        f"{settings.API_V1_STR}/customers/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    # the customer type's SELECT and the customer's INSERT
+    assert response.headers["X-DB-Statements"] == "2"
+    assert response.headers["X-DB-Commits"] == "1"
+
+
+def test_request_rolls_back_on_error(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    data = {"name": "Foo", "customer_type_id": "00000000-0000-0000-0000-000000000000"}
+    response = client.post(
+        f"{settings.API_V1_STR}/customers/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 404
+    assert response.headers["X-DB-Commits"] == "0"
+
+
+def test_read_only_request_does_not_commit(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/stores/", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["X-DB-Commits"] == "0"
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+from app.models import ItemStockLine
+from app.tests.utils.item import create_random_item
+
+
+def test_update_item_stock(db: Session) -> None:
+    item = create_random_item(db, stock=10)
+    date_updated = item.date_updated
+    updated = crud.update_item_stock(session=db, item_id=item.id, quantity=-4)
+    assert updated
+    assert updated.stock == 6
+    assert updated.date_updated > date_updated
+
+
+def test_update_item_stock_not_below_zero(db: Session) -> None:
+    item = create_random_item(db, stock=3)
+    assert crud.update_item_stock(session=db, item_id=item.id, quantity=-4) is None
+    db.refresh(item)
+    assert item.stock == 3
+
+
+def test_update_item_stock_other_owner(db: Session) -> None:
+    item = create_random_item(db, stock=3)
+    other = create_random_item(db)
+    updated = crud.update_item_stock(
+        session=db, item_id=item.id, quantity=1, owner_id=other.owner_id
+    )
+    assert updated is None
+    db.refresh(item)
+    assert item.stock == 3
+
+
+def test_update_item_stock_concurrently(db: Session) -> None:
+    item = create_random_item(db, stock=0)
+
+    def increment(_: int) -> None:
+        with Session(engine) as session:
+            crud.update_item_stock(session=session, item_id=item.id, quantity=1)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(increment, range(200)))
+    db.refresh(item)
+    assert item.stock == 200
+
+
+def test_update_items_stock_concurrently(db: Session) -> None:
+    item_1 = create_random_item(db, stock=0)
+    item_2 = create_random_item(db, stock=0)
+
+    # opposite line order in every other batch, must neither lose updates nor
+    # deadlock
+    def increment(i: int) -> None:
+        lines = [
+            ItemStockLine(item_id=item_1.id, quantity=1),
+            ItemStockLine(item_id=item_2.id, quantity=1),
+        ]
+        with Session(engine) as session:
+            crud.update_items_stock(session=session, lines=lines[:: 1 - 2 * (i % 2)])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(increment, range(200)))
+    db.refresh(item_1)
+    db.refresh(item_2)
+    assert (item_1.stock, item_2.stock) == (200, 200)
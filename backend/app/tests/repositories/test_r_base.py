@@ -0,0 +1,94 @@
+import uuid
+
+import anyio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.core.db import AsyncSession
+from app.models import ItemCategory, User
+from app.repositories import RBase
+from app.repositories.r_base import RAsyncBase
+from app.tests.utils.user import create_random_user
+
+
+def categories(user: User, n: int) -> list[ItemCategory]:
+    return [ItemCategory(name=f"category {i}", owner_id=user.id) for i in range(n)]
+
+
+def test_create_many_get_many(db: Session) -> None:
+    user = create_random_user(db)
+    repo: RBase[ItemCategory, uuid.UUID] = RBase(db, ItemCategory)
+    created = repo.create_many(categories(user, 3))
+    returned = repo.create_many(categories(user, 2), returning=True)
+    assert [obj.name for obj in returned] == ["category 0", "category 1"]
+    ids = [obj.id for obj in reversed([*created, *returned])]
+    assert [obj.id for obj in repo.get_many([*ids, uuid.uuid4(), ids[0]])] == ids
+    assert repo.get_many([]) == []
+    assert repo.create_many([]) == []
+
+
+def test_update_many_delete_many(db: Session) -> None:
+    user = create_random_user(db)
+    repo: RBase[ItemCategory, uuid.UUID] = RBase(db, ItemCategory)
+    objs = repo.create_many(categories(user, 3))
+    owned = col(ItemCategory.owner_id) == user.id
+    assert repo.update_many(owned, {"description": "updated"}) == 3
+    assert all(obj.description == "updated" for obj in objs)
+    first = col(ItemCategory.id) == objs[0].id
+    [updated] = repo.update_many_returning(first, {"name": "renamed"})
+    assert updated is objs[0]
+    assert updated.name == "renamed"
+    assert updated.date_updated > updated.date_created
+    assert repo.exists(first)
+    [deleted] = repo.delete_many_returning(first)
+    assert deleted.id == objs[0].id
+    assert not repo.exists(first)
+    assert repo.delete_many(owned) == 2
+    assert not repo.exists(owned)
+
+
+def test_upsert_many(db: Session) -> None:
+    user = create_random_user(db)
+    repo: RBase[ItemCategory, uuid.UUID] = RBase(db, ItemCategory)
+    [existing] = repo.create_many(categories(user, 1))
+    date_created = existing.date_created
+    changed = ItemCategory(id=existing.id, name="upserted", owner_id=user.id)
+    upserted = repo.upsert_many([changed, *categories(user, 1)], returning=True)
+    assert [obj.name for obj in upserted] == ["upserted", "category 0"]
+    assert upserted[0] is existing
+    assert existing.name == "upserted"
+    assert existing.date_created == date_created
+    assert repo.upsert_many([]) == []
+    assert repo.update_many(col(ItemCategory.owner_id) == user.id, {}) == 2
+
+
+def test_async_repository(db: Session) -> None:
+    user = create_random_user(db)
+    # a pool would outlive the event loop
+    engine = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI), poolclass=NullPool
+    )
+
+    async def run() -> None:
+        async with AsyncSession(engine) as session:
+            repo: RAsyncBase[ItemCategory, uuid.UUID] = RAsyncBase(
+                session, ItemCategory
+            )
+            objs = await repo.create_many(categories(user, 2), returning=True)
+            owned = col(ItemCategory.owner_id) == user.id
+            assert await repo.exists(owned)
+            ids = [obj.id for obj in objs]
+            assert [obj.id for obj in await repo.get_many(ids)] == ids
+            updated = await repo.update_many_returning(owned, {"name": "a"})
+            assert {obj.name for obj in updated} == {"a"}
+            [upserted] = await repo.upsert_many(
+                [ItemCategory(id=ids[0], name="b", owner_id=user.id)], returning=True
+            )
+            assert upserted is await repo.get(ids[0])
+            assert upserted.name == "b"
+            assert await repo.delete_many(owned) == 2
+            assert not await repo.exists(owned)
+
+    anyio.run(run)
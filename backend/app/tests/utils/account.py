@@ -0,0 +1,19 @@
+from typing import Any
+
+from sqlmodel import Session
+
+from app import crud
+from app.models import Account, AccountCreate, User
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_account(
+    db: Session, user: User | None = None, **kwargs: Any
+) -> Account:
+    if user is None:
+        user = create_random_user(db)
+    owner_id = user.id
+    assert owner_id is not None
+    account_in = AccountCreate(name=random_lower_string(), **kwargs)
+    return crud.create_account(session=db, account_in=account_in, owner_id=owner_id)